@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Host başına AIMD eşzamanlılık sınırlayıcı
+
+Sabit Semaphore / TCPConnector sınırı yerine her host için ayrı bir pencere
+tutulur:
+- sağlıklı yanıtlarda pencere toplamsal büyür (her tam pencere başına +1),
+- timeout, 429, 5xx ya da gecikme sıçramasında çarpımsal küçülür (x0.5),
+  aynı dalgadaki hatalar için tek sefer (bekleme süresi içinde tekrar küçülmez),
+- istek zaman aşımı ölçülen gecikmeye göre kısaltılır; sorunlu host'ta
+  45 saniyelik beklemeler birikmez.
+
+Kullanım:
+    async with host_limits.slot(url) as slot:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=slot.timeout(45))) as r:
+            slot.observe(r.status)
+
+Çalışma sonunda report() her host için pencere eğrisini loglar.
+
+request_meter: bir işin (ör. tek bölüm çözümü) slot'tan geçen istek sayısını
+ve bunlardan geçici ağ hatasıyla (timeout, bağlantı hatası, 429 / 5xx)
+bitenleri toplamak için; iş başında [0, 0] listesi atanır, alt görevler
+bağlamı devralır.
+"""
+
+import asyncio
+import contextvars
+import logging
+import time
+from collections import Counter
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+INITIAL_LIMIT = 8
+MIN_LIMIT = 1
+MAX_LIMIT = 32
+DECREASE_FACTOR = 0.5
+# Küçültmeden sonra yeni bir küçültme için beklenen süre (sn)
+DECREASE_COOLDOWN = 2.0
+# Gecikme taban çizgisi (EWMA) ve sıçrama eşiği
+LATENCY_ALPHA = 0.1
+LATENCY_SPIKE_FACTOR = 3.0
+MIN_LATENCY_SAMPLES = 10
+# Uyarlanan zaman aşımı: taban gecikmenin katı, alt sınır (sn)
+TIMEOUT_FACTOR = 8.0
+MIN_TIMEOUT = 15.0
+# Raporlanan eğrideki nokta sayısı
+CURVE_POINTS = 12
+
+request_meter = contextvars.ContextVar("request_meter", default=None)
+# request_meter[1]'e sayılan (sonucu kesin olmayan) slot sonuçları
+TRANSIENT_OUTCOMES = ("timeout", "error", "overload")
+
+
+class AIMDLimiter:
+    """Tek bir host için toplamsal artış / çarpımsal azalış penceresi"""
+
+    def __init__(self, host, initial=INITIAL_LIMIT, min_limit=MIN_LIMIT, max_limit=MAX_LIMIT):
+        self.host = host
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.in_flight = 0
+        self.baseline = None
+        self.samples = 0
+        self.last_decrease = 0.0
+        self.started = time.monotonic()
+        self.curve = [(0.0, int(self.limit))]
+        self.stats = Counter()
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, outcome, latency):
+        """outcome: "ok", "timeout", "overload" ya da "error"
+
+        Sayaç ve pencere kilit beklenmeden güncellenir; görev kilit beklerken
+        yeniden iptal edilse de in_flight düşer ve pencere kalıcı daralmaz.
+        """
+        self.in_flight -= 1
+        self._update(outcome, latency)
+        try:
+            await self._notify()
+        except asyncio.CancelledError:
+            # Bekleyenler uyanmadan kalmasın: bildirimi ayrı görevde yap
+            asyncio.get_running_loop().create_task(self._notify())
+            raise
+
+    async def _notify(self):
+        async with self._cond:
+            self._cond.notify_all()
+
+    def timeout(self, default):
+        """Ölçülen gecikmeye göre kısaltılmış zaman aşımı (varsayılanı aşmaz)"""
+        if self.baseline is None or self.samples < MIN_LATENCY_SAMPLES:
+            return default
+        return min(default, max(MIN_TIMEOUT, self.baseline * TIMEOUT_FACTOR))
+
+    def _update(self, outcome, latency):
+        self.stats[outcome] += 1
+        if outcome == "ok":
+            spike = (self.samples >= MIN_LATENCY_SAMPLES
+                     and latency > self.baseline * LATENCY_SPIKE_FACTOR)
+            if spike:
+                self.stats["gecikme_sıçraması"] += 1
+                self._decrease()
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self.baseline = latency if self.baseline is None else (
+                LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * self.baseline)
+            self.samples += 1
+        elif outcome in ("timeout", "overload"):
+            self._decrease()
+        self._record_curve()
+
+    def _decrease(self):
+        now = time.monotonic()
+        if now - self.last_decrease < DECREASE_COOLDOWN:
+            return
+        self.last_decrease = now
+        self.stats["küçültme"] += 1
+        self.limit = max(self.min_limit, self.limit * DECREASE_FACTOR)
+
+    def _record_curve(self):
+        if int(self.limit) != self.curve[-1][1]:
+            self.curve.append((time.monotonic() - self.started, int(self.limit)))
+
+    def curve_summary(self, points=CURVE_POINTS):
+        """Eğriyi eşit aralıklı zaman noktalarındaki pencere değerlerine indirger"""
+        elapsed = time.monotonic() - self.started
+        values = []
+        index = 0
+        for i in range(points):
+            t = elapsed * i / max(1, points - 1)
+            while index + 1 < len(self.curve) and self.curve[index + 1][0] <= t:
+                index += 1
+            values.append(self.curve[index][1])
+        return values
+
+
+class _Slot:
+    """Tek bir isteğin limiter kaydı; sonucu observe() ya da istisnadan çıkarır"""
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+        self.outcome = "ok"
+
+    def timeout(self, default):
+        return self.limiter.timeout(default)
+
+    def observe(self, status):
+        if status == 429 or status >= 500:
+            self.outcome = "overload"
+
+    async def __aenter__(self):
+        await self.limiter.acquire()
+        meter = request_meter.get()
+        if meter is not None:
+            meter[0] += 1
+        self.start = time.monotonic()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is not None and issubclass(exc_type, asyncio.TimeoutError):
+            self.outcome = "timeout"
+        elif exc_type is asyncio.CancelledError:
+            self.outcome = "cancelled"
+        elif exc_type is not None:
+            self.outcome = "error"
+        meter = request_meter.get()
+        if meter is not None and self.outcome in TRANSIENT_OUTCOMES:
+            meter[1] += 1
+        await self.limiter.release(self.outcome, time.monotonic() - self.start)
+        return False
+
+
+class HostLimits:
+    """Host adı → AIMDLimiter"""
+
+    def __init__(self, initial=INITIAL_LIMIT, min_limit=MIN_LIMIT, max_limit=MAX_LIMIT):
+        self.initial = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limiters = {}
+
+    def for_url(self, url):
+        host = urlparse(url).hostname or ""
+        limiter = self.limiters.get(host)
+        if limiter is None:
+            limiter = AIMDLimiter(host, self.initial, self.min_limit, self.max_limit)
+            self.limiters[host] = limiter
+        return limiter
+
+    def slot(self, url):
+        return _Slot(self.for_url(url))
+
+    def report(self):
+        for host, limiter in sorted(self.limiters.items()):
+            values = [v for _, v in limiter.curve]
+            logger.info(
+                f"[AIMD] {host}: pencere {min(values)}-{max(values)} (son {int(limiter.limit)}), "
+                f"eğri: {' '.join(map(str, limiter.curve_summary()))}, "
+                + ", ".join(f"{k}: {v}" for k, v in limiter.stats.items())
+            )
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+dizifun taramasını parçalara (shard) bölme ve parçaları birleştirme
+
+--shard i/N ile çalışan her süreç / makine katalog listelerini tam olarak
+tarar (birkaç sayfa), ama dizileri yalnızca URL'sinin kararlı özeti
+(sha1) mod N = i olanlar için çözer; parçalar kesişmez, hiçbir dizi iki
+kez çözülmez. Her parça liste sıralarını ve kendi çözüm sonuçlarını bir
+JSON parça dosyasına yazar.
+
+--merge-shards tüm parça dosyalarını okur, eksik / uyumsuz parça varsa
+durur ve katalog dosyalarını tek süreçli çalışmanın yazacağı sırayla
+(liste sırası, ilk parçanın listeleri esas) üretir.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+from m3u_journal import atomic_write
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_SHARD_DIR = BASE_DIR / ".cache" / "shards"
+ARTIFACT_VERSION = 1
+
+
+class ShardError(ValueError):
+    """Geçersiz --shard değeri ya da birleştirilemeyen parça kümesi"""
+
+
+def parse_shard(spec):
+    """"i/N" → (i, N); i sıfırdan başlar (0/4 ... 3/4)"""
+    try:
+        index, count = (int(part) for part in spec.split("/", 1))
+    except ValueError:
+        raise ShardError(f"Geçersiz shard: {spec!r} (beklenen: i/N, ör. 0/4)")
+    if count < 1 or not 0 <= index < count:
+        raise ShardError(f"Geçersiz shard: {spec!r} (0 <= i < N olmalı)")
+    return index, count
+
+
+def shard_of(url, count):
+    """URL'nin parçası; süreçten ve Python sürümünden bağımsız (hash() tuzlu olduğu için sha1)"""
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return int(digest[:16], 16) % count
+
+
+def artifact_path(shard_dir, index, count):
+    return Path(shard_dir) / f"shard-{index}-of-{count}.json"
+
+
+def write_artifact(path, index, count, names, listings, resolved, resolver_base=None):
+    """Parçanın liste sıralarını ve çözdüğü dizileri atomik olarak yazar"""
+    payload = {
+        "version": ARTIFACT_VERSION,
+        "shard": index,
+        "count": count,
+        "catalogs": list(names),
+        "resolver_base": resolver_base,
+        "listings": [list(links) for links in listings],
+        "resolved": {
+            url: {"title": title, "logo_url": logo_url, "entries": [list(e) for e in entries]}
+            for url, (title, logo_url, entries) in resolved.items()
+        },
+    }
+    atomic_write(path, lambda f: json.dump(payload, f, ensure_ascii=False))
+    logger.info(f"[SHARD] {index}/{count}: {len(resolved)} dizi → {path}")
+
+
+def load_artifacts(shard_dir):
+    """Dizindeki parçaları okur ve eksiksiz, uyumlu bir küme oluşturduklarını doğrular"""
+    artifacts = []
+    for path in sorted(Path(shard_dir).glob("shard-*-of-*.json")):
+        with open(path, encoding="utf-8") as f:
+            artifacts.append(json.load(f))
+    if not artifacts:
+        raise ShardError(f"Parça bulunamadı: {shard_dir}")
+
+    first = artifacts[0]
+    count = first["count"]
+    for artifact in artifacts:
+        for key in ("version", "count", "catalogs", "resolver_base"):
+            if artifact[key] != first[key]:
+                raise ShardError(f"Parçalar uyumsuz ({key}): {artifact[key]!r} != {first[key]!r}")
+    indices = sorted(artifact["shard"] for artifact in artifacts)
+    if indices != list(range(count)):
+        missing = sorted(set(range(count)) - set(indices))
+        raise ShardError(f"Parça kümesi eksik ya da yinelenmiş: {indices} (eksik: {missing}, N={count})")
+    return sorted(artifacts, key=lambda artifact: artifact["shard"])
+
+
+def merge_artifacts(artifacts):
+    """Parçalardan (katalog adları, listeler, dizi URL'si → sonuç, resolver_base) üretir"""
+    base = artifacts[0]
+    listings = base["listings"]
+    resolved = {}
+    for artifact in artifacts:
+        if artifact["listings"] != listings:
+            # Farklı listelerle birleştirmek dizileri sessizce düşürür ya da eksik yazar
+            raise ShardError(
+                f"Parçalar uyumsuz (listings): {artifact['shard']}. parçanın listeleri 0. parçanınkinden farklı; "
+                f"parçaları aynı listeyle yeniden çalıştır"
+            )
+        for url, result in artifact["resolved"].items():
+            resolved[url] = (result["title"], result["logo_url"], [tuple(e) for e in result["entries"]])
+    logger.info(f"[SHARD] {len(artifacts)} parça birleştirildi: {len(resolved)} dizi")
+    return base["catalogs"], listings, resolved, base["resolver_base"]
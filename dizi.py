@@ -1,20 +1,31 @@
 import asyncio
 import aiohttp
+import contextvars
 import re
 import os
+import sys
+from collections import deque
 from itertools import islice
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlencode, urljoin, urlparse
 from bs4 import BeautifulSoup
 import logging
-from concurrent.futures import ThreadPoolExecutor
 import time
 
+import extraction
+from adaptive_limit import HostLimits, request_meter
+from http_cache import SingleFlight
+from parse_pool import ParsePool
+from m3u_journal import SeriesJournal, atomic_write, journal_path_for
+from premiumvideo import PREMIUMVIDEO_DOMAINS, DomainResolver, M3U8Validator, Speculation, build_gujan_url, build_master_url, race_domains, series_key_from_url
+from strategy_registry import StrategyRegistry
+
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
 BASE_URL = "https://dizifun5.com/"
+LISTING_URL = f"{BASE_URL}/diziler"
 PROXY_BASE_URL = "https://3.nejyoner19.workers.dev/"
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -25,18 +36,69 @@ HEADERS = {
     "Upgrade-Insecure-Requests": "1",
 }
 
+# Kalıcı yanıt önbelleği (http_cache.HttpCache); None ise kapalı, --cache ile açılır
+response_cache = None
+# file_id → domain önbelleği ve dizi / genel domain yakınlığı (çalışma boyunca)
+domain_resolver = DomainResolver()
+# Host başına AIMD eşzamanlılık penceresi (fetch_page, m3u8 testi, Playhouse redirect'i)
+host_limits = HostLimits()
+# m3u8 doğrulama kararları; --cache ile çalışmalar arasında da saklanır
+m3u8_validator = M3U8Validator(limits=host_limits)
+# Bölüm çözücü stratejilerinin site / dizi bazında başarı geçmişi; --cache ile kalıcı
+strategy_registry = StrategyRegistry()
+# file_id'den kurulan akış adreslerinin iframe / redirect'siz denenmesi ve kazanma oranı
+speculation = Speculation()
+# Ayrıştırma işlem havuzu; main'de başlatılır, --inline-parse ile loop içinde kalır
+parse_pool = ParsePool()
+# Aynı URL için eşzamanlı istekleri birleştirir, son sayfaları bellekte tutar
+page_flight = SingleFlight()
+# Çözülmüş akış deposu (stream_store.StreamStore); None ise kapalı, --incremental ile açılır
+stream_store = None
+DEFAULT_RESOLVER_BASE = "http://127.0.0.1:8080"
+# Oynatmada çözüm sunucusu (resolver_server.py) adresi; None ise akışlar liste
+# oluşturulurken çözülür, --resolve-on-play=URL ile yalnızca bölüm listesi taranır
+resolver_base = None
+# Çözülemeyen bölümler defteri (failure_ledger.FailureLedger); --incremental ile açılır
+failure_ledger = None
+# Dizi sayfası yeniden tarama takvimi (recrawl_schedule.RecrawlSchedule); --incremental ile
+# açılır, --full-recrawl ile tüm dizi sayfaları yine taranır
+recrawl_schedule = None
+# Süre bütçesi (time_budget.TimeBudget); --time-budget ile açılır. Yumuşak sınırdan
+# sonra depoda kaydı olan bölümler yeniden doğrulanmaz, yalnızca yeni bölümler çözülür
+time_budget = None
+
+# Tüm dizilerin bölüm çözümleri için ortak üst sınır; host başına gerçek
+# eşzamanlılığı host_limits'teki AIMD penceresi belirler
+EPISODE_WORKERS = 32
+# Bağlantı havuzu üst sınırı (host pencerelerinin toplamı için)
+CONNECTION_LIMIT = 64
+EPISODE_QUEUE_SIZE = 200
+# Aynı anda meta veri / bölüm listesi alınan dizi sayısı (çıktı sırası bundan etkilenmez)
+SERIES_WINDOW = 20
 
-def create_proxy_url(original_url):
-    """M3U8 URL'sini proxy üzerinden geçirir"""
+
+def create_proxy_url(original_url, referer=BASE_URL):
+    """M3U8 URL'sini proxy üzerinden geçirir (referer=None ise referer eklenmez)"""
     if not original_url:
         return None
     
     # Proxy URL oluştur
-    proxy_url = f"{PROXY_BASE_URL}?referer={BASE_URL}&url={original_url}"
+    if referer:
+        proxy_url = f"{PROXY_BASE_URL}?referer={referer}&url={original_url}"
+    else:
+        proxy_url = f"{PROXY_BASE_URL}?url={original_url}"
     logger.info(f"[PROXY] {original_url} -> {proxy_url}")
     return proxy_url
 
 
+def create_resolver_url(episode_url, referer=BASE_URL, base=None):
+    """Bölüm URL'sini oynatmada çözecek resolver_server adresine çevirir"""
+    params = {"src": episode_url}
+    if referer:
+        params["ref"] = referer
+    return f"{(base or resolver_base).rstrip('/')}/resolve?{urlencode(params)}"
+
+
 def sanitize_id(text):
     """Metni ID formatına dönüştürür - Türkçe karakterleri düzgün handle eder"""
     if not text:
@@ -121,16 +183,38 @@ def normalize_episode_numbers(episode_links):
     
     return normalized_episodes
 
-async def fetch_page(session, url, timeout=45):  
-    """Async olarak sayfa içeriğini getirir - geliştirilmiş versiyon"""
+async def fetch_page(session, url, timeout=45, revalidate=False):
+    """Async olarak sayfa içeriğini getirir - geliştirilmiş versiyon
+
+    revalidate: taze önbellek kaydı ve LRU atlanır, sunucuya koşullu istek atılır.
+    """
+    if revalidate:
+        page_flight.forget(url)
+    return await page_flight.fetch(url, lambda: _download_page(session, url, timeout, revalidate))
+
+async def _download_page(session, url, timeout, revalidate=False):
     try:
-        async with session.get(url, headers=HEADERS, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
-            if response.status == 200:
-                content = await response.text()
-                return content
-            else:
-                logger.warning(f"[!] HTTP {response.status} hatası: {url}")
-                return None
+        headers = HEADERS
+        cached = response_cache.lookup(url) if response_cache else None
+        if cached is not None:
+            if cached.fresh and not revalidate:
+                return cached.text
+            headers = {**HEADERS, **cached.conditional_headers()}
+        
+        async with host_limits.slot(url) as slot:
+            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=slot.timeout(timeout))) as response:
+                slot.observe(response.status)
+                if response.status == 304 and cached is not None:
+                    response_cache.record_not_modified(url, cached)
+                    return cached.text
+                if response.status == 200:
+                    content = await response.text()
+                    if response_cache:
+                        response_cache.store(url, content.encode("utf-8"), response.headers)
+                    return content
+                else:
+                    logger.warning(f"[!] HTTP {response.status} hatası: {url}")
+                    return None
     except asyncio.TimeoutError:
         logger.error(f"[!] Timeout hatası ({timeout}s): {url}")
         return None
@@ -139,211 +223,154 @@ async def fetch_page(session, url, timeout=45):
         return None
 
 async def extract_gujan_m3u8(session, gujan_iframe_url):
-    """Gujan iframe'inden m3u8 URL'sini çıkarır"""
+    """Gujan iframe'inden m3u8 URL'sini çıkarır: (m3u8_url, doğrulandı_mı)
+
+    Sayfadan okunan adres doğrulanmış sayılır; sayfada yoksa file_id'den
+    kurulan adres doğrulanmamış son çare olarak döner.
+    """
     try:
         
         if gujan_iframe_url.startswith("//"):
             gujan_iframe_url = "https:" + gujan_iframe_url
         
+        # Hızlı yol: file_id'den kurulan adres doğrulanırsa iframe hiç indirilmez
+        file_id_match = re.search(r'/e/([a-zA-Z0-9]+)', gujan_iframe_url)
+        if file_id_match and speculation.enabled("gujan"):
+            constructed_m3u8 = build_gujan_url(file_id_match.group(1))
+            is_valid = await test_m3u8_url(session, constructed_m3u8)
+            speculation.record("gujan", is_valid)
+            if is_valid:
+                logger.info(f"[GUJAN] ✅ Kurulan M3U8 doğrulandı, iframe atlandı: {constructed_m3u8}")
+                return constructed_m3u8, True
+        
         logger.info(f"[GUJAN] İframe URL'sine istek atılıyor: {gujan_iframe_url}")
         
         
         content = await fetch_page(session, gujan_iframe_url)
         if not content:
             logger.warning(f"[GUJAN] İframe içeriği alınamadı: {gujan_iframe_url}")
-            return None
-        
-       
-        soup = BeautifulSoup(content, 'html.parser')
-        
+            return None, False
         
-        source_element = soup.select_one('source[type="application/x-mpegURL"]')
-        if source_element:
-            m3u8_url = source_element.get('src')
-            if m3u8_url:
-                logger.info(f"[GUJAN] ✅ M3U8 URL bulundu: {m3u8_url}")
-                return m3u8_url
-        
-        
-        scripts = soup.find_all('script')
-        for script in scripts:
-            script_content = script.get_text() or ""
-            
-            
-            m3u8_patterns = [
-                r'https?://[^"\s]+/hls/[^"/\s]+/playlist\.m3u8',
-                r'https?://[^"\s]+\.m3u8',
-                r'"(https?://gujan\.premiumvideo\.click/hls/[^"]+)"'
-            ]
-            
-            for pattern in m3u8_patterns:
-                matches = re.findall(pattern, script_content)
-                if matches:
-                    m3u8_url = matches[0]
-                    logger.info(f"[GUJAN] ✅ Script'ten M3U8 URL bulundu: {m3u8_url}")
-                    return m3u8_url
+        m3u8_url = await parse_pool.run(extraction.gujan_stream, content, extraction.EXTRACTION_MODE)
+        if m3u8_url:
+            logger.info(f"[GUJAN] ✅ M3U8 URL bulundu: {m3u8_url}")
+            return m3u8_url, True
         
         
-        file_id_match = re.search(r'/e/([a-zA-Z0-9]+)', gujan_iframe_url)
         if file_id_match:
-            file_id = file_id_match.group(1)
-            constructed_m3u8 = f"https://gujan.premiumvideo.click/hls/{file_id}_o/playlist.m3u8"
-            logger.info(f"[GUJAN] ✅ Constructed M3U8 URL: {constructed_m3u8}")
-            return constructed_m3u8
+            constructed_m3u8 = build_gujan_url(file_id_match.group(1))
+            logger.info(f"[GUJAN] ⚠️ Constructed M3U8 URL (doğrulanmadı): {constructed_m3u8}")
+            return constructed_m3u8, False
         
         logger.warning(f"[GUJAN] ❌ M3U8 URL bulunamadı: {gujan_iframe_url}")
-        return None
+        return None, False
         
     except Exception as e:
         logger.error(f"[GUJAN] ❌ Hata: {e}")
-        return None
+        return None, False
 
-async def get_correct_domain_from_playhouse(session, file_id, timeout=15):
-    """Playhouse URL'ine istek atıp redirect edilen doğru domain'i bulur"""
+async def get_correct_domain_from_playhouse(session, file_id, timeout=15, series_key=None):
+    """Playhouse URL'ine istek atıp redirect edilen doğru domain'i bulur: (domain, m3u8_url, doğrulandı_mı)"""
+    cached = domain_resolver.lookup(file_id)
+    if cached:
+        # domain_resolver yalnızca doğrulanmış adresleri saklar
+        return (*cached, True)
+    
+    # Dizinin (ya da genelin) domain'i yeterince belliyse redirect atlanır;
+    # değilse spekülatif olarak en olası domain denenir
+    guessed_domain = domain_resolver.confident_domain(series_key)
+    speculative = False
+    if not guessed_domain and speculation.enabled("playhouse"):
+        guessed_domain = domain_resolver.ordered_domains(series_key)[0]
+        speculative = True
+    if guessed_domain:
+        m3u8_url = build_master_url(guessed_domain, file_id)
+        is_valid = await test_m3u8_url(session, m3u8_url)
+        if speculative:
+            speculation.record("playhouse", is_valid)
+        else:
+            domain_resolver.record_guess(is_valid)
+        if is_valid:
+            logger.info(f"[✅] Öğrenilen domain doğrulandı, redirect atlandı: {guessed_domain}")
+            domain_resolver.record(file_id, guessed_domain, m3u8_url, series_key)
+            return guessed_domain, m3u8_url, True
+    
     playhouse_url = f"https://playhouse.premiumvideo.click/player/{file_id}"
     
     try:
         logger.info(f"[*] Playhouse URL'ine redirect testi: {playhouse_url}")
+        domain_resolver.stats["redirect"] += 1
         
+        async with host_limits.slot(playhouse_url) as slot:
+            async with session.get(playhouse_url,
+                                   headers=HEADERS,
+                                   timeout=aiohttp.ClientTimeout(total=slot.timeout(timeout)),
+                                   allow_redirects=True) as response:
+                slot.observe(response.status)
+                final_url = str(response.url)
+        logger.info(f"[*] Final redirect URL: {final_url}")
         
-        async with session.get(playhouse_url, 
-                              headers=HEADERS, 
-                              timeout=aiohttp.ClientTimeout(total=timeout),
-                              allow_redirects=True) as response:
+        
+        domain_match = re.search(r'https://([^.]+)\.premiumvideo\.click', final_url)
+        if domain_match:
+            domain = domain_match.group(1)
+            logger.info(f"[✅] Redirect edilen domain bulundu: {domain}")
             
-            final_url = str(response.url)
-            logger.info(f"[*] Final redirect URL: {final_url}")
             
+            m3u8_url = build_master_url(domain, file_id)
             
-            domain_match = re.search(r'https://([^.]+)\.premiumvideo\.click', final_url)
-            if domain_match:
-                domain = domain_match.group(1)
-                logger.info(f"[✅] Redirect edilen domain bulundu: {domain}")
-                
-                
-                m3u8_url = f"https://{domain}.premiumvideo.click/uploads/encode/{file_id}/master.m3u8"
-                
-                
-                is_valid = await test_m3u8_url(session, m3u8_url)
-                if is_valid:
-                    logger.info(f"[✅] M3U8 URL doğrulandı: {m3u8_url}")
-                    return domain, m3u8_url
-                else:
-                    logger.warning(f"[⚠️] M3U8 URL doğrulanamadı ama domain bulundu: {domain}")
-                    return domain, m3u8_url
+            
+            is_valid = await test_m3u8_url(session, m3u8_url)
+            if is_valid:
+                logger.info(f"[✅] M3U8 URL doğrulandı: {m3u8_url}")
+                domain_resolver.record(file_id, domain, m3u8_url, series_key)
+                return domain, m3u8_url, True
             else:
-                logger.warning(f"[⚠️] Redirect URL'den domain çıkarılamadı: {final_url}")
-                
-                
-                logger.info(f"[*] Fallback: Eski domain test sistemi kullanılıyor")
-                return await find_working_domain_fallback(session, file_id)
-                
+                logger.warning(f"[⚠️] M3U8 URL doğrulanamadı ama domain bulundu: {domain}")
+                return domain, m3u8_url, False
+        else:
+            logger.warning(f"[⚠️] Redirect URL'den domain çıkarılamadı: {final_url}")
+            
+            
+            logger.info(f"[*] Fallback: Eski domain test sistemi kullanılıyor")
+            return await find_working_domain_fallback(session, file_id, series_key=series_key)
+            
     except asyncio.TimeoutError:
         logger.warning(f"[⚠️] Playhouse timeout, fallback sistem kullanılıyor")
-        return await find_working_domain_fallback(session, file_id)
+        return await find_working_domain_fallback(session, file_id, series_key=series_key)
     except Exception as e:
         logger.warning(f"[⚠️] Playhouse hatası: {e}, fallback sistem kullanılıyor")
-        return await find_working_domain_fallback(session, file_id)
+        return await find_working_domain_fallback(session, file_id, series_key=series_key)
 
-async def find_working_domain_fallback(session, file_id, domains=["d1", "d2", "d3", "d4"]):
-    """Fallback: Eski sistem ile çalışan domain bulma"""
-    logger.info(f"[*] Fallback domain testi başlıyor...")
-    
-    for domain in domains:
-        m3u8_url = f"https://{domain}.premiumvideo.click/uploads/encode/{file_id}/master.m3u8"
-        
-        logger.info(f"[*] Fallback test: {domain}")
-        is_working = await test_m3u8_url(session, m3u8_url)
-        
-        if is_working:
-            logger.info(f"[✅] Fallback domain çalışıyor: {domain}")
-            return domain, m3u8_url
-    
-    
-    logger.warning(f"[⚠️] Hiçbir domain çalışmıyor! Default d2 kullanılacak.")
-    return "d2", f"https://d2.premiumvideo.click/uploads/encode/{file_id}/master.m3u8"
+async def find_working_domain_fallback(session, file_id, domains=PREMIUMVIDEO_DOMAINS, series_key=None):
+    """Fallback: Tüm mirror'ları yarıştırır, ilk doğrulanan domain'i kullanır: (domain, m3u8_url, doğrulandı_mı)"""
+    logger.info(f"[*] Fallback domain yarışı başlıyor...")
+    domain_resolver.stats["fallback"] += 1
+    
+    candidates = domain_resolver.ordered_domains(series_key, domains)
+    domain = await race_domains(
+        lambda d: test_m3u8_url(session, build_master_url(d, file_id)),
+        candidates,
+        on_result=domain_resolver.record_probe,
+    )
+    
+    if domain:
+        m3u8_url = build_master_url(domain, file_id)
+        logger.info(f"[✅] Fallback domain çalışıyor: {domain}")
+        domain_resolver.record(file_id, domain, m3u8_url, series_key)
+        return domain, m3u8_url, True
+    
+    
+    logger.warning(f"[⚠️] Hiçbir domain çalışmıyor! Default d2 (doğrulanmamış) son çare olarak kalıyor.")
+    return "d2", build_master_url("d2", file_id), False
 
 async def test_m3u8_url(session, url, timeout=15):
-    """Geliştirilmiş m3u8 URL test fonksiyonu"""
-    try:
-        async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout), allow_redirects=True) as response:
-            final_url = str(response.url)
-            content_type = response.headers.get("Content-Type", "").lower()
-            content_length = response.headers.get("Content-Length")
-            
-            logger.info(f"[DEBUG] Test URL: {url}")
-            logger.info(f"[DEBUG] Final URL: {final_url}")
-            logger.info(f"[DEBUG] Status: {response.status}")
-            logger.info(f"[DEBUG] Content-Type: {content_type}")
-            
-            
-            if response.status != 200:
-                logger.info(f"[DEBUG] Status code 200 değil: {response.status}")
-                return False
-            
-           
-            if "premiumvideo.click" not in final_url:
-                logger.info(f"[DEBUG] Redirect: premiumvideo.click domain'inden çıkmış: {final_url}")
-                return False
-            
-            
-            try:
-                content = await response.content.read(4096)
-                text = content.decode('utf-8', errors='ignore')
-                
-                logger.info(f"[DEBUG] İçerik ilk 100 karakter: {text[:100]}")
-                
-                
-                if not text.strip().startswith("#EXTM3U"):
-                    logger.info(f"[DEBUG] İçerik #EXTM3U ile başlamıyor")
-                    return False
-                
-               
-                suspicious_patterns = [
-                    r"<html", r"<body", r"<title", r"error", r"not found", 
-                    r"access denied", r"kerimkirac\.com", r"404", r"403", r"500"
-                ]
-                
-                for pattern in suspicious_patterns:
-                    if re.search(pattern, text, re.IGNORECASE):
-                        logger.info(f"[DEBUG] Şüpheli pattern bulundu: {pattern}")
-                        return False
-                
-                
-                if content_length and int(content_length) < 50:
-                    logger.info(f"[DEBUG] Content-Length çok küçük: {content_length}")
-                    return False
-                
-                
-                if "master.m3u8" not in final_url and "playlist.m3u8" not in final_url:
-                    logger.info(f"[DEBUG] URL'de m3u8 yok: {final_url}")
-                    return False
-                
-                logger.info(f"[DEBUG] ✅ Tüm kontroller başarılı!")
-                return True
-                
-            except UnicodeDecodeError:
-                logger.info(f"[DEBUG] Unicode decode hatası - muhtemelen binary content")
-                return False
-                
-    except asyncio.TimeoutError:
-        logger.info(f"[DEBUG] Timeout: {url}")
-        return False
-    except Exception as e:
-        logger.warning(f"[DEBUG] Test hatası: {e}")
-        return False
+    """m3u8 URL test fonksiyonu (premiumvideo.M3U8Validator: Range isteği + karar önbelleği)"""
+    return await m3u8_validator.validate(session, url, timeout)
 
-async def get_series_from_page(session, page_num):
-    """Belirli bir sayfadan dizi listesini alır"""
-    diziler_url = f"{BASE_URL}/diziler?p={page_num}"
-    logger.info(f"Sayfa {page_num} alınıyor: {diziler_url}")
-    
-    content = await fetch_page(session, diziler_url)
-    if not content:
-        logger.warning(f"[!] Sayfa {page_num} alınamadı.")
-        return [], False
-    
-    soup = BeautifulSoup(content, 'html.parser')
+def _parse_series_listing(content, page_num, base):
+    """Liste sayfasından dizi linklerini ve sonraki sayfa bağlantısı olup olmadığını çıkarır"""
+    soup = extraction.parse_links_page(content)
     
     
     series_links = []
@@ -353,7 +380,7 @@ async def get_series_from_page(session, page_num):
     for element in link_elements:
         href = element.get("href")
         if href:
-            full_url = fix_url(href)
+            full_url = fix_url(href, base)
             if full_url and full_url not in series_links:
                 series_links.append(full_url)
     
@@ -378,53 +405,72 @@ async def get_series_from_page(session, page_num):
         if has_next_page:
             break
     
+    return series_links, has_next_page
+
+def _has_series_cards(content):
+    """Sayfada dizi kartı var mı (sonraki sayfa kontrolü)"""
+    soup = BeautifulSoup(content, 'html.parser')
+    return bool(soup.select(".uk-grid .uk-width-large-1-6 a.uk-position-cover"))
+
+async def get_series_from_page(session, page_num, listing_url=LISTING_URL, base=BASE_URL):
+    """Belirli bir sayfadan dizi listesini alır"""
+    diziler_url = f"{listing_url}?p={page_num}"
+    logger.info(f"Sayfa {page_num} alınıyor: {diziler_url}")
+    
+    content = await fetch_page(session, diziler_url)
+    if not content:
+        logger.warning(f"[!] Sayfa {page_num} alınamadı.")
+        return [], False
+    
+    series_links, has_next_page = await parse_pool.run(_parse_series_listing, content, page_num, base)
+    
     
     if not has_next_page and series_links:
-        next_page_url = f"{BASE_URL}/diziler?p={page_num + 1}"
+        next_page_url = f"{listing_url}?p={page_num + 1}"
         next_content = await fetch_page(session, next_page_url)
         if next_content:
-            next_soup = BeautifulSoup(next_content, 'html.parser')
-            next_links = next_soup.select(".uk-grid .uk-width-large-1-6 a.uk-position-cover")
-            if next_links:
+            if await parse_pool.run(_has_series_cards, next_content):
                 has_next_page = True
     
     logger.info(f"[+] Sayfa {page_num}: {len(series_links)} dizi linki toplandı. Sonraki sayfa: {'Var' if has_next_page else 'Yok'}")
     return series_links, has_next_page
 
-async def get_series_from_homepage():
+async def get_series_from_homepage(session=None, listing_url=LISTING_URL, base=BASE_URL, max_pages=100):
     """Tüm sayfalardan dizi listesini alır"""
-    async with aiohttp.ClientSession() as session:
-        all_series_links = []
-        page_num = 1
-        max_pages = 100  
+    if session is None:
+        async with aiohttp.ClientSession() as session:
+            return await get_series_from_homepage(session, listing_url, base, max_pages)
+
+    all_series_links = []
+    page_num = 1
+    
+    while page_num <= max_pages:
+        series_links, has_next_page = await get_series_from_page(session, page_num, listing_url, base)
         
-        while page_num <= max_pages:
-            series_links, has_next_page = await get_series_from_page(session, page_num)
-            
-            if not series_links:
-                logger.info(f"[!] Sayfa {page_num} boş, tarama durduruluyor.")
-                break
-            
-            
-            new_count = 0
-            for link in series_links:
-                if link not in all_series_links:
-                    all_series_links.append(link)
-                    new_count += 1
-            
-            logger.info(f"[+] Sayfa {page_num}: {new_count} yeni dizi eklendi. Toplam: {len(all_series_links)}")
-            
-            if not has_next_page:
-                logger.info(f"[✓] Son sayfa ({page_num}) işlendi.")
-                break
-            
-            page_num += 1
-            
-            
-            await asyncio.sleep(0.5)
+        if not series_links:
+            logger.info(f"[!] Sayfa {page_num} boş, tarama durduruluyor.")
+            break
         
-        logger.info(f"[✓] Toplam {len(all_series_links)} benzersiz dizi linki toplandı ({page_num} sayfa tarandı).")
-        return all_series_links
+        
+        new_count = 0
+        for link in series_links:
+            if link not in all_series_links:
+                all_series_links.append(link)
+                new_count += 1
+        
+        logger.info(f"[+] Sayfa {page_num}: {new_count} yeni dizi eklendi. Toplam: {len(all_series_links)}")
+        
+        if not has_next_page:
+            logger.info(f"[✓] Son sayfa ({page_num}) işlendi.")
+            break
+        
+        page_num += 1
+        
+        
+        await asyncio.sleep(0.5)
+    
+    logger.info(f"[✓] Toplam {len(all_series_links)} benzersiz dizi linki toplandı ({page_num} sayfa tarandı).")
+    return all_series_links
 
 async def get_series_metadata(session, series_url):
     """Dizi meta verilerini alır"""
@@ -432,6 +478,10 @@ async def get_series_metadata(session, series_url):
     if not content:
         return "Bilinmeyen Dizi", ""
     
+    return await parse_pool.run(_parse_series_metadata, content, series_url)
+
+def _parse_series_metadata(content, series_url):
+    """Dizi sayfasından başlık ve logo"""
     soup = BeautifulSoup(content, 'html.parser')
     
     
@@ -444,7 +494,7 @@ async def get_series_metadata(session, series_url):
     if logo_element:
         logo_url = logo_element.get("src") or ""
 
-    logo_url = fix_url(logo_url)
+    logo_url = fix_url(logo_url, series_url)
 
     return title, logo_url
 
@@ -454,6 +504,10 @@ async def get_episode_links(session, series_url):
     if not content:
         return []
     
+    return await parse_pool.run(_parse_episode_links, content, series_url)
+
+def _parse_episode_links(content, series_url):
+    """Dizi sayfasındaki sezon / bölüm linklerini normalize edilmiş olarak döndürür"""
     soup = BeautifulSoup(content, 'html.parser')
     episode_links = []
     
@@ -489,7 +543,7 @@ async def get_episode_links(session, series_url):
                         if isinstance(href, str) and href.startswith("?"):
                             full_url = f"{series_url}{href}"
                         else:
-                            full_url = fix_url(href)
+                            full_url = fix_url(href, series_url)
                         
                         if full_url and full_url != series_url and full_url not in [e[0] for e in episode_links]:
                             episode_links.append((full_url, int(season_num)))
@@ -512,7 +566,7 @@ async def get_episode_links(session, series_url):
                     if isinstance(href, str) and href.startswith("?"):
                         full_url = f"{series_url}{href}"
                     else:
-                        full_url = fix_url(href)
+                        full_url = fix_url(href, series_url)
                     
                     if full_url and full_url != series_url and full_url not in [e[0] for e in episode_links]:
                         
@@ -526,210 +580,396 @@ async def get_episode_links(session, series_url):
     logger.info(f"[+] Toplam {len(normalized_episodes)} bölüm bulundu ve normalize edildi.")
     return normalized_episodes
 
-async def extract_m3u8_from_episode(session, episode_url, season_num, episode_num):
-    """Bölüm sayfasından m3u8 linkini çıkarır - YENİ SİSTEM (Gujan + Playhouse + Proxy)"""
-    content = await fetch_page(session, episode_url)
+async def _resolve_via_gujan(session, candidates, episode_url):
+    """Gujan iframe'i → Gujan sayfasındaki m3u8"""
+    unverified = (None, None, False)
+    for src in candidates["gujan_srcs"]:
+        logger.info(f"[+] Gujan iframe bulundu: {src}")
+        m3u8_url, validated = await extract_gujan_m3u8(session, src)
+        if m3u8_url:
+            gujan_match = re.search(r'/e/([a-zA-Z0-9]+)', src)
+            result = (m3u8_url, gujan_match.group(1) if gujan_match else None, validated)
+            if validated:
+                logger.info(f"[✅] Gujan'dan M3U8 başarıyla alındı!")
+                return result
+            if unverified[0] is None:
+                unverified = result
+    return unverified
+
+async def _resolve_via_playhouse(session, candidates, episode_url):
+    """Playhouse iframe'i ya da script'teki hexToString → redirect edilen domain"""
+    playhouse_url = candidates["playhouse_url"]
+    if playhouse_url:
+        logger.info(f"[+] Playhouse URL bulundu: {playhouse_url}")
+        playhouse_match = re.search(r'playhouse\.premiumvideo\.click/player/([a-zA-Z0-9]+)', playhouse_url)
+        if playhouse_match:
+            file_id = playhouse_match.group(1)
+            logger.info(f"[+] Playhouse File ID bulundu: {file_id}")
+            
+            working_domain, m3u8_url, validated = await get_correct_domain_from_playhouse(
+                session, file_id, series_key=series_key_from_url(episode_url))
+            logger.info(f"[+] Bulunan domain: {working_domain}, M3U8: {m3u8_url}")
+            return m3u8_url, file_id, validated
+    return None, None, False
+
+async def _resolve_via_fallback(session, candidates, episode_url):
+    """Eski sistem: player.php?file_id= iframe'i → mirror yarışı"""
+    if candidates["fallback"]:
+        iframe_url, file_id = candidates["fallback"]
+        logger.info(f"[+] Fallback iframe URL: {iframe_url}")
+        logger.info(f"[+] Fallback File ID: {file_id}")
+        
+        working_domain, m3u8_url, validated = await find_working_domain_fallback(
+            session, file_id, series_key=series_key_from_url(episode_url))
+        return m3u8_url, file_id, validated
+    return None, None, False
+
+# Strateji adı → çözücü (m3u8_url, file_id, doğrulandı_mı); deneme sırasını strategy_registry belirler.
+# Yalnızca doğrulanan adres kazanç sayılır ve döngüyü bitirir.
+EPISODE_STRATEGIES = {
+    "gujan": _resolve_via_gujan,
+    "playhouse": _resolve_via_playhouse,
+    "fallback": _resolve_via_fallback,
+}
+
+async def extract_m3u8_from_episode(session, episode_url, season_num, episode_num, use_proxy=True):
+    """Bölüm sayfasından m3u8 linkini çıkarır - YENİ SİSTEM (Gujan + Playhouse + Proxy)
+
+    Stratejiler, bu dizide / sitede geçmişte en çok kazanan önce olacak sırayla denenir.
+    Doğrulanmamış adresler (ör. fallback'in d2 tahmini) yalnızca hiçbir strateji
+    doğrulanmış adres bulamazsa son çare olarak kullanılır.
+    Daha önce çözülemeyen ve oyuncu kısmı değişmeyen bölümler failure_ledger'a göre ertelenir.
+    """
+    # Kayıtlı hatada önbellekteki sayfa yeniden doğrulanır; yoksa parmak izi hiç değişmez
+    revalidate = bool(failure_ledger and failure_ledger.has_entry(episode_url))
+    content = await fetch_page(session, episode_url, revalidate=revalidate)
     if not content:
-        return None, None, None
-    
-    soup = BeautifulSoup(content, 'html.parser')
+        return None, None, None, None, None
     
+    candidates = await parse_pool.run(extraction.player_candidates, content, episode_url,
+                                      extraction.EXTRACTION_MODE)
+    episode_name = candidates["title"] or "Bilinmeyen Bölüm"
     
-    title_element = soup.select_one("title")
-    episode_name = title_element.get_text(strip=True) if title_element else "Bilinmeyen Bölüm"
+    fingerprint = candidates["fingerprint"]
+    if failure_ledger and failure_ledger.should_skip(episode_url, fingerprint):
+        return episode_name, episode_num, None, None, None
     
     logger.info(f"[*] İşleniyor: Sezon {season_num}, Bölüm {episode_num}")
     
     m3u8_url = None
+    strategy = None
+    file_id = None
+    site = urlparse(episode_url).hostname
+    series_key = series_key_from_url(episode_url)
+    tried = []
+    unverified = None
+    reason = None
+    meter = [0, 0]
+    token = request_meter.set(meter)
+    transient = False
     
     try:
-        
-        gujan_iframe_selectors = [
-            'iframe[title="dizifunplay"]',
-            'iframe[id="altPlayerFrame"]',
-            'iframe[src*="gujan.premiumvideo.click"]'
-        ]
-        
-        for selector in gujan_iframe_selectors:
-            iframe_element = soup.select_one(selector)
-            if iframe_element:
-                src = iframe_element.get("src")
-                if src and "gujan.premiumvideo.click" in src:
-                    logger.info(f"[+] Gujan iframe bulundu: {src}")
-                    m3u8_url = await extract_gujan_m3u8(session, src)
-                    if m3u8_url:
-                        logger.info(f"[✅] Gujan'dan M3U8 başarıyla alındı!")
-                        break
-        
-        
-        if not m3u8_url:
-            logger.info("[*] Gujan bulunamadı, Playhouse sistemi deneniyor...")
-            
-            
-            iframe_selectors = [
-                'iframe[title="playhouse"]',
-                'iframe[src*="playhouse.premiumvideo.click"]',
-                'iframe[src*="premiumvideo.click/player"]'
-            ]
-            
-            playhouse_url = None
-            file_id = None
-            
-            
-            for selector in iframe_selectors:
-                iframe_element = soup.select_one(selector)
-                if iframe_element:
-                    src = iframe_element.get("src")
-                    if src and "playhouse.premiumvideo.click" in src:
-                        if src.startswith("//"):
-                            src = "https:" + src
-                        playhouse_url = src
-                        logger.info(f"[+] Playhouse iframe bulundu: {playhouse_url}")
-                        break
-            
-            
-            if not playhouse_url:
-                scripts = soup.find_all('script')
-                for script in scripts:
-                    script_content = script.get_text() or ""
-                    
-                    hex_pattern = re.compile(r'hexToString\w*\("([a-fA-F0-9]+)"\)')
-                    hex_matches = hex_pattern.findall(script_content)
-                    
-                    if hex_matches:
-                        logger.info(f"[+] Script içinde {len(hex_matches)} hex URL bulundu.")
-                        for hex_value in hex_matches:
-                            try:
-                                decoded_url = bytes.fromhex(hex_value).decode('utf-8')
-                                if decoded_url and "playhouse.premiumvideo.click" in decoded_url:
-                                    playhouse_url = decoded_url
-                                    if playhouse_url.startswith("//"):
-                                        playhouse_url = "https:" + playhouse_url
-                                    logger.info(f"[+] Hex'ten çözülen playhouse URL: {playhouse_url}")
-                                    break
-                            except Exception as e:
-                                logger.error(f"[!] Hex çözme hatası: {e}")
-                        
-                        if playhouse_url:
-                            break
-            
-            
-            if playhouse_url:
-                playhouse_match = re.search(r'playhouse\.premiumvideo\.click/player/([a-zA-Z0-9]+)', playhouse_url)
-                if playhouse_match:
-                    file_id = playhouse_match.group(1)
-                    logger.info(f"[+] Playhouse File ID bulundu: {file_id}")
-                    
-                    working_domain, m3u8_url = await get_correct_domain_from_playhouse(session, file_id)
-                    logger.info(f"[+] Bulunan domain: {working_domain}, M3U8: {m3u8_url}")
-            
-           
-            if not m3u8_url:
-                logger.info("[*] Playhouse bulunamadı, eski sistem ile deneniyor...")
-                
-                iframe_selectors_fallback = [
-                    "iframe#londonIframe",
-                    "iframe[src*=premiumvideo]",
-                    "iframe[data-src*=premiumvideo]",
-                    "iframe[src*=player]",
-                    "iframe"
-                ]
-                
-                for selector in iframe_selectors_fallback:
-                    iframe_element = soup.select_one(selector)
-                    if iframe_element:
-                        src = iframe_element.get("src")
-                        if not src or src == "about:blank":
-                            src = iframe_element.get("data-src")
-                        
-                        if src and src != "about:blank":
-                            iframe_url = fix_url(src)
-                            logger.info(f"[+] Fallback iframe URL: {iframe_url}")
-                            
-                            
-                            premium_video_match = re.search(r'premiumvideo\.click/player\.php\?file_id=([a-zA-Z0-9]+)', iframe_url)
-                            if premium_video_match:
-                                file_id = premium_video_match.group(1)
-                                logger.info(f"[+] Fallback File ID: {file_id}")
-                                
-                                working_domain, m3u8_url = await find_working_domain_fallback(session, file_id)
-                                break
+        for name in strategy_registry.order(site, series_key):
+            tried.append(name)
+            m3u8_url, file_id, validated = await EPISODE_STRATEGIES[name](session, candidates, episode_url)
+            strategy_registry.record(site, series_key, name, validated)
+            if m3u8_url and validated:
+                strategy = name
+                break
+            if m3u8_url and unverified is None:
+                unverified = (m3u8_url, file_id, name)
+            logger.info(f"[*] {name} ile doğrulanmış adres bulunamadı, sıradaki strateji deneniyor...")
+        else:
+            if unverified:
+                m3u8_url, file_id, strategy = unverified
+                logger.warning(f"[⚠️] Doğrulanmış adres yok, son çare ({strategy}): {m3u8_url}")
+            else:
+                m3u8_url = file_id = None
+                reason = f"stratejiler sonuçsuz: {', '.join(tried)}"
     
     except Exception as e:
         logger.error(f"[!] Bölüm işleme genel hatası: {e}")
-        return episode_name, episode_num, None
+        m3u8_url = file_id = None
+        reason = f"hata: {e}"
+        transient = isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError))
+    finally:
+        request_meter.reset(token)
+        strategy_registry.record_episode(len(tried), strategy)
+    
+    if failure_ledger:
+        # Timeout / bağlantı hatası / 429-5xx görülen deneme kesin hata sayılmaz
+        failure_ledger.record(episode_url, bool(m3u8_url), fingerprint, meter[0], reason,
+                              transient=transient or meter[1] > 0)
 
     
-    if m3u8_url:
+    if m3u8_url and use_proxy:
         m3u8_url = create_proxy_url(m3u8_url)
     
-    return episode_name, episode_num, m3u8_url
+    return episode_name, episode_num, m3u8_url, strategy, file_id
 
-async def process_series(all_series_links, output_filename="dizifun.m3u"):
-    """Tüm dizileri tek bir dosyaya yazar"""
-    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=10)) as session:
-        with open(output_filename, "w", encoding="utf-8") as f:
-            f.write("#EXTM3U\n")
-            
-            for series_url in all_series_links:
-                try:
-                    title, logo_url = await get_series_metadata(session, series_url)
-                    logger.info(f"\n[+] İşleniyor: {title}")
-                    
-                    normalized_episodes = await get_episode_links(session, series_url)
-                    
-                    semaphore = asyncio.Semaphore(5)
-                    
-                    async def process_episode(ep_url, season_num, episode_num):
-                        async with semaphore:
-                            return await extract_m3u8_from_episode(session, ep_url, season_num, episode_num)
-                    
-                    tasks = [process_episode(ep_url, season_num, episode_num) for ep_url, season_num, episode_num in normalized_episodes]
-                    results = await asyncio.gather(*tasks, return_exceptions=True)
-                    
-                    for i, result in enumerate(results):
-                        if isinstance(result, Exception):
-                            logger.error(f"[!] Bölüm işleme hatası: {result}")
-                            continue
-                        
-                        episode_name, episode_num, m3u8_url = result
-                        if not m3u8_url:
-                            logger.warning(f"[!] m3u8 URL bulunamadı: {normalized_episodes[i][0]}")
-                            continue
-                        
-                        season_num = normalized_episodes[i][1]
-                        normalized_episode_num = normalized_episodes[i][2]
-                        display_name = f"{title} Sezon {season_num} Bölüm {normalized_episode_num}"
-                        tvg_id = sanitize_id(f"{title}_{season_num}_{normalized_episode_num}")
-                        
-                        f.write(
-                            f'#EXTINF:-1 tvg-name="{display_name}" '
-                            f'tvg-language="Turkish" tvg-country="TR" '
-                            f'tvg-id="{tvg_id}" '
-                            f'tvg-logo="{logo_url}" '
-                            f'group-title="{title}",{display_name}\n'
-                        )
-                        f.write(m3u8_url.strip() + "\n")
-                        logger.info(f"[✓] {display_name} eklendi.")
-                
-                except Exception as e:
-                    logger.error(f"[!] Dizi işleme hatası: {e}")
-                    continue
+async def resolve_episode(session, ep_url, season_num, episode_num):
+    """Bölümü çözer; depoda süresi dolmuş bir kayıt varsa önce onu tek istekle doğrular"""
+    record = stream_store.get(ep_url) if stream_store else None
+    if record is not None:
+        if await test_m3u8_url(session, record["m3u8_url"]):
+            stream_store.stats["doğrulandı"] += 1
+            return None, episode_num, record["m3u8_url"], record["strategy"], record["file_id"]
+        logger.info(f"[STORE] Kayıtlı akış doğrulanamadı, yeniden çözülüyor: {ep_url}")
+        stream_store.stats["yeniden_çözüldü"] += 1
+    elif stream_store:
+        stream_store.stats["yeni"] += 1
+    
+    return await extract_m3u8_from_episode(session, ep_url, season_num, episode_num, use_proxy=False)
+
+class EpisodeScheduler:
+    """Farklı dizilerin bölüm çözümlerini tek bir sınırlı kuyrukta, ortak işçilerle yürütür"""
+
+    def __init__(self, session, workers=EPISODE_WORKERS, queue_size=EPISODE_QUEUE_SIZE):
+        self.session = session
+        self.worker_count = workers
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.workers = []
+
+    async def __aenter__(self):
+        self.workers = [asyncio.ensure_future(self._worker()) for _ in range(self.worker_count)]
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    async def submit(self, ep_url, season_num, episode_num):
+        """Bölümü kuyruğa ekler (kuyruk doluysa bekler) ve sonucun future'ını döndürür"""
+        future = asyncio.get_running_loop().create_future()
+        # Çağıranın bağlamı (ör. istek sayacı anahtarı) işçiye taşınır
+        context = contextvars.copy_context()
+        await self.queue.put((ep_url, season_num, episode_num, context, future))
+        return future
+
+    async def _worker(self):
+        while True:
+            ep_url, season_num, episode_num, context, future = await self.queue.get()
+            try:
+                task = context.run(
+                    asyncio.ensure_future,
+                    resolve_episode(self.session, ep_url, season_num, episode_num),
+                )
+                result = await task
+                if not future.done():
+                    future.set_result(result)
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self.queue.task_done()
+
+def _stored_series(series_url):
+    """Takvime göre zamanı gelmemiş dizi için depodaki (başlık, logo, bölümler); yoksa None"""
+    if not (recrawl_schedule and stream_store) or recrawl_schedule.is_due(series_url):
+        return None
+    stored_series = stream_store.get_series(series_url)
+    records = stream_store.series_records(series_url)
+    if not stored_series or not records:
+        return None
+    recrawl_schedule.stats["atlanan_sayfa"] += 1
+    return stored_series["title"], stored_series["logo_url"], [
+        (row["episode_url"], row["season"], row["episode"]) for row in records
+    ]
+
+async def resolve_series(session, series_url, scheduler):
+    """Bir dizinin başlığını, logosunu ve çözülen (proxy'siz) bölüm akışlarını döndürür
+
+    recrawl_schedule açıksa zamanı gelmemiş dizinin sayfası indirilmez, bölüm
+    listesi depodan alınır.
+    """
+    stored = _stored_series(series_url)
+    if stored:
+        title, logo_url, normalized_episodes = stored
+        logger.info(f"\n[+] Depodan: {title} (sayfa kontrolünün zamanı gelmedi)")
+    else:
+        title, logo_url, normalized_episodes = await _visit_series(session, series_url)
+        if normalized_episodes is None:
+            # Dizi sayfası alınamadıysa liste depodan üretilir
+            return title, logo_url, stream_store.series_entries(series_url)
     
-    logger.info(f"\n[✓] {output_filename} dosyası oluşturuldu.")
+    return await _resolve_episodes(series_url, title, logo_url, normalized_episodes, scheduler)
+
+async def _visit_series(session, series_url):
+    """Dizi sayfasından başlık, logo ve bölüm listesi; sayfa boşsa ve depo açıksa bölümler None"""
+    title, logo_url = await get_series_metadata(session, series_url)
+    if stream_store and title == "Bilinmeyen Dizi":
+        stored_series = stream_store.get_series(series_url)
+        if stored_series:
+            title, logo_url = stored_series["title"], stored_series["logo_url"]
+    logger.info(f"\n[+] İşleniyor: {title}")
+    
+    normalized_episodes = await get_episode_links(session, series_url)
+    if not normalized_episodes and stream_store:
+        return title, logo_url, None
+    if recrawl_schedule and normalized_episodes:
+        recrawl_schedule.observe(series_url, [ep_url for ep_url, _, _ in normalized_episodes])
+    return title, logo_url, normalized_episodes
+
+async def _resolve_episodes(series_url, title, logo_url, normalized_episodes, scheduler):
+    """Bölümleri (depoda geçerli olanlar hariç) ortak kuyrukta çözer, (başlık, logo, girdiler) döndürür
+
+    Kuyruğa önce depoda kaydı olmayan (yeni) bölümler, en son listelenen önde
+    girer; girdilerin sırası listedeki gibi kalır.
+    """
+    loop = asyncio.get_running_loop()
+    records = [stream_store.get(ep_url) if stream_store else None for ep_url, _, _ in normalized_episodes]
+    futures = [None] * len(normalized_episodes)
+    for i in sorted(range(len(normalized_episodes)), key=lambda i: (records[i] is not None, -i)):
+        ep_url, season_num, episode_num = normalized_episodes[i]
+        record = records[i]
+        if record is not None and (not stream_store.is_due(record)
+                                   or (time_budget is not None and time_budget.expired())):
+            stream_store.stats["depodan"] += 1
+            future = loop.create_future()
+            future.set_result(None)
+        else:
+            future = await scheduler.submit(ep_url, season_num, episode_num)
+        futures[i] = (future, record)
+    results = await asyncio.gather(*(future for future, _ in futures), return_exceptions=True)
+    
+    entries = []
+    verified = []
+    for i, result in enumerate(results):
+        ep_url, season_num, normalized_episode_num = normalized_episodes[i]
+        if result is None:
+            entries.append((season_num, normalized_episode_num, futures[i][1]["m3u8_url"]))
+            continue
+        
+        if isinstance(result, Exception):
+            logger.error(f"[!] Bölüm işleme hatası: {result}")
+            continue
+        
+        episode_name, episode_num, m3u8_url, strategy, file_id = result
+        if not m3u8_url:
+            logger.warning(f"[!] m3u8 URL bulunamadı: {ep_url}")
+            continue
+        
+        entries.append((season_num, normalized_episode_num, m3u8_url))
+        verified.append((ep_url, season_num, normalized_episode_num, m3u8_url, strategy, file_id))
+    
+    if stream_store:
+        stream_store.save_series(series_url, title, logo_url, verified)
+    
+    return title, logo_url, entries
+
+async def list_series(session, series_url, scheduler=None):
+    """Oynatmada çözüm modu: bölümleri çözmeden (sezon, bölüm, bölüm URL'si) listesini döndürür"""
+    title, logo_url = await get_series_metadata(session, series_url)
+    logger.info(f"\n[+] Listeleniyor: {title}")
+    normalized_episodes = await get_episode_links(session, series_url)
+    return title, logo_url, [(season_num, episode_num, ep_url)
+                             for ep_url, season_num, episode_num in normalized_episodes]
 
-async def main():
-    start_time = time.time()
+async def iter_resolved_series(session, all_series_links, scheduler, window=SERIES_WINDOW, resolve=resolve_series):
+    """Dizileri kayan bir pencereyle paralel çözer, sonuçları giriş sırasıyla verir"""
+    links = iter(all_series_links)
+    pending = deque()
     
-    series_urls = await get_series_from_homepage()
-    if not series_urls:
-        logger.error("[!] Dizi listesi boş, seçicileri kontrol et.")
-        return
+    def schedule_next():
+        series_url = next(links, None)
+        if series_url is not None:
+            pending.append((series_url, asyncio.ensure_future(resolve(session, series_url, scheduler))))
     
-    await process_series(series_urls)
+    for _ in range(window):
+        schedule_next()
     
-    end_time = time.time()
-    logger.info(f"\n[✓] Tüm işlemler tamamlandı. Süre: {end_time - start_time:.2f} saniye")
+    try:
+        while pending:
+            series_url, task = pending.popleft()
+            try:
+                result = await task
+            except Exception as e:
+                result = e
+            schedule_next()
+            yield series_url, result
+    finally:
+        for _, task in pending:
+            task.cancel()
+
+def write_series_entries(f, title, logo_url, entries, referer=BASE_URL):
+    """Çözülmüş bir dizinin bölümlerini proxy'leyerek M3U dosyasına yazar
+
+    resolver_base ayarlıysa girdiler (list_series) bölüm URL'si taşır ve
+    resolver_server adresine yazılır.
+    """
+    for season_num, normalized_episode_num, m3u8_url in entries:
+        display_name = f"{title} Sezon {season_num} Bölüm {normalized_episode_num}"
+        tvg_id = sanitize_id(f"{title}_{season_num}_{normalized_episode_num}")
+        
+        f.write(
+            f'#EXTINF:-1 tvg-name="{display_name}" '
+            f'tvg-language="Turkish" tvg-country="TR" '
+            f'tvg-id="{tvg_id}" '
+            f'tvg-logo="{logo_url}" '
+            f'group-title="{title}",{display_name}\n'
+        )
+        if resolver_base:
+            f.write(create_resolver_url(m3u8_url, referer) + "\n")
+        else:
+            f.write(create_proxy_url(m3u8_url, referer).strip() + "\n")
+        logger.info(f"[✓] {display_name} eklendi.")
+
+async def process_series(all_series_links, output_filename="dizifun.m3u", session=None, referer=BASE_URL, resume=False):
+    """Tüm dizileri tek bir dosyaya yazar; ilerleme günlüğe işlenir, dosya sonda atomik oluşturulur"""
+    if session is None:
+        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=CONNECTION_LIMIT)) as session:
+            return await process_series(all_series_links, output_filename, session, referer, resume)
+
+    journal_name = f"{output_filename}.lazy" if resolver_base else output_filename
+    journal = SeriesJournal(journal_path_for(journal_name), resume=resume)
+    resolve_one = list_series if resolver_base else resolve_series
+
+    async def resolve(session, series_url, scheduler):
+        if series_url in journal:
+            return journal.get(series_url)
+        return await resolve_one(session, series_url, scheduler)
+
+    try:
+        async with EpisodeScheduler(session) as scheduler:
+            async for series_url, result in iter_resolved_series(session, all_series_links, scheduler, resolve=resolve):
+                if isinstance(result, Exception):
+                    logger.error(f"[!] Dizi işleme hatası: {result}")
+                    continue
+                if series_url not in journal:
+                    journal.record(series_url, result)
+
+        def write(f):
+            f.write("#EXTM3U\n")
+            for series_url in all_series_links:
+                result = journal.get(series_url)
+                if result:
+                    title, logo_url, entries = result
+                    write_series_entries(f, title, logo_url, entries, referer)
+
+        atomic_write(output_filename, write)
+    except BaseException:
+        journal.close()
+        raise
+    journal.close(completed=True)
+    
+    logger.info(f"\n[✓] {output_filename} dosyası oluşturuldu.")
+
+def resolver_base_from_args(args):
+    """--resolve-on-play[=URL] bayrağından resolver_server adresi (yoksa None)"""
+    for arg in args:
+        if arg == "--resolve-on-play":
+            return DEFAULT_RESOLVER_BASE
+        if arg.startswith("--resolve-on-play="):
+            return arg.split("=", 1)[1]
+    return None
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # Bayraklar, kalıcı depolar ve raporlar dizifun_runner.main'de
+    from dizifun_runner import main
+    main(["dizifun", *sys.argv[1:]])
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+dizifun çoklu katalog çalıştırıcısı
+
+Eskiden her katalog (Netflix, Disney+, Exxen, diziler ...) aynı 735 satırlık
+betiğin ayrı bir kopyasıydı. Bu çalıştırıcı tüm katalogları tek süreçte,
+tek ClientSession ve ortak bir tarama kuyruğu (frontier) ile tarar:
+- birden fazla katalogda listelenen bir dizi yalnızca bir kez çözülür,
+- her katalog yine kendi .m3u dosyasına (kendi proxy biçimiyle) yazılır,
+- çalışma sonunda süre ve istek sayıları sıralı çalışmayla karşılaştırılır.
+
+Kullanım:
+  python dizifun_runner.py                  # DEFAULT_CATALOGS
+  python dizifun_runner.py netflix exxen    # yalnızca seçilen kataloglar
+  python dizifun_runner.py --sirali         # karşılaştırma için eski sıralı çalışma
+  python dizifun_runner.py --cache          # kalıcı HTTP önbelleğini (http_cache) kullan
+  python dizifun_runner.py --incremental    # yalnızca yeni / süresi dolan bölümleri çöz (stream_store),
+                                            # çözülemeyenleri üstel aralıkla dene (failure_ledger)
+                                            # ve yalnızca zamanı gelen dizi sayfalarını tara (recrawl_schedule)
+  python dizifun_runner.py --incremental --full-recrawl
+                                            # takvimi yok say, tüm dizi sayfalarını tara
+  python dizifun_runner.py --resume         # yarıda kesilen çalışmanın tamamlanan dizilerini atla
+  python dizifun_runner.py --inline-parse   # ayrıştırmayı işlem havuzu yerine loop içinde yap (gecikme karşılaştırması)
+  python dizifun_runner.py --resolve-on-play=http://127.0.0.1:8080
+                                            # akışları çözmeden listele, oynatmada resolver_server.py çözsün
+  python dizifun_runner.py --full-parse     # hızlı ayrıştırma yerine tam BeautifulSoup (extraction)
+  python dizifun_runner.py --shard 0/4      # dizilerin yalnızca 0. çeyreğini çöz, parça dosyası yaz (crawl_shard)
+  python dizifun_runner.py --merge-shards   # parça dosyalarından .m3u'ları tek süreçli çalışmayla aynı üret
+                                            # (--shard-dir=DİZİN ile parça dizini değiştirilebilir)
+  python dizifun_runner.py --time-budget=90m
+                                            # süre bitmeden dur; önce yeni diziler, ertelenenler önceki listeden korunur
+"""
+
+import asyncio
+import contextvars
+import logging
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import aiohttp
+
+import dizi
+import extraction
+from premiumvideo import DEFAULT_VALIDATION_PATH, M3U8Validator
+from failure_ledger import FailureLedger
+from crawl_shard import DEFAULT_SHARD_DIR, ShardError, artifact_path, load_artifacts, merge_artifacts, \
+    parse_shard, shard_of, write_artifact
+from http_cache import HttpCache
+from m3u_journal import DEFAULT_JOURNAL_DIR, SeriesJournal, atomic_write, read_playlist_groups, \
+    read_series_index, write_series_index
+from parse_pool import LoopLagMonitor
+from recrawl_schedule import RecrawlSchedule
+from stream_store import StreamStore
+from strategy_registry import DEFAULT_STRATEGY_PATH, StrategyRegistry
+from time_budget import TimeBudget, parse_duration
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent
+JOURNAL_PATH = DEFAULT_JOURNAL_DIR / "dizifun_runner.journal"
+LAZY_JOURNAL_PATH = DEFAULT_JOURNAL_DIR / "dizifun_runner.lazy.journal"
+# Dizi URL'si → yazılan başlık / girdi sayısı / son çözüm (m3u_journal.read_series_index)
+INDEX_PATH = DEFAULT_JOURNAL_DIR / "dizifun_runner.index.json"
+
+
+def _catalog(base_url, output, listing_url=None, referer=None, max_pages=100):
+    return {
+        "base_url": base_url,
+        "listing_url": listing_url or f"{base_url}/diziler",
+        "referer": referer,          # None → proxy URL'sinde referer yok
+        "output": output,            # BASE_DIR'e göre
+        "max_pages": max_pages,
+    }
+
+
+# ============================
+# KATALOG TABLOSU
+# ============================
+CATALOGS = {
+    "dizifun": _catalog("https://dizifun5.com/", "dizifun.m3u",
+                        listing_url="https://dizifun5.com/diziler", referer="https://dizifun5.com/"),
+    "dizifun4": _catalog("https://dizifun4.com/todtv", "dizifun.m3u"),
+    "diziler": _catalog("https://dizifun5.com/", "diziler.m3u",
+                        listing_url="https://dizifun5.com/diziler", max_pages=10000),
+    "amazon-prime": _catalog("https://dizifun5.com/primevideo", "m3u/Amazon Prime.m3u"),
+    "blutv": _catalog("https://dizifun5.com/blutv", "m3u/Blutv.m3u"),
+    "disney": _catalog("https://dizifun5.com/disney", "m3u/Disney+.m3u"),
+    "exxen": _catalog("https://dizifun5.com/exxen", "m3u/Exxen.m3u"),
+    "gain": _catalog("https://dizifun5.com/gain", "m3u/Gain.m3u"),
+    "hbo-max": _catalog("https://dizifun5.com/hbomax", "m3u/HBO Max.m3u"),
+    "hulu": _catalog("https://dizifun5.com/hulu", "m3u/Hulu.m3u"),
+    "netflix": _catalog("https://dizifun5.com/netflix", "m3u/Netflix.m3u"),
+    "paramount": _catalog("https://dizifun5.com/paramount", "m3u/Paramount+.m3u"),
+    "tod-tv": _catalog("https://dizifun5.com/todtv", "m3u/TOD TV.m3u"),
+    "tabii": _catalog("https://dizifun5.com/tabii-dizileri", "m3u/Tabii.m3u"),
+    "unutulmaz": _catalog("https://dizifun5.com/unutulmaz", "m3u/Unutulmaz Diziler.m3u"),
+}
+
+# Argümansız çalıştırmada taranan kataloglar (m3u/ altındaki listeler)
+DEFAULT_CATALOGS = (
+    "amazon-prime", "blutv", "disney", "exxen", "gain", "hbo-max",
+    "hulu", "netflix", "paramount", "tabii", "tod-tv", "unutulmaz",
+)
+
+# ============================
+# İSTEK SAYACI
+# ============================
+
+# O an hangi iş (katalog listesi ya da dizi) için istek atıldığını tutar;
+# gather ile açılan alt görevler bağlamı (context) otomatik devralır.
+_current_key = contextvars.ContextVar("dizifun_request_key", default=None)
+
+
+class RequestStats:
+    """Toplam ve iş (dizi/katalog listesi) bazında HTTP istek sayıları"""
+
+    def __init__(self):
+        self.total = 0
+        self.by_key = defaultdict(int)
+
+    def trace_config(self):
+        async def on_request_start(session, ctx, params):
+            self.total += 1
+            key = _current_key.get()
+            if key is not None:
+                self.by_key[key] += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        return trace_config
+
+
+def select_catalogs(names):
+    """İsim listesini (isim, katalog) çiftlerine çevirir; çakışan çıktıları reddeder"""
+    selected = []
+    outputs = {}
+    for name in names:
+        if name not in CATALOGS:
+            raise ValueError(f"Bilinmeyen katalog: {name} (geçerli: {', '.join(CATALOGS)})")
+        catalog = CATALOGS[name]
+        if catalog["output"] in outputs:
+            raise ValueError(f"{name} ve {outputs[catalog['output']]} aynı dosyaya yazıyor: {catalog['output']}")
+        outputs[catalog["output"]] = name
+        selected.append((name, catalog))
+    return selected
+
+
+async def crawl_listing(session, name, catalog):
+    """Bir kataloğun tüm liste sayfalarını tarar"""
+    token = _current_key.set(("liste", name))
+    try:
+        logger.info(f"[KATALOG] {name}: {catalog['listing_url']} taranıyor")
+        return await dizi.get_series_from_homepage(
+            session, catalog["listing_url"], catalog["base_url"], catalog["max_pages"]
+        )
+    finally:
+        _current_key.reset(token)
+
+
+async def resolve_series_tracked(session, series_url, scheduler):
+    """dizi.resolve_series'i (oynatmada çözüm modunda list_series), isteklerini bu diziye sayacak şekilde çalıştırır"""
+    _current_key.set(series_url)
+    if dizi.resolver_base:
+        return await dizi.list_series(session, series_url, scheduler)
+    return await dizi.resolve_series(session, series_url, scheduler)
+
+
+def write_catalog(catalog, series_links, resolved, previous=None, deferred=None):
+    """Ortak çözüm sonuçlarından bir kataloğun .m3u dosyasını yazar
+
+    previous (m3u_journal.read_playlist_groups) verilirse yalnızca bu
+    çalışmada süre sınırı yüzünden ertelenen ve listede hâlâ bulunan
+    dizilerin önceki girdileri kendi sırasında korunur. deferred, ertelenen
+    dizi URL'si → önceki .m3u'daki başlık eşlemesidir (dizi dizininden);
+    listeden düşen diziler taşınmaz.
+    """
+    output_path = BASE_DIR / catalog["output"]
+    deferred = deferred or {}
+
+    def write(f):
+        f.write("#EXTM3U\n")
+        written = set()
+        for series_url in series_links:
+            result = resolved.get(series_url)
+            if result:
+                title, logo_url, entries = result
+                dizi.write_series_entries(f, title, logo_url, entries, catalog["referer"])
+                written.add(title)
+            elif previous and series_url in deferred:
+                title = deferred[series_url]
+                if title in previous and title not in written:
+                    f.write("\n".join(previous[title]) + "\n")
+                    written.add(title)
+
+    atomic_write(output_path, write)
+    logger.info(f"[✓] {output_path} dosyası oluşturuldu.")
+
+
+def novelty_key(series_url, index=None):
+    """Süre sınırlı çalışmada sıra: yeni dizi, zamanı gelmiş, depodan, son çözülemeyen
+
+    recrawl_schedule'da kaydı olan dizide sık değişen önce gelir; yoksa dizi
+    dizinine (INDEX_PATH) göre hiç yazılmamış dizi yeni sayılır, kalanlarda en
+    uzun süredir çözülmeyen önce gelir.
+    """
+    schedule = dizi.recrawl_schedule
+    row = schedule.get(series_url) if schedule else None
+    if row is not None:
+        if dizi.stream_store and not dizi.stream_store.series_records(series_url):
+            return 3, row["interval"]
+        if time.time() >= row["next_check"]:
+            return 1, row["interval"]
+        return 2, row["interval"]
+    known = (index or {}).get(series_url)
+    if known is None:
+        return 0, 0.0
+    if not known["entries"]:
+        return 3, known["resolved_at"]
+    return 1, known["resolved_at"]
+
+
+_NOVELTY_NAMES = ("yeni", "zamanı gelmiş", "depodan", "son çözülemeyen")
+# Son sıralamadaki dizi URL'si → novelty_key (erteleme raporu için)
+_novelty = {}
+
+
+def _describe_deferred(series_url):
+    key = _novelty.get(series_url)
+    return f"{series_url} ({_NOVELTY_NAMES[key[0]]})" if key else series_url
+
+
+def _journal_path(shard):
+    path = LAZY_JOURNAL_PATH if dizi.resolver_base else JOURNAL_PATH
+    if shard is None:
+        return path
+    return path.with_name(f"{path.stem}.shard-{shard[0]}-of-{shard[1]}{path.suffix}")
+
+
+async def run_catalogs(names=DEFAULT_CATALOGS, resume=False, shard=None, shard_dir=DEFAULT_SHARD_DIR,
+                       budget=None):
+    """Seçilen katalogları tek oturum ve ortak frontier ile tarar
+
+    shard=(i, N) verilirse yalnızca bu parçaya düşen diziler çözülür ve
+    katalog dosyaları yerine shard_dir'e parça dosyası yazılır.
+    budget (time_budget.TimeBudget) verilirse diziler yenilik sırasıyla
+    çözülür, süre dolunca durulur ve ertelenenler önceki listeden korunur.
+    """
+    start_time = time.time()
+    catalogs = select_catalogs(names)
+    stats = RequestStats()
+    journal = SeriesJournal(_journal_path(shard), resume=resume)
+    try:
+        listings = await _run_frontier(catalogs, stats, journal, shard, budget)
+    except BaseException:
+        journal.close()
+        raise
+    journal.close(completed=True)
+
+    # Sıralı çalışmada her katalog kendi dizilerini yeniden çözerdi
+    sequential_requests = 0
+    for (name, _), series_links in zip(catalogs, listings):
+        sequential_requests += stats.by_key[("liste", name)]
+        sequential_requests += sum(stats.by_key[url] for url in series_links)
+
+    if shard is not None:
+        write_artifact(artifact_path(shard_dir, *shard), *shard, names, listings,
+                       journal.done, dizi.resolver_base)
+
+    elapsed = time.time() - start_time
+    saved = sequential_requests - stats.total
+    logger.info(
+        f"\n[✓] {len(catalogs)} katalog tamamlandı. Süre: {elapsed:.2f} saniye, "
+        f"istek: {stats.total} (sıralı çalışma tahmini: {sequential_requests}, "
+        f"tasarruf: {saved})"
+    )
+    return stats
+
+
+async def _run_frontier(catalogs, stats, journal, shard=None, budget=None):
+    """Listeleri tarar, frontier'ı çözer (tamamlananlar günlüğe) ve katalog dosyalarını yazar
+
+    shard=(i, N) ise frontier'dan yalnızca bu parçanın dizileri çözülür, dosya yazılmaz.
+    """
+    async def resolve(session, series_url, scheduler):
+        if series_url in journal:
+            return journal.get(series_url)
+        return await resolve_series_tracked(session, series_url, scheduler)
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=dizi.CONNECTION_LIMIT),
+                                     trace_configs=[stats.trace_config()]) as session:
+        listings = await asyncio.gather(
+            *(crawl_listing(session, name, catalog) for name, catalog in catalogs)
+        )
+
+        # Ortak frontier: her dizi ilk görüldüğü sırayla bir kez çözülür
+        frontier = []
+        seen = set()
+        for series_links in listings:
+            for series_url in series_links:
+                if series_url not in seen:
+                    seen.add(series_url)
+                    frontier.append(series_url)
+        logger.info(f"[FRONTIER] {sum(len(l) for l in listings)} katalog girdisi → {len(frontier)} benzersiz dizi")
+        if shard is not None:
+            index, count = shard
+            frontier = [url for url in frontier if shard_of(url, count) == index]
+            logger.info(f"[SHARD] {index}/{count}: {len(frontier)} dizi bu parçada")
+        finished = set()
+        index = read_series_index(INDEX_PATH) if shard is None else {}
+
+        async def resolve_frontier(links):
+            async with dizi.EpisodeScheduler(session) as scheduler:
+                async for series_url, result in dizi.iter_resolved_series(
+                        session, links, scheduler, resolve=resolve):
+                    finished.add(series_url)
+                    if isinstance(result, Exception):
+                        logger.error(f"[!] Dizi işleme hatası: {result}")
+                        continue
+                    if series_url not in journal:
+                        journal.record(series_url, result)
+
+        if budget is None:
+            await resolve_frontier(frontier)
+        else:
+            _novelty.update((url, novelty_key(url, index)) for url in frontier)
+            frontier.sort(key=_novelty.__getitem__)
+            try:
+                await asyncio.wait_for(resolve_frontier(budget.admit(frontier)), budget.remaining())
+            except asyncio.TimeoutError:
+                logger.warning("[BUDGET] Sert sınır: süren diziler iptal edildi")
+            budget.deferred = [url for url in frontier if url not in finished]
+
+    if shard is not None:
+        return listings
+    for (name, catalog), series_links in zip(catalogs, listings):
+        if not series_links:
+            logger.error(f"[!] {name}: dizi listesi boş, seçicileri kontrol et.")
+            continue
+        previous = deferred = None
+        if budget is not None and budget.deferred:
+            previous = read_playlist_groups(BASE_DIR / catalog["output"])
+            deferred = {url: index[url]["title"] for url in budget.deferred if url in index}
+        write_catalog(catalog, series_links, journal.done, previous, deferred)
+    write_series_index(INDEX_PATH, _updated_index(index, finished, journal.done))
+    return listings
+
+
+def _updated_index(index, finished, resolved):
+    """Bu çalışmada biten dizilerin dizin kaydını yeniler; ertelenenlerin eski kaydı kalır"""
+    now = time.time()
+    index = dict(index)
+    for series_url in finished:
+        result = resolved.get(series_url)
+        if result:
+            title, _, entries = result
+            index[series_url] = {"title": title, "entries": len(entries), "resolved_at": now}
+        elif series_url in index:
+            # Çözülemedi: önceki .m3u'daki başlık korunur, girdi sayısı sıfırlanır
+            index[series_url] = {**index[series_url], "entries": 0, "resolved_at": now}
+    return index
+
+
+async def run_catalogs_sequential(names=DEFAULT_CATALOGS, resume=False):
+    """Karşılaştırma için eski davranış: her katalog kendi oturumunda, paylaşım yok"""
+    start_time = time.time()
+    catalogs = select_catalogs(names)
+    stats = RequestStats()
+
+    for name, catalog in catalogs:
+        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=dizi.CONNECTION_LIMIT),
+                                         trace_configs=[stats.trace_config()]) as session:
+            series_links = await crawl_listing(session, name, catalog)
+            if not series_links:
+                logger.error(f"[!] {name}: dizi listesi boş, seçicileri kontrol et.")
+                continue
+            await dizi.process_series(series_links, str(BASE_DIR / catalog["output"]),
+                                      session=session, referer=catalog["referer"], resume=resume)
+
+    elapsed = time.time() - start_time
+    logger.info(f"\n[✓] Sıralı çalışma tamamlandı. Süre: {elapsed:.2f} saniye, istek: {stats.total}")
+    return stats
+
+
+def merge_shards(shard_dir=DEFAULT_SHARD_DIR):
+    """Parça dosyalarından katalog .m3u'larını tek süreçli çalışmanın sırasıyla yazar"""
+    names, listings, resolved, resolver_base = merge_artifacts(load_artifacts(shard_dir))
+    dizi.resolver_base = resolver_base
+    for (name, catalog), series_links in zip(select_catalogs(names), listings):
+        if not series_links:
+            logger.error(f"[!] {name}: dizi listesi boş, seçicileri kontrol et.")
+            continue
+        write_catalog(catalog, series_links, resolved)
+
+
+def _option(args, name, default=None):
+    """--ad DEĞER ya da --ad=DEĞER biçimindeki seçeneği okur"""
+    for i, arg in enumerate(args):
+        if arg == name and i + 1 < len(args):
+            return args[i + 1]
+        if arg.startswith(name + "="):
+            return arg.split("=", 1)[1]
+    return default
+
+
+async def _monitored(coro, lag_monitor):
+    """coro çalışırken event loop gecikmesini örnekler"""
+    lag_monitor.start()
+    try:
+        return await coro
+    finally:
+        await lag_monitor.stop()
+
+
+def main(argv=None):
+    """Komut satırı girişi; katalog sarmalayıcıları (diziler.py, m3u/*.py) argv'yi kendileri verir"""
+    args = sys.argv[1:] if argv is None else list(argv)
+    sequential = "--sirali" in args
+    shard_spec = _option(args, "--shard")
+    shard_dir = _option(args, "--shard-dir", DEFAULT_SHARD_DIR)
+    budget_spec = _option(args, "--time-budget")
+    option_values = {shard_spec, str(shard_dir), budget_spec}
+    names = [a for a in args if not a.startswith("--") and a not in option_values] or DEFAULT_CATALOGS
+    if "--merge-shards" in args:
+        try:
+            merge_shards(shard_dir)
+        except ShardError as e:
+            logger.error(f"[!] {e}")
+            sys.exit(1)
+        return
+    try:
+        shard = parse_shard(shard_spec) if shard_spec else None
+        budget = TimeBudget(parse_duration(budget_spec)) if budget_spec else None
+    except ValueError as e:
+        logger.error(f"[!] {e}")
+        sys.exit(2)
+    if "--full-parse" in args:
+        extraction.EXTRACTION_MODE = "full"
+    if "--cache" in args:
+        dizi.response_cache = HttpCache()
+        dizi.m3u8_validator = M3U8Validator(DEFAULT_VALIDATION_PATH, limits=dizi.host_limits)
+        dizi.strategy_registry = StrategyRegistry(DEFAULT_STRATEGY_PATH)
+    if "--incremental" in args:
+        dizi.stream_store = StreamStore()
+        dizi.failure_ledger = FailureLedger()
+        if "--full-recrawl" not in args:
+            dizi.recrawl_schedule = RecrawlSchedule()
+    dizi.time_budget = budget
+    resume = "--resume" in args
+    dizi.resolver_base = dizi.resolver_base_from_args(args)
+    inline_parse = "--inline-parse" in args
+    if not inline_parse:
+        dizi.parse_pool.start()
+    lag_monitor = LoopLagMonitor()
+    try:
+        if sequential:
+            asyncio.run(_monitored(run_catalogs_sequential(names, resume), lag_monitor))
+        else:
+            asyncio.run(_monitored(run_catalogs(names, resume, shard, shard_dir, budget), lag_monitor))
+    finally:
+        dizi.parse_pool.close()
+        _teardown(lag_monitor, inline_parse, budget)
+
+
+def _teardown(lag_monitor, inline_parse, budget):
+    """Raporlar ve kalıcı depoların kapatılması; çalışma hata verse de yapılır"""
+    lag_monitor.report("inline ayrıştırma, " if inline_parse else "havuzlu ayrıştırma, ")
+    if budget is not None:
+        budget.report(_describe_deferred)
+    dizi.domain_resolver.report()
+    dizi.m3u8_validator.report()
+    dizi.m3u8_validator.close()
+    dizi.strategy_registry.report()
+    dizi.strategy_registry.close()
+    dizi.page_flight.report()
+    dizi.speculation.report()
+    dizi.host_limits.report()
+    extraction.report()
+    if dizi.response_cache:
+        dizi.response_cache.report()
+        dizi.response_cache.close()
+    if dizi.stream_store:
+        dizi.stream_store.report()
+    if dizi.failure_ledger:
+        dizi.failure_ledger.report()
+        dizi.failure_ledger.close()
+    if dizi.recrawl_schedule:
+        dizi.recrawl_schedule.report()
+        dizi.recrawl_schedule.close()
+
+
+if __name__ == "__main__":
+    main()
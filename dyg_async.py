@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+DYG ağındaki kanallar (DMAX, TLC, Star TV) için asenkron tarama motoru
+
+Sıralı tarayıcı (dyg_sequential, eskiden DMAX/dmax.py ve TLC/tlc.py)
+programlar → sezonlar → bölüm sayfaları → bölüm başına bir GET
+(data-video-code) zincirini tek tek, her istekten önce hız sınırlayıcıda
+bekleyerek yürütür. Bu motor aynı zinciri aiohttp ile
+eşzamanlı yürütür:
+- programlar PROGRAM_WORKERS kadar paralel işlenir,
+- bir programın sezonları ve bölüm sayfaları aynı anda istenir,
+- liste sayfaları (keşfet, sezon sayfaları) küçük pencerelerle önden
+  istenir; "art arda 2 boş sayfa" kuralı sırayla uygulandığından sonuç
+  sıralı taramayla aynıdır,
+- tüm istekler ortak DygClient'tan geçer: RATE_LIMITER kovası (rate_limit,
+  istek/sn), host başına AIMD penceresi (adaptive_limit, eşzamanlılık) ve
+  tek bağlantı havuzu; birden çok kanal aynı oturumu paylaşır,
+- 429 / 5xx ve bağlantı hatalarında requests tarafındaki Retry ayarlarıyla
+  (MAX_RETRIES, BACKOFF_FACTOR) yeniden denenir; Retry-After süresince
+  kova o host'a jeton vermez,
+- ReferenceId'si depoda (reference_store) olan bölümlerin sayfası istenmez,
+- resolver verilirse (dyg_resolver) api/redirect adayları izlenip çalışan
+  PublisherId öne alınır (çözülen HLS URL'si yalnızca önbellektir),
+- budget verilirse (time_budget.TimeBudget) yumuşak sınırdan sonra yeni
+  program başlatılmaz, sert sınırda süren programlar iptal edilir; bunlar
+  {"deferred": True} olarak sırasında döner ve yazıcı önceki M3U girdilerini korur.
+
+Kanal yapılandırması ve ayrıştırıcılar dyg_channels'tadır; sıralı yol da
+aynı ayrıştırıcıları kullandığından çıktı aynıdır.
+
+Kullanım:
+    async with DygClient(rate_limiter) as client:
+        data = await engine_for(CHANNELS["dmax"], client).run(start, end)
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urljoin
+
+import aiohttp
+from bs4 import BeautifulSoup
+from tqdm import tqdm
+
+import dyg_channels
+from adaptive_limit import HostLimits
+from dyg_channels import DygChannel
+
+log = logging.getLogger(__name__)
+
+# Kanal başına aynı anda işlenen program sayısı; host başına gerçek eşzamanlılığı AIMD penceresi belirler
+PROGRAM_WORKERS = 8
+CONNECTION_LIMIT = 32
+# Keşfet ve sezon sayfalarında önden istenen sayfa sayısı
+PROGRAM_PAGE_WINDOW = 4
+EPISODE_PAGE_WINDOW = 2
+# Sıralı tarayıcılarla aynı varsayılanlar
+REQUEST_TIMEOUT = 15
+BACKOFF_FACTOR = 0.6
+MAX_RETRIES = 5
+# urllib3 Retry ile aynı: en uzun bekleme ve yeniden denenen durumlar
+BACKOFF_MAX = 120.0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# "ajax" kanallarının (DMAX, TLC) AJAX POST'ları için; "api" kanallarına gönderilmez
+AJAX_HEADERS = {
+    "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+    "X-Requested-With": "XMLHttpRequest",
+}
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/124.0 Safari/537.36"
+    ),
+}
+
+
+class DygClient:
+    """Kanallar arasında paylaşılan HTTP katmanı (oturum, hız sınırı, AIMD, önbellek)"""
+
+    def __init__(self, rate_limiter, host_limits: Optional[HostLimits] = None, http_cache=None,
+                 timeout: float = REQUEST_TIMEOUT, max_retries: int = MAX_RETRIES,
+                 backoff_factor: float = BACKOFF_FACTOR):
+        self.rate_limiter = rate_limiter
+        self.host_limits = host_limits or HostLimits()
+        self.http_cache = http_cache
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "DygClient":
+        connector = aiohttp.TCPConnector(limit=CONNECTION_LIMIT)
+        self.session = aiohttp.ClientSession(headers=DEFAULT_HEADERS, connector=connector)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.session.close()
+
+    def _backoff(self, attempt: int) -> float:
+        """urllib3 Retry.get_backoff_time: ilk yeniden deneme beklemesiz, sonra üstel
+        (Retry-After varsa bekleme ayrıca rate_limiter'da yapılır)"""
+        if attempt <= 1:
+            return 0.0
+        return min(BACKOFF_MAX, self.backoff_factor * (2 ** (attempt - 1)))
+
+    async def request(self, method: str, url: str, data: Optional[Dict[str, Any]] = None,
+                      headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes, Any]:
+        """(durum, gövde, başlıklar); yeniden denemeler tükenirse son yanıt ya da istisna"""
+        status, body, response_headers, _ = await self.fetch(method, url, data, headers)
+        return status, body, response_headers
+
+    async def fetch(self, method: str, url: str, data: Optional[Dict[str, Any]] = None,
+                    headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes, Any, str]:
+        """request() ile aynı; yönlendirmelerden sonraki son URL de döner"""
+        attempt = 0
+        while True:
+            attempt += 1
+            await self.rate_limiter.wait_async(url)
+            try:
+                async with self.host_limits.slot(url) as slot:
+                    timeout = aiohttp.ClientTimeout(total=slot.timeout(self.timeout))
+                    async with self.session.request(method, url, data=data, headers=headers,
+                                                    timeout=timeout) as r:
+                        slot.observe(r.status)
+                        self.rate_limiter.observe(url, r.status, r.headers)
+                        body = await r.read()
+                        if r.status not in RETRY_STATUSES or attempt > self.max_retries:
+                            return r.status, body, r.headers, str(r.url)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt > self.max_retries:
+                    raise
+            await asyncio.sleep(self._backoff(attempt))
+
+    async def get_content(self, url: str, headers: Optional[Dict[str, str]] = None) -> bytes:
+        """cached_get'in async karşılığı (http_cache varsa koşullu istek)"""
+        cache = self.http_cache
+        entry = cache.lookup(url) if cache else None
+        if entry is not None and entry.fresh:
+            return entry.body
+        if entry is not None:
+            headers = {**(headers or {}), **entry.conditional_headers()}
+        status, body, response_headers = await self.request("GET", url, headers=headers)
+        if status == 304 and entry is not None:
+            cache.record_not_modified(url, entry)
+            return entry.body
+        if status >= 400:
+            raise aiohttp.ClientError(f"HTTP {status}")
+        if cache:
+            cache.store(url, body, response_headers)
+        return body
+
+    async def get_soup_from_post(self, url: str, data: Dict[str, Any],
+                                 headers: Optional[Dict[str, str]] = None) -> Optional[BeautifulSoup]:
+        try:
+            # requests form alanlarını str() ile kodlar; aynı gövde gönderilir
+            form = {key: str(value) for key, value in data.items()}
+            status, body, _ = await self.request("POST", url, data=form, headers=headers)
+            if status >= 400:
+                raise aiohttp.ClientError(f"HTTP {status}")
+            return BeautifulSoup(body, "html.parser")
+        except Exception as e:
+            log.warning("POST %s hatası: %s", url, e)
+            return None
+
+    async def get_soup_from_get(self, url: str,
+                                headers: Optional[Dict[str, str]] = None) -> Optional[BeautifulSoup]:
+        try:
+            return BeautifulSoup(await self.get_content(url, headers), "html.parser")
+        except Exception as e:
+            log.warning("GET %s hatası: %s", url, e)
+            return None
+
+    def report(self) -> None:
+        self.host_limits.report()
+
+
+def channel_headers(channel: DygChannel) -> Dict[str, str]:
+    """Kanalın isteklerine DEFAULT_HEADERS üzerine eklenen başlıklar"""
+    headers = {"Referer": channel.base_url}
+    if channel.listing == "ajax":
+        headers.update(AJAX_HEADERS)
+    return headers
+
+
+class DygAsyncEngine:
+    """Tek kanalın taraması ("ajax" listesi: DMAX, TLC)"""
+
+    def __init__(self, channel: DygChannel, client: DygClient, reference_store=None,
+                 program_workers: int = PROGRAM_WORKERS, resolver=None, budget=None):
+        self.channel = channel
+        self.client = client
+        self.reference_store = reference_store
+        self.resolver = resolver
+        self.budget = budget
+        self.program_workers = program_workers
+        # Ortak oturumda her kanal kendi Referer'ını gönderir
+        self.headers = channel_headers(channel)
+
+    async def get_soup_from_post(self, url: str, data: Dict[str, Any]) -> Optional[BeautifulSoup]:
+        return await self.client.get_soup_from_post(url, data, self.headers)
+
+    async def get_soup_from_get(self, url: str) -> Optional[BeautifulSoup]:
+        return await self.client.get_soup_from_get(url, self.headers)
+
+    # ---------- sayfalı listeler ----------
+
+    async def _paged(self, fetch_page, window: int, on_empty=None) -> List[Dict[str, str]]:
+        """Sayfaları window'luk gruplarla ister; art arda 2 boş sayfada (sırayla) durur"""
+        items: List[Dict[str, str]] = []
+        empty_count = 0
+        page = 0
+        while True:
+            pages = await asyncio.gather(*(fetch_page(p) for p in range(page, page + window)))
+            for offset, page_items in enumerate(pages):
+                if not page_items:
+                    empty_count += 1
+                    if on_empty:
+                        on_empty(page + offset, empty_count)
+                    if empty_count >= 2:
+                        return items
+                else:
+                    empty_count = 0
+                    items.extend(page_items)
+            page += window
+
+    async def get_all_programs(self) -> List[Dict[str, str]]:
+        async def fetch_page(page):
+            data = {"type": "discover", "slug": "a-z", "page": page}
+            soup = await self.get_soup_from_post(self.channel.ajax_url, data)
+            return dyg_channels.parse_program_page(soup, self.channel.base_url) if soup else []
+
+        def on_empty(page, empty_seen):
+            log.info("[%s] Boş/hatali sayfa: %d (ardışık=%d)", self.channel.name, page, empty_seen)
+            if empty_seen >= 2:
+                log.info("[%s] Toplam sayfa: %d", self.channel.name, page)
+
+        return await self._paged(fetch_page, PROGRAM_PAGE_WINDOW, on_empty)
+
+    async def get_program_id(self, url: str) -> Tuple[str, List[str]]:
+        soup = await self.get_soup_from_get(url)
+        if not soup:
+            return "0", []
+        return dyg_channels.parse_program_info(soup)
+
+    async def get_episodes_by_program_id(self, program_id: str, season_list: List[str],
+                                         serie_name: str) -> List[Dict[str, str]]:
+        async def season_episodes(season):
+            async def fetch_page(page):
+                data = {"type": "episodes", "program_id": program_id, "page": page, "season": season}
+                soup = await self.get_soup_from_post(self.channel.ajax_url, data)
+                return dyg_channels.parse_episode_items(soup, serie_name) if soup else []
+
+            return await self._paged(fetch_page, EPISODE_PAGE_WINDOW)
+
+        seasons = await asyncio.gather(*(season_episodes(season) for season in season_list))
+        return [ep for season_eps in seasons for ep in season_eps]
+
+    async def get_stream_urls(self, episode_url: str) -> List[str]:
+        store, name = self.reference_store, self.channel.name
+        stored = store.lookup(name, episode_url) if store else None
+        if stored is not None:
+            return self.channel.stream_urls(*stored)
+        soup = await self.get_soup_from_get(episode_url)
+        if not soup:
+            return []
+        reference_id = dyg_channels.parse_reference_id(soup)
+        if not reference_id:
+            return []
+        if store:
+            store.remember(name, episode_url, reference_id)
+        return self.channel.stream_urls(reference_id)
+
+    # ---------- program ----------
+
+    async def program_episodes(self, program: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Akış adayları bulunan bölümler (sıralı run() ile aynı alanlar)"""
+        program_id, season_list = await self.get_program_id(program["url"])
+        if program_id == "0":
+            log.warning("[%s] Program ID alınamadı: %s", self.channel.name, program.get("name"))
+            return []
+
+        episodes = await self.get_episodes_by_program_id(program_id, season_list, program["name"])
+        if not episodes:
+            return []
+
+        candidates = await asyncio.gather(*(self.get_stream_urls(ep["url"]) for ep in episodes))
+        resolved = []
+        for ep, stream_candidates in zip(episodes, candidates):
+            if stream_candidates:
+                temp_episode = dict(ep)
+                temp_episode["stream_url"] = stream_candidates[0]
+                temp_episode["stream_url_candidates"] = stream_candidates
+                resolved.append(temp_episode)
+        return resolved
+
+    async def _program(self, index: int, program: Dict[str, str],
+                       workers: asyncio.Semaphore, progress) -> Optional[Dict[str, Any]]:
+        async with workers:
+            if self.budget is not None and self.budget.expired():
+                progress.update(1)
+                return self._defer(program)
+            try:
+                log.info("[%s] %d | %s", self.channel.name, index, program.get("name", ""))
+                episodes = await self.program_episodes(program)
+                if not episodes:
+                    return None
+                if self.resolver:
+                    await self.resolver.resolve_program(self.channel, program, episodes, self.headers)
+                temp_program = dict(program)
+                temp_program["episodes"] = episodes
+                return temp_program
+            except Exception as e:
+                # Tek programın hatası kanalın taranmasını durdurmaz
+                log.error("[%s] Program hatası (%s): %s", self.channel.name, program.get("name", ""), e)
+                return None
+            finally:
+                progress.update(1)
+
+    def _defer(self, program: Dict[str, str]) -> Dict[str, Any]:
+        self.budget.deferred.append((self.channel.name, program.get("name", "")))
+        return {**program, "deferred": True}
+
+    async def _wait_programs(self, tasks: List["asyncio.Future"],
+                             programs: List[Dict[str, str]]) -> List[Optional[Dict[str, Any]]]:
+        """Program görevlerini bekler; bütçenin sert sınırında bitmeyenler iptal edilip ertelenir"""
+        if self.budget is None or not tasks:
+            return await asyncio.gather(*tasks)
+        done, pending = await asyncio.wait(tasks, timeout=self.budget.remaining())
+        if pending:
+            log.warning("[%s] Sert sınır: %d program iptal edildi", self.channel.name, len(pending))
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        return [task.result() if task in done else self._defer(program)
+                for task, program in zip(tasks, programs)]
+
+    async def run(self, start: int = 0, end: int = 0) -> Dict[str, Any]:
+        """Sıralı run() ile aynı sözleşme: {"programs": [...]} (program sırası korunur)
+
+        Süre bütçesiyle ertelenen programlar listede {"deferred": True} ve
+        bölümsüz olarak yer alır.
+        """
+        started = time.monotonic()
+        programs_list = await self.get_all_programs()
+        if not programs_list:
+            log.warning("[%s] Hiç program bulunamadı.", self.channel.name)
+            return {"programs": []}
+
+        end_index = len(programs_list) if end == 0 else min(end, len(programs_list))
+        start_index = max(0, start)
+        workers = asyncio.Semaphore(self.program_workers)
+        selected = programs_list[start_index:end_index]
+        with tqdm(total=len(selected), desc=self.channel.m3u_name) as progress:
+            tasks = [asyncio.ensure_future(self._program(start_index + i, program, workers, progress))
+                     for i, program in enumerate(selected)]
+            results = await self._wait_programs(tasks, selected)
+
+        log.info("[%s] Asenkron tarama tamamlandı: %.1f sn", self.channel.name, time.monotonic() - started)
+        return {"programs": [program for program in results if program]}
+
+
+class DygApiEngine(DygAsyncEngine):
+    """"api" listesi (Star TV): bölümler ReferenceId'leriyle birlikte JSON API'den gelir"""
+
+    async def get_all_programs(self) -> List[Dict[str, str]]:
+        soup = await self.get_soup_from_get(self.channel.series_url)
+        return dyg_channels.parse_series_cards(soup, self.channel.base_url) if soup else []
+
+    async def get_api_url(self, program_url: str) -> str:
+        try:
+            body = await self.client.get_content(program_url + "/bolumler", self.headers)
+        except Exception as e:
+            log.warning("GET %s hatası: %s", program_url, e)
+            return ""
+        api_path = dyg_channels.parse_api_path(body.decode("utf-8", "replace"))
+        return urljoin(self.channel.base_url, api_path) if api_path else ""
+
+    async def program_episodes(self, program: Dict[str, str]) -> List[Dict[str, Any]]:
+        api_url = await self.get_api_url(program["url"])
+        if not api_url:
+            log.warning("[%s] API adresi alınamadı: %s", self.channel.name, program.get("name"))
+            return []
+
+        page_size = dyg_channels.STAR_API_PAGE_SIZE
+        episodes: List[Dict[str, Any]] = []
+        skip = 0
+        while True:
+            params = {"sort": "episodeNo asc", "limit": page_size, "skip": skip}
+            try:
+                page_url = api_url + ("&" if "?" in api_url else "?") + urlencode(params)
+                data = json.loads(await self.client.get_content(page_url, self.headers))
+            except Exception as e:
+                log.warning("[%s] API hatası (%s): %s", self.channel.name, program.get("name"), e)
+                break
+            for ep in dyg_channels.parse_api_items(data, self.channel.img_base):
+                stream_candidates = self.channel.stream_urls(ep.pop("reference_id"))
+                ep["stream_url"] = stream_candidates[0]
+                ep["stream_url_candidates"] = stream_candidates
+                episodes.append(ep)
+            if len(data.get("items", [])) < page_size:
+                break
+            skip += page_size
+        return episodes
+
+
+def engine_for(channel: DygChannel, client: DygClient, reference_store=None,
+               program_workers: int = PROGRAM_WORKERS, resolver=None, budget=None) -> DygAsyncEngine:
+    """Kanalın liste biçimine uygun motor"""
+    engine_class = DygApiEngine if channel.listing == "api" else DygAsyncEngine
+    return engine_class(channel, client, reference_store, program_workers, resolver, budget)
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+DYG ağındaki kanalların yapılandırması ve ortak ayrıştırıcıları
+
+DMAX, TLC ve Star TV bölümleri aynı dygvideo api/redirect uç noktasından
+yayınlanır; kanallar yalnızca site adresi, AJAX uç noktası, PublisherId
+listesi, ReferenceId öneki ve liste biçimiyle ayrılır. Yeni bir DYG kanalı
+eklemek için CHANNELS'a bir DygChannel girmek yeterlidir.
+
+Liste biçimleri:
+- "ajax": keşfet A-Z (ajax/more) → program sayfası → sezon sayfaları →
+  bölüm sayfası (data-video-code) — DMAX, TLC
+- "api":  dizi sayfası (poster-card) → /bolumler içindeki apiUrl →
+  sayfalı JSON (referenceId bölüm listesiyle gelir) — Star TV
+"""
+
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+BASE_DIR = Path(__file__).resolve().parent
+
+STREAM_BASE = "https://dygvideo.dygdigital.com/api/redirect"
+SECRET_KEY = "NtvApiSecret2014*"   # site yapısı değişirse çalışmayabilir
+
+# Star TV /bolumler sayfasındaki gömülü JSON içinde API yolu
+STAR_API_PATTERN = re.compile(r'"apiUrl\\":\\"(.*?)\\"')
+STAR_API_PAGE_SIZE = 100
+
+
+class DygChannel:
+    """Tek DYG kanalının yapılandırması"""
+
+    def __init__(self, name: str, base_url: str, publisher_ids: Tuple[int, ...],
+                 m3u_name: str, output_dir: Path, reference_prefix: str = "",
+                 listing: str = "ajax", ajax_path: str = "ajax/more",
+                 series_path: str = "", img_base: str = "", url_suffix: str = ""):
+        self.name = name                          # reference_store / log anahtarı
+        self.base_url = base_url
+        self.publisher_ids = tuple(publisher_ids)
+        self.m3u_name = m3u_name                  # <output_dir>/<m3u_name>.m3u
+        self.output_dir = Path(output_dir)
+        self.reference_prefix = reference_prefix
+        self.listing = listing
+        self.ajax_url = urljoin(base_url, ajax_path)
+        self.series_url = urljoin(base_url, series_path)
+        self.img_base = img_base
+        self.url_suffix = url_suffix                # akış URL'sinin sonuna eklenir (Star: "&.m3u8")
+
+    def preferred_publisher_ids(self, publisher_id: Optional[int] = None) -> List[int]:
+        """publisher_ids; çalıştığı bilinen PublisherId varsa önde"""
+        if publisher_id is None:
+            return list(self.publisher_ids)
+        return [publisher_id] + [pid for pid in self.publisher_ids if pid != publisher_id]
+
+    def stream_urls(self, reference_id: str, publisher_id: Optional[int] = None) -> List[str]:
+        """Aday api/redirect URL'leri (uç nokta yönlendirir; url_suffix kanal çıktısıyla uyum için)"""
+        return [
+            f"{STREAM_BASE}?PublisherId={pid}&ReferenceId={self.reference_prefix}{reference_id}"
+            f"&SecretKey={SECRET_KEY}{self.url_suffix}"
+            for pid in self.preferred_publisher_ids(publisher_id)
+        ]
+
+    def __repr__(self) -> str:
+        return f"DygChannel({self.name!r})"
+
+
+CHANNELS: Dict[str, DygChannel] = {
+    "dmax": DygChannel(
+        "dmax", "https://www.dmax.com.tr/", (27, 20),        # DMAX genelde 27; alternatif 20
+        m3u_name="DMAX", output_dir=BASE_DIR / "DMAX",
+    ),
+    "tlc": DygChannel(
+        "tlc", "https://www.tlctv.com.tr/", (20, 27),        # önce 20, sonra 27
+        m3u_name="TLC", output_dir=BASE_DIR / "TLC",
+    ),
+    "star": DygChannel(
+        "star", "https://www.startv.com.tr/", (1,),
+        m3u_name="STAR", output_dir=BASE_DIR / "STAR", reference_prefix="StarTV_",
+        listing="api", series_path="dizi", img_base="https://media.startv.com.tr/star-tv",
+        url_suffix="&.m3u8",                                 # akış URL'leri denen/star.py ile aynı
+    ),
+}
+
+
+def safe_soup_get(attr_getter, default=None):
+    try:
+        return attr_getter()
+    except Exception:
+        return default
+
+# ============================
+# "ajax" kanalları (DMAX, TLC)
+# ============================
+
+def extract_img_url(img_tag) -> str:
+    """Poster <img> tag'inden en iyi görsel URL'sini seç (data-src > srcset > src)."""
+    if not img_tag:
+        return ""
+    data_src = img_tag.get("data-src") or img_tag.get("data-original") or img_tag.get("data-lazy-src")
+    if data_src:
+        return data_src.strip()
+    srcset = img_tag.get("srcset")
+    if srcset:
+        parts = [p.strip().split(" ")[0] for p in srcset.split(",") if p.strip()]
+        if parts:
+            return parts[-1]
+    return (img_tag.get("src") or "").strip()
+
+def parse_program_page(soup, base_url: str) -> List[Dict[str, str]]:
+    """Keşfet / A-Z sayfasındaki posterlerden programlar (ad, sayfa URL'si, poster)"""
+    all_programs: List[Dict[str, str]] = []
+    programs = soup.find_all("div", {"class": "poster"})
+    for program in programs:
+        a = program.find("a")
+        img_tag = program.find("img")
+
+        # Mutlak URL'lere dönüştür
+        program_url_rel = a.get("href") if a else ""
+        program_url = urljoin(base_url, program_url_rel)
+
+        # Poster: keşfet/a-z'deki poster (lazy-load destekli)
+        poster_rel = extract_img_url(img_tag)
+        program_img = urljoin(base_url, poster_rel)
+
+        # Ad: onclick > alt > text
+        onclick_name = a.get("onclick") if a else None
+        if onclick_name and "GAEventTracker" in onclick_name:
+            program_name = (
+                onclick_name.replace("GAEventTracker('DISCOVER_PAGE_EVENTS', 'POSTER_CLICKED', '", "")
+                            .replace("');", "")
+                            .strip()
+            )
+        else:
+            program_name = (
+                (img_tag.get("alt").strip() if img_tag and img_tag.get("alt") else None)
+                or (a.get_text(strip=True) if a else None)
+                or "İsimsiz Program"
+            )
+
+        all_programs.append({"img": program_img, "url": program_url, "name": program_name})
+    return all_programs
+
+def parse_program_info(soup) -> Tuple[str, List[str]]:
+    """Program sayfasından program ID'si ve sezon listesi"""
+    season_list: List[str] = []
+    dyn_link = soup.find("a", {"class": "dyn-link"})
+    program_id = safe_soup_get(lambda: dyn_link.get("data-program-id"), "0")
+    season_selector = soup.find("select", {"class": "custom-dropdown"})
+    if season_selector:
+        for opt in season_selector.find_all("option"):
+            val = safe_soup_get(lambda: opt.get("value"), None)
+            if val and val not in season_list:
+                season_list.append(val)
+    return program_id, season_list
+
+def parse_episode_items(soup, serie_name: str) -> List[Dict[str, str]]:
+    """Sezon sayfasındaki bölüm kartları"""
+    all_episodes: List[Dict[str, str]] = []
+    items = soup.find_all("div", {"class": "item"})
+    for it in items:
+        strong = it.find("strong")
+        img_tag = it.find("img")
+        a = it.find("a")
+        ep_title = safe_soup_get(lambda: strong.get_text().strip(), "Bölüm")
+        name = f"{serie_name} - {ep_title}"
+        img = safe_soup_get(lambda: img_tag.get("src"), "")
+        url = safe_soup_get(lambda: a.get("href"), "")
+        if url:
+            all_episodes.append({"name": name, "img": img, "url": url})
+    return all_episodes
+
+def parse_reference_id(soup) -> Optional[str]:
+    """Bölüm sayfasındaki oynatıcının data-video-code değeri"""
+    player_div = soup.find("div", {"class": "video-player"})
+    return safe_soup_get(lambda: player_div.get("data-video-code"), None)
+
+# ============================
+# "api" kanalları (Star TV)
+# ============================
+
+def parse_series_cards(soup, base_url: str) -> List[Dict[str, str]]:
+    """Dizi sayfasındaki poster-card'lar"""
+    item_list: List[Dict[str, str]] = []
+    for item in soup.find_all("div", {"class": "poster-card"}):
+        item_name_tag = item.find("div", {"class": "text-left"})
+        item_name = item_name_tag.get_text().strip() if item_name_tag else "Bilinmeyen"
+
+        item_img_tag = item.find("img")
+        item_img = item_img_tag.get("src") if item_img_tag else ""
+
+        item_url_tag = item.find("a")
+        item_url = urljoin(base_url, item_url_tag.get("href")) if item_url_tag else ""
+
+        item_list.append({"name": item_name, "img": item_img, "url": item_url})
+    return item_list
+
+def parse_api_path(text: str) -> str:
+    """/bolumler sayfasından bölüm API yolu; bulunamazsa boş"""
+    results = STAR_API_PATTERN.findall(text)
+    return results[0] if results else ""
+
+def parse_api_items(data: Dict[str, Any], img_base: str) -> List[Dict[str, str]]:
+    """API sayfasındaki bölümler; referenceId'si olmayanlar atlanır"""
+    episodes: List[Dict[str, str]] = []
+    for item in data.get("items", []):
+        reference_id = (item.get("video") or {}).get("referenceId", "")
+        if not reference_id:
+            continue
+        name = item.get("heading", "") + " - " + item.get("title", "")
+        img = img_base + item["image"]["fullPath"] if item.get("image") else ""
+        episodes.append({"name": name, "img": img, "reference_id": reference_id})
+    return episodes
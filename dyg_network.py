@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+DYG ağı tarayıcısı: DMAX, TLC ve Star TV tek süreçte, eşzamanlı
+
+Üç ayrı sıralı iş (DMAX/dmax.py, TLC/tlc.py, denen/star.py) yerine tüm
+kanallar (dyg_channels.CHANNELS) aynı anda taranır; bağlantı havuzu, hız
+sınırlayıcı, AIMD pencereleri, HTTP önbelleği ve ReferenceId deposu
+kanallar arasında ortaktır. Bir kanalın hatası diğerlerini durdurmaz;
+hata veren kanalın eski M3U dosyalarına dokunulmaz.
+
+Çıktılar kanal başına sıralı tarayıcılarla aynıdır:
+  <output_dir>/<m3u_name>.m3u ve <output_dir>/programlar/*.m3u
+Star TV'de yalnızca akış URL'leri denen/star.py ile aynıdır; satır biçimi
+(#EXTINF:-1, dizi posteri) DMAX / TLC ile ortaktır, denen/jsontom3u.py'nin
+#EXTINF:1 ve bölüm görseli biçimi kullanılmaz.
+
+Kanal sarmalayıcıları (DMAX/dmax.py, TLC/tlc.py) yalnızca kanal adını
+vererek main()'i çağırır.
+
+Kullanım:
+  python dyg_network.py                 # tüm kanallar
+  python dyg_network.py dmax star       # yalnızca seçilen kanallar
+  python dyg_network.py dmax 10 50      # programlar[10:50] (başlangıç, bitiş; 0 = sona kadar)
+  python dyg_network.py --sirali        # ajax kanallarında eski sıralı tarama (dyg_sequential.py)
+  python dyg_network.py --cache         # kalıcı HTTP önbelleği (http_cache.py)
+  python dyg_network.py --rps=5         # host başına istek/sn
+  python dyg_network.py --referans-yok  # bölüm → ReferenceId deposunu kullanma
+  python dyg_network.py --dogrudan      # çalışan PublisherId'li api/redirect'i öne al (dyg_resolver.py)
+  python dyg_network.py --time-budget=90m
+                                        # süre bitmeden dur; ertelenen programların eski girdileri korunur
+"""
+
+import asyncio
+import logging
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+from slugify import slugify
+
+from dyg_async import DygClient, engine_for
+from dyg_channels import CHANNELS, DygChannel
+from dyg_sequential import SequentialScraper
+from dyg_resolver import HlsCache, RedirectResolver
+from http_cache import HttpCache
+from m3u_journal import read_playlist_groups
+from rate_limit import HostRateLimiter
+from reference_store import ReferenceStore
+from time_budget import TimeBudget, parse_duration
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)-8s | %(message)s",
+    datefmt="%H:%M:%S",
+)
+log = logging.getLogger("dyg-network")
+
+SERIES_MASTER = False  # True yaparsan <output_dir>/programlar/0.m3u da üretir
+
+# ============================
+# M3U YARDIMCILARI
+# ============================
+
+def _ensure_dir(path: str) -> None:
+    os.makedirs(path, exist_ok=True)
+
+def _atomic_write(path: str, text: str) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8", newline="\n") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+def _safe_series_filename(name: str) -> str:
+    return slugify((name or "dizi").lower()) + ".m3u"
+
+def _pick_stream_url(ep: Dict[str, Any]) -> Optional[str]:
+    url = ep.get("stream_url")
+    if url:
+        return url
+    cands = ep.get("stream_url_candidates")
+    if isinstance(cands, (list, tuple)) and cands:
+        return cands[0]
+    return None
+
+def create_m3us(channel_folder_path: str,
+                data: List[Dict[str, Any]],
+                master: bool = False,
+                base_url: str = "") -> None:
+    """
+    Her dizi için ayrı .m3u üretir, opsiyonel master (0.m3u) oluşturur.
+    NOT: Bölüm satırlarında tvg-logo olarak SERİ (program) posteri kullanılır.
+    """
+    _ensure_dir(channel_folder_path)
+    master_lines: List[str] = ["#EXTM3U"] if master else []
+
+    if base_url and not base_url.endswith(("/", "\\")):
+        base_url = base_url + "/"
+
+    for serie in (data or []):
+        episodes = serie.get("episodes") or []
+        if not episodes:
+            continue
+
+        series_name = (serie.get("name") or "Bilinmeyen Seri").strip()
+        series_logo = (serie.get("img") or "").strip()  # seri posteri
+        plist_name = _safe_series_filename(series_name)
+        plist_path = os.path.join(channel_folder_path, plist_name)
+
+        lines: List[str] = ["#EXTM3U"]
+        for ep in episodes:
+            stream = _pick_stream_url(ep)
+            if not stream:
+                continue
+            ep_name = ep.get("name") or "Bölüm"
+
+            # Seri posteri yoksa son çare bölüm resmi
+            logo_for_line = series_logo or ep.get("img") or ""
+            group = series_name.replace('"', "'")
+            lines.append(f'#EXTINF:-1 tvg-logo="{logo_for_line}" group-title="{group}",{ep_name}')
+            lines.append(stream)
+
+        if len(lines) > 1:
+            _atomic_write(plist_path, "\n".join(lines) + "\n")
+            if master:
+                master_lines.append(f'#EXTINF:-1 tvg-logo="{series_logo}", {series_name}')
+                master_lines.append(f'{base_url}{plist_name}')
+
+    if master:
+        master_path = os.path.join(channel_folder_path, "0.m3u")
+        _atomic_write(master_path, "\n".join(master_lines) + "\n")
+
+def create_single_m3u(channel_folder_path: str,
+                      data: List[Dict[str, Any]],
+                      custom_path: str = "0") -> None:
+    """
+    Tüm dizilerin tüm bölümlerini tek bir .m3u dosyasında toplar.
+    NOT: Bölüm satırlarında tvg-logo olarak SERİ (program) posteri kullanılır.
+    Süre bütçesiyle ertelenen ("deferred") programların girdileri mevcut
+    dosyadan (group-title'a göre) kendi sırasında korunur.
+    """
+    _ensure_dir(channel_folder_path)
+    master_path = os.path.join(channel_folder_path, f"{custom_path}.m3u")
+    deferred = any(serie.get("deferred") for serie in (data or []))
+    previous = read_playlist_groups(master_path) if deferred else {}
+
+    lines: List[str] = ["#EXTM3U"]
+    for serie in (data or []):
+        series_name = (serie.get("name") or "Bilinmeyen Seri").strip()
+        series_logo = (serie.get("img") or "").strip()  # seri posteri
+        if serie.get("deferred"):
+            lines.extend(previous.get(series_name.replace('"', "'"), []))
+            continue
+        episodes = serie.get("episodes") or []
+        for ep in episodes:
+            stream = _pick_stream_url(ep)
+            if not stream:
+                continue
+            ep_name = ep.get("name") or "Bölüm"
+
+            logo_for_line = series_logo or ep.get("img") or ""
+            group = series_name.replace('"', "'")
+            lines.append(f'#EXTINF:-1 tvg-logo="{logo_for_line}" group-title="{group}",{ep_name}')
+            lines.append(stream)
+
+    _atomic_write(master_path, "\n".join(lines) + "\n")
+
+def save_channel_outputs(channel: DygChannel, data: Dict[str, Any]) -> None:
+    """Kanalın birleşik ve dizi bazlı M3U dosyaları"""
+    programs = data.get("programs", [])
+    try:
+        create_single_m3u(str(channel.output_dir), programs, channel.m3u_name)
+        create_m3us(str(channel.output_dir / "programlar"), programs, master=SERIES_MASTER)
+        log.info("[%s] M3U dosyaları oluşturuldu.", channel.name)
+    except Exception as e:
+        log.error("[%s] M3U oluşturma hatası: %s", channel.name, e)
+
+# ============================
+# TARAMA
+# ============================
+
+async def crawl_channels(channels: List[DygChannel], rate_limiter: HostRateLimiter,
+                         http_cache: Optional[HttpCache] = None,
+                         reference_store: Optional[ReferenceStore] = None,
+                         start: int = 0, end: int = 0,
+                         resolve: bool = False,
+                         budget: Optional[TimeBudget] = None) -> Dict[str, Dict[str, Any]]:
+    """Kanalları ortak DygClient ile eşzamanlı tarar; kanal adı → {"programs": [...]}
+
+    resolve: api/redirect adaylarını izleyip çalışan PublisherId'yi öne al (dyg_resolver).
+    budget: süre sınırı; ertelenen programlar {"deferred": True} olarak döner.
+    Hata veren kanal sonuçta yer almaz (loglanır).
+    """
+    hls_cache = HlsCache() if resolve else None
+    async with DygClient(rate_limiter, http_cache=http_cache) as client:
+        resolver = RedirectResolver(client, hls_cache, reference_store) if resolve else None
+        results = await asyncio.gather(
+            *(engine_for(channel, client, reference_store, resolver=resolver, budget=budget).run(start, end)
+              for channel in channels),
+            return_exceptions=True,
+        )
+    client.report()
+    if resolver:
+        resolver.report()
+        hls_cache.close()
+    crawled: Dict[str, Dict[str, Any]] = {}
+    for channel, result in zip(channels, results):
+        if isinstance(result, BaseException):
+            log.error("[%s] Tarama hatası: %s", channel.name, result)
+        else:
+            crawled[channel.name] = result
+    return crawled
+
+def crawl_sequential(channels: List[DygChannel], rate_limiter: HostRateLimiter,
+                     http_cache: Optional[HttpCache] = None,
+                     reference_store: Optional[ReferenceStore] = None,
+                     start: int = 0, end: int = 0) -> Dict[str, Dict[str, Any]]:
+    """Karşılaştırma için eski sıralı tarama; crawl_channels ile aynı sonuç biçimi"""
+    crawled: Dict[str, Dict[str, Any]] = {}
+    for channel in channels:
+        try:
+            scraper = SequentialScraper(channel, rate_limiter, http_cache, reference_store)
+            crawled[channel.name] = scraper.run(start, end)
+        except Exception as e:
+            log.error("[%s] Tarama hatası: %s", channel.name, e)
+    return crawled
+
+def main(argv: Optional[List[str]] = None):
+    """Komut satırı girişi; kanal sarmalayıcıları argv'yi kendileri verir"""
+    args = sys.argv[1:] if argv is None else list(argv)
+    positional = [a for a in args if not a.startswith("--")]
+    names = [a for a in positional if not a.isdigit()] or list(CHANNELS)
+    bounds = [int(a) for a in positional if a.isdigit()]
+    start, end = (bounds + [0, 0])[:2]
+    unknown = [name for name in names if name not in CHANNELS]
+    if unknown:
+        sys.exit(f"Bilinmeyen kanal: {', '.join(unknown)} (seçenekler: {', '.join(CHANNELS)})")
+    budget_spec = next((a.split("=", 1)[1] for a in args if a.startswith("--time-budget=")), None)
+    try:
+        budget = TimeBudget(parse_duration(budget_spec)) if budget_spec else None
+    except ValueError as e:
+        sys.exit(str(e))
+
+    http_cache = HttpCache() if "--cache" in args else None
+    rps = next((a.split("=", 1)[1] for a in args if a.startswith("--rps=")), None)
+    rate_limiter = HostRateLimiter(float(rps)) if rps else HostRateLimiter()
+    reference_store = None if "--referans-yok" in args else ReferenceStore()
+
+    channels = [CHANNELS[name] for name in names]
+    sequential = [c for c in channels if c.listing == "ajax"] if "--sirali" in args else []
+    concurrent = [c for c in channels if c not in sequential]
+    crawled = crawl_sequential(sequential, rate_limiter, http_cache, reference_store, start, end)
+    if concurrent:
+        crawled.update(asyncio.run(crawl_channels(concurrent, rate_limiter, http_cache, reference_store,
+                                                  start=start, end=end, resolve="--dogrudan" in args,
+                                                  budget=budget)))
+    for channel in channels:
+        if channel.name in crawled:
+            save_channel_outputs(channel, crawled[channel.name])
+
+    rate_limiter.report()
+    if budget is not None:
+        budget.report(lambda item: f"{item[0]}: {item[1]}")
+    if http_cache:
+        http_cache.report()
+        http_cache.close()
+    if reference_store:
+        reference_store.report()
+        reference_store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+dygvideo api/redirect çözümü: PublisherId öğrenme ve HLS önbelleği
+
+Bölüm başına her PublisherId için bir api/redirect adayı üretilir; hangisinin
+çalıştığı denetlenmez ve oynatıcılar her açılışta yönlendirme adımını (yarı
+yarıya da önce hatalı adayı) öder. İsteğe bağlı (--dogrudan) bu aşama:
+- programın ilk bölümünde tüm adayların yönlendirmesini aynı anda izler,
+  oynatma listesi (#EXTM3U) dönen PublisherId'yi program için öğrenir,
+- kalan bölümlerde önce öğrenilen PublisherId'yi, başarısızsa diğerlerini dener,
+- çözülen HLS URL'sini, URL'deki süre parametrelerinden (expires / exp /
+  hdnts=...~exp=...) çıkarılan TTL ile SQLite'ta saklar,
+- M3U'ya kalıcı api/redirect URL'sini, çalıştığı doğrulanan PublisherId önde
+  olacak şekilde yazar. Doğrudan HLS URL'si belirteçle birlikte süresi dolan
+  (varsayılan 1 saat) bir adrestir; oynatma listesine yazılmaz, yalnızca
+  önbellek olarak ep["resolved_url"]'de ve HlsCache'te tutulur.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_HLS_CACHE_PATH = BASE_DIR / ".cache" / "dyg_hls.sqlite3"
+# Süre parametresi yoksa çözülen URL'nin saklanma süresi (sn)
+DEFAULT_TTL = 3600
+MAX_TTL = 7 * 24 * 3600
+# Süre dolmadan bu kadar önce yeniden çözülür
+EXPIRY_MARGIN = 300
+
+EXPIRY_PARAMS = ("expires", "expire", "exp", "e", "validto", "valid_to", "end")
+_TOKEN_EXPIRY_RE = re.compile(r"(?:^|[~&])exp=(\d+)")
+
+
+def publisher_of(redirect_url: str) -> Optional[int]:
+    value = parse_qs(urlparse(redirect_url).query).get("PublisherId", [""])[0]
+    return int(value) if value.isdigit() else None
+
+
+def expiry_of(hls_url: str) -> Optional[float]:
+    """HLS URL'sindeki son geçerlilik zamanı (unix sn); bulunamazsa None"""
+    query = parse_qs(urlparse(hls_url).query)
+    candidates = [values[0] for key, values in query.items() if key.lower() in EXPIRY_PARAMS]
+    # Akamai tarzı jeton: hdnts=st=...~exp=...~acl=...
+    for values in query.values():
+        match = _TOKEN_EXPIRY_RE.search(values[0])
+        if match:
+            candidates.append(match.group(1))
+    for value in candidates:
+        try:
+            expiry = float(value)
+        except ValueError:
+            continue
+        # milisaniye cinsinden zaman damgaları
+        return expiry / 1000 if expiry > 1e12 else expiry
+    return None
+
+
+def ttl_for(hls_url: str, now: Optional[float] = None) -> float:
+    """Önbellek TTL'i: süre parametresine göre, yoksa DEFAULT_TTL"""
+    expiry = expiry_of(hls_url)
+    if expiry is None:
+        return DEFAULT_TTL
+    now = time.time() if now is None else now
+    return min(MAX_TTL, max(0.0, expiry - now - EXPIRY_MARGIN))
+
+
+class HlsCache:
+    """api/redirect URL'si → çözülmüş HLS URL'si (son geçerlilik zamanıyla)"""
+
+    def __init__(self, path=DEFAULT_HLS_CACHE_PATH):
+        self.path = str(path)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS hls ("
+            " redirect_url TEXT PRIMARY KEY, hls_url TEXT NOT NULL,"
+            " resolved_at REAL NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self.db.commit()
+
+    def get(self, redirect_url: str) -> Optional[str]:
+        row = self.db.execute(
+            "SELECT hls_url FROM hls WHERE redirect_url = ? AND expires_at > ?",
+            (redirect_url, time.time()),
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, redirect_url: str, hls_url: str) -> None:
+        now = time.time()
+        ttl = ttl_for(hls_url, now)
+        if ttl <= 0:
+            return
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO hls (redirect_url, hls_url, resolved_at, expires_at)"
+                " VALUES (?, ?, ?, ?)", (redirect_url, hls_url, now, now + ttl),
+            )
+
+    def close(self):
+        self.db.close()
+
+
+class RedirectResolver:
+    """Program başına PublisherId öğrenerek api/redirect adaylarını HLS URL'sine çözer"""
+
+    def __init__(self, client, cache: Optional[HlsCache] = None, reference_store=None):
+        self.client = client
+        self.cache = cache
+        self.reference_store = reference_store
+        # (kanal, program URL'si) → çalışan PublisherId
+        self.learned: Dict[Tuple[str, str], int] = {}
+        self.stats = Counter()
+
+    async def _follow(self, redirect_url: str, headers: Dict[str, str]) -> Optional[str]:
+        """Yönlendirmeyi izler; son adres oynatma listesi dönerse onu verir"""
+        if self.cache:
+            cached = self.cache.get(redirect_url)
+            if cached:
+                self.stats["önbellekten"] += 1
+                return cached
+        try:
+            status, body, _, final_url = await self.client.fetch("GET", redirect_url, headers=headers)
+        except Exception as e:
+            logger.debug(f"[DYG-HLS] {redirect_url}: {e}")
+            return None
+        if status >= 400 or not body.lstrip().startswith(b"#EXTM3U"):
+            return None
+        self.stats["izlendi"] += 1
+        if self.cache:
+            self.cache.put(redirect_url, final_url)
+        return final_url
+
+    async def _resolve(self, candidates: List[str], headers: Dict[str, str],
+                       learned: Optional[int]) -> Optional[Tuple[int, str]]:
+        """(PublisherId, HLS URL); öğrenilmiş PublisherId varsa önce yalnızca o denenir"""
+        if learned is not None:
+            first = [c for c in candidates if publisher_of(c) == learned]
+            rest = [c for c in candidates if publisher_of(c) != learned]
+        else:
+            first, rest = candidates, []
+        for group in (first, rest):
+            if not group:
+                continue
+            results = await asyncio.gather(*(self._follow(c, headers) for c in group))
+            for candidate, hls_url in zip(group, results):
+                if hls_url:
+                    return publisher_of(candidate), hls_url
+        return None
+
+    async def _episode(self, channel, key: Tuple[str, str], ep: Dict[str, Any],
+                       headers: Dict[str, str]) -> None:
+        candidates = ep.get("stream_url_candidates") or [ep["stream_url"]]
+        resolved = await self._resolve(candidates, headers, self.learned.get(key))
+        if resolved is None:
+            self.stats["çözülemedi"] += 1
+            learned = self.learned.get(key)
+            if learned is not None:
+                # yedek: öğrenilen PublisherId'li yönlendirme önde
+                candidates = sorted(candidates, key=lambda c: publisher_of(c) != learned)
+                ep["stream_url"] = candidates[0]
+                ep["stream_url_candidates"] = candidates
+            return
+        publisher_id, hls_url = resolved
+        if self.learned.get(key) != publisher_id:
+            self.learned[key] = publisher_id
+            self.stats["öğrenilen_publisher"] += 1
+        # M3U'ya kalıcı yönlendirme yazılır; süreli HLS URL'si yalnızca önbellek
+        redirects = sorted(candidates, key=lambda c: publisher_of(c) != publisher_id)
+        ep["stream_url"] = redirects[0]
+        ep["stream_url_candidates"] = redirects
+        ep["resolved_url"] = hls_url
+        self.stats["çözüldü"] += 1
+        if self.reference_store and ep.get("url"):
+            self.reference_store.set_publisher(channel.name, ep["url"], publisher_id)
+
+    async def resolve_program(self, channel, program: Dict[str, str], episodes: List[Dict[str, Any]],
+                              headers: Dict[str, str]) -> None:
+        """Bölümlerin adaylarını yerinde çalışan PublisherId önde olacak şekilde sıralar"""
+        if not episodes:
+            return
+        key = (channel.name, program.get("url", ""))
+        # İlk bölüm PublisherId'yi öğretir; kalanlar öğrenilenle aynı anda çözülür
+        await self._episode(channel, key, episodes[0], headers)
+        await asyncio.gather(*(self._episode(channel, key, ep, headers) for ep in episodes[1:]))
+
+    def report(self):
+        logger.info("[DYG-HLS] " + ", ".join(f"{k}: {v}" for k, v in self.stats.items()))
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+DYG "ajax" kanalları (DMAX, TLC) için eski sıralı tarayıcı (--sirali)
+
+Eskiden DMAX/dmax.py ve TLC/tlc.py'de ayrı ayrı kopyalanmış requests tabanlı
+zincir: programlar → sezonlar → bölüm sayfaları, her istek sırayla ve hız
+sınırlayıcıda bekleyerek. Eşzamanlı motorla (dyg_async) karşılaştırma için
+tutulur; ayrıştırıcılar (dyg_channels) ortak olduğundan çıktı aynıdır.
+
+Kullanım:
+    data = SequentialScraper(CHANNELS["dmax"], rate_limiter).run(start, end)
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter, Retry
+from tqdm import tqdm
+
+import dyg_channels
+from dyg_async import BACKOFF_FACTOR, DEFAULT_HEADERS, MAX_RETRIES, REQUEST_TIMEOUT, RETRY_STATUSES, \
+    channel_headers
+from dyg_channels import DygChannel
+from http_cache import cached_get
+
+log = logging.getLogger(__name__)
+
+
+def make_session(channel: DygChannel) -> requests.Session:
+    session = requests.Session()
+    retries = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "POST"]),
+        raise_on_status=False,
+    )
+    session.mount("https://", HTTPAdapter(max_retries=retries))
+    session.mount("http://", HTTPAdapter(max_retries=retries))
+    session.headers.update({**DEFAULT_HEADERS, **channel_headers(channel)})
+    return session
+
+
+class SequentialScraper:
+    """Tek "ajax" kanalının sıralı taraması; run() sözleşmesi DygAsyncEngine ile aynı"""
+
+    def __init__(self, channel: DygChannel, rate_limiter, http_cache=None, reference_store=None):
+        if channel.listing != "ajax":
+            raise ValueError(f"{channel.name}: sıralı tarama yalnızca ajax kanalları için")
+        self.channel = channel
+        self.rate_limiter = rate_limiter
+        self.http_cache = http_cache
+        self.reference_store = reference_store
+        self.session = make_session(channel)
+
+    def get_soup_from_post(self, url: str, data: Dict[str, Any]) -> Optional[BeautifulSoup]:
+        self.rate_limiter.wait(url)
+        try:
+            r = self.session.post(url, data=data, timeout=REQUEST_TIMEOUT)
+            self.rate_limiter.observe(url, r.status_code, r.headers)
+            r.raise_for_status()
+            return BeautifulSoup(r.content, "html.parser")
+        except Exception as e:
+            log.warning("POST %s hatası: %s", url, e)
+            return None
+
+    def get_soup_from_get(self, url: str) -> Optional[BeautifulSoup]:
+        self.rate_limiter.wait(url)
+        try:
+            content = cached_get(self.session, url, self.http_cache, timeout=REQUEST_TIMEOUT)
+            return BeautifulSoup(content, "html.parser")
+        except requests.HTTPError as e:
+            self.rate_limiter.observe(url, e.response.status_code, e.response.headers)
+            log.warning("GET %s hatası: %s", url, e)
+            return None
+        except Exception as e:
+            log.warning("GET %s hatası: %s", url, e)
+            return None
+
+    def _paged(self, fetch_page, on_empty=None) -> List[Dict[str, str]]:
+        """Sayfaları sırayla ister; art arda 2 boş sayfada durur"""
+        items: List[Dict[str, str]] = []
+        empty_count = 0
+        page = 0
+        while True:
+            page_items = fetch_page(page)
+            if not page_items:
+                empty_count += 1
+                if on_empty:
+                    on_empty(page, empty_count)
+                if empty_count >= 2:
+                    return items
+            else:
+                empty_count = 0
+                items.extend(page_items)
+            page += 1
+
+    def get_all_programs(self) -> List[Dict[str, str]]:
+        def fetch_page(page):
+            data = {"type": "discover", "slug": "a-z", "page": page}
+            soup = self.get_soup_from_post(self.channel.ajax_url, data)
+            return dyg_channels.parse_program_page(soup, self.channel.base_url) if soup else []
+
+        def on_empty(page, empty_seen):
+            log.info("[%s] Boş/hatali sayfa: %d (ardışık=%d)", self.channel.name, page, empty_seen)
+            if empty_seen >= 2:
+                log.info("[%s] Toplam sayfa: %d", self.channel.name, page)
+
+        return self._paged(fetch_page, on_empty)
+
+    def get_program_id(self, url: str) -> Tuple[str, List[str]]:
+        soup = self.get_soup_from_get(url)
+        if not soup:
+            return "0", []
+        return dyg_channels.parse_program_info(soup)
+
+    def get_episodes_by_program_id(self, program_id: str, season_list: List[str],
+                                   serie_name: str) -> List[Dict[str, str]]:
+        all_episodes: List[Dict[str, str]] = []
+        for season in tqdm(season_list, desc="Sezonlar", leave=False):
+            def fetch_page(page):
+                data = {"type": "episodes", "program_id": program_id, "page": page, "season": season}
+                soup = self.get_soup_from_post(self.channel.ajax_url, data)
+                return dyg_channels.parse_episode_items(soup, serie_name) if soup else []
+
+            all_episodes.extend(self._paged(fetch_page))
+        return all_episodes
+
+    def get_stream_urls(self, episode_url: str) -> List[str]:
+        store, name = self.reference_store, self.channel.name
+        stored = store.lookup(name, episode_url) if store else None
+        if stored is not None:
+            return self.channel.stream_urls(*stored)
+        soup = self.get_soup_from_get(episode_url)
+        if not soup:
+            return []
+        reference_id = dyg_channels.parse_reference_id(soup)
+        if not reference_id:
+            return []
+        if store:
+            store.remember(name, episode_url, reference_id)
+        return self.channel.stream_urls(reference_id)
+
+    def run(self, start: int = 0, end: int = 0) -> Dict[str, Any]:
+        output: List[Dict[str, Any]] = []
+        programs_list = self.get_all_programs()
+        if not programs_list:
+            log.warning("[%s] Hiç program bulunamadı.", self.channel.name)
+            return {"programs": []}
+
+        end_index = len(programs_list) if end == 0 else min(end, len(programs_list))
+        start_index = max(0, start)
+
+        for i in tqdm(range(start_index, end_index), desc=self.channel.m3u_name):
+            program = programs_list[i]
+            log.info("[%s] %d | %s", self.channel.name, i, program.get("name", ""))
+
+            program_id, season_list = self.get_program_id(program["url"])
+            if program_id == "0":
+                log.warning("[%s] Program ID alınamadı: %s", self.channel.name, program.get("name"))
+                continue
+
+            episodes = self.get_episodes_by_program_id(program_id, season_list, program["name"])
+            if not episodes:
+                continue
+
+            temp_program = dict(program)
+            temp_program["episodes"] = []
+
+            for ep in tqdm(episodes, desc="Bölümler", leave=False):
+                temp_episode = dict(ep)
+                stream_candidates = self.get_stream_urls(ep["url"])
+                if stream_candidates:
+                    temp_episode["stream_url"] = stream_candidates[0]
+                    temp_episode["stream_url_candidates"] = stream_candidates
+                    temp_program["episodes"].append(temp_episode)
+
+            if temp_program["episodes"]:
+                output.append(temp_program)
+
+        return {"programs": output}
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+dizifun sayfaları için değiştirilebilir ayrıştırma katmanı
+
+Bölüm / film / Gujan sayfalarında yalnızca birkaç etiket gerekir (iframe,
+source, script içindeki hexToString ve m3u8 adresleri, title). Tüm DOM'u
+kurmak yerine üç mod vardır:
+- "fast":    regex ile iframe / source / script / title okunur (FastDocument);
+             desteklenmeyen bir seçici gelirse ya da sayfada aday metni
+             olduğu halde hızlı yol oyuncu / akış bulamazsa (ıska) tam
+             BeautifulSoup'a düşülür; aday metni yoksa tam ayrıştırma da bir
+             şey bulamayacağından yapılmaz,
+- "partial": SoupStrainer ile yalnızca ilgili etiketler ayrıştırılır,
+- "full":    eski davranış, BeautifulSoup(content, 'html.parser').
+
+player_candidates / gujan_stream: sayfa metninden çözücülerin ihtiyaç
+duyduğu küçük sonucu çıkaran saf fonksiyonlar; parse_pool ile işlem
+havuzunda çalıştırılabilir (işçilerdeki sayaç farkları ParsePool ile bu
+sürecin stats'ına eklenir).
+
+Kullanım (kayıtlı sayfalarda mod başına CPU süresi ölçümü):
+  python extraction.py sayfalar/*.html
+"""
+
+import hashlib
+import html
+import logging
+import re
+import sys
+import time
+from collections import Counter
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_MODE = "fast"
+
+# partial modda ayrıştırılan etiketler
+PLAYER_TAGS = ["iframe", "source", "script", "title"]
+LINK_TAGS = ["a"]
+
+_ATTR_RE = re.compile(r'([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?')
+_SELECTOR_RE = re.compile(r'^(\w+)(?:#([\w-]+))?(?:\[([\w-]+)(\*?=)"?([^"\]]*)"?\])?$')
+_CANDIDATE_RE = re.compile(r"<iframe\b|<source\b|hexToString|\.m3u8", re.IGNORECASE)
+# Etiket aramasından önce atılan kısımlar: HTML yorumları ve <script> gövdeleri
+_HIDDEN_RE = re.compile(r"(<script\b[^>]*>.*?</script\s*>)|<!--.*?(?:-->|$)", re.IGNORECASE | re.DOTALL)
+_FINGERPRINT_RE = re.compile(r'<iframe\b[^>]*>|<source\b[^>]*>|hexToString\w*\("[a-fA-F0-9]+"\)', re.IGNORECASE)
+
+GUJAN_SELECTORS = (
+    'iframe[title="dizifunplay"]',
+    'iframe[id="altPlayerFrame"]',
+    'iframe[src*="gujan.premiumvideo.click"]',
+)
+PLAYHOUSE_SELECTORS = (
+    'iframe[title="playhouse"]',
+    'iframe[src*="playhouse.premiumvideo.click"]',
+    'iframe[src*="premiumvideo.click/player"]',
+)
+FALLBACK_SELECTORS = (
+    "iframe#londonIframe",
+    "iframe[src*=premiumvideo]",
+    "iframe[data-src*=premiumvideo]",
+    "iframe[src*=player]",
+    "iframe",
+)
+_HEX_RE = re.compile(r'hexToString\w*\("([a-fA-F0-9]+)"\)')
+_FALLBACK_FILE_ID_RE = re.compile(r'premiumvideo\.click/player\.php\?file_id=([a-zA-Z0-9]+)')
+_GUJAN_M3U8_PATTERNS = (
+    re.compile(r'https?://[^"\s]+/hls/[^"/\s]+/playlist\.m3u8'),
+    re.compile(r'https?://[^"\s]+\.m3u8'),
+    re.compile(r'"(https?://gujan\.premiumvideo\.click/hls/[^"]+)"'),
+)
+
+stats = Counter()
+
+
+class LiteElement:
+    """BeautifulSoup Tag'ının get() / get_text() alt kümesini taklit eder"""
+
+    def __init__(self, name, attrs, text=""):
+        self.name = name
+        self.attrs = attrs
+        self.text = text
+
+    def get(self, key, default=None):
+        return self.attrs.get(key, default)
+
+    def get_text(self, strip=False):
+        return self.text.strip() if strip else self.text
+
+
+class FastDocument:
+    """Regex tabanlı, yalnızca oyuncu etiketlerini okuyan hafif belge"""
+
+    def __init__(self, content):
+        self.content = content
+        self._elements = {}
+        self._markup = {}
+        self._soup = None
+
+    def has_candidates(self):
+        return _CANDIDATE_RE.search(self.content) is not None
+
+    def full(self):
+        if self._soup is None:
+            stats["tam_ayrıştırma"] += 1
+            self._soup = BeautifulSoup(self.content, "html.parser")
+        return self._soup
+
+    def _visible(self, keep_scripts):
+        """Yorumları (ve keep_scripts değilse <script> bloklarını) atılmış içerik
+
+        html.parser bunların içindeki <iframe ...> benzeri metni etiket saymaz;
+        hızlı yol da saymamalı.
+        """
+        if keep_scripts not in self._markup:
+            self._markup[keep_scripts] = _HIDDEN_RE.sub(
+                lambda m: m.group(1) if keep_scripts and m.group(1) else "", self.content)
+        return self._markup[keep_scripts]
+
+    def _find(self, name):
+        if name not in self._elements:
+            if name in ("script", "title"):
+                pattern = re.compile(rf"<{name}\b([^>]*)>(.*?)</{name}\s*>", re.IGNORECASE | re.DOTALL)
+                elements = [
+                    LiteElement(name, _parse_attrs(m.group(1)),
+                                html.unescape(m.group(2)) if name == "title" else m.group(2))
+                    for m in pattern.finditer(self._visible(keep_scripts=True))
+                ]
+            else:
+                pattern = re.compile(rf"<{name}\b([^>]*)>", re.IGNORECASE)
+                elements = [LiteElement(name, _parse_attrs(m.group(1)))
+                            for m in pattern.finditer(self._visible(keep_scripts=False))]
+            self._elements[name] = elements
+        return self._elements[name]
+
+    def select_one(self, selector):
+        match = _SELECTOR_RE.match(selector.strip())
+        if not match or match.group(1) not in PLAYER_TAGS:
+            return self.full().select_one(selector)
+        name, element_id, attr, op, value = match.groups()
+        for element in self._find(name):
+            if element_id and element.get("id") != element_id:
+                continue
+            if attr:
+                actual = element.get(attr)
+                if actual is None:
+                    continue
+                if op == "=" and actual != value:
+                    continue
+                if op == "*=" and value not in actual:
+                    continue
+            return element
+        return None
+
+    def find_all(self, name):
+        if name not in PLAYER_TAGS:
+            return self.full().find_all(name)
+        return list(self._find(name))
+
+
+def _parse_attrs(raw):
+    attrs = {}
+    for m in _ATTR_RE.finditer(raw):
+        key = m.group(1).lower()
+        if key in attrs:
+            continue
+        value = next((g for g in m.group(2, 3, 4) if g is not None), "")
+        attrs[key] = html.unescape(value)
+    return attrs
+
+
+def parse_player_page(content, mode=None):
+    """Bölüm / film / Gujan sayfasını seçilen modda ayrıştırır"""
+    mode = mode or EXTRACTION_MODE
+    if mode == "fast":
+        stats["hızlı"] += 1
+        return FastDocument(content)
+    if mode == "partial":
+        stats["kısmi"] += 1
+        return BeautifulSoup(content, "html.parser", parse_only=SoupStrainer(PLAYER_TAGS))
+    stats["tam_ayrıştırma"] += 1
+    return BeautifulSoup(content, "html.parser")
+
+
+def parse_links_page(content, mode=None):
+    """Liste sayfasını yalnızca <a> etiketleriyle ayrıştırır (full modda tamamı)"""
+    if (mode or EXTRACTION_MODE) == "full":
+        return BeautifulSoup(content, "html.parser")
+    return BeautifulSoup(content, "html.parser", parse_only=SoupStrainer(LINK_TAGS))
+
+
+def player_fingerprint(content):
+    """Sayfanın oyuncuyla ilgili kısmının (iframe / source etiketleri, hexToString) özeti"""
+    parts = _FINGERPRINT_RE.findall(content)
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _fast_missed(soup):
+    """Hızlı yol sonuç bulamadı ama sayfada aday metni var: tam ayrıştırmaya düşülmeli"""
+    if not isinstance(soup, FastDocument) or not soup.has_candidates():
+        return False
+    stats["hızlı_ıska"] += 1
+    return True
+
+
+def player_candidates(content, page_url, mode=None):
+    """Bölüm / film sayfasından başlık, Gujan / Playhouse / fallback adaylarını ve parmak izini çıkarır"""
+    soup = parse_player_page(content, mode)
+    candidates = _player_candidates(soup, content, page_url)
+    found = candidates["gujan_srcs"] or candidates["playhouse_url"] or candidates["fallback"]
+    if not found and _fast_missed(soup):
+        candidates = _player_candidates(soup.full(), content, page_url)
+    return candidates
+
+
+def _player_candidates(soup, content, page_url):
+    title_element = soup.select_one("title")
+
+    gujan_srcs = []
+    for selector in GUJAN_SELECTORS:
+        element = soup.select_one(selector)
+        src = element.get("src") if element else None
+        if src and "gujan.premiumvideo.click" in src and src not in gujan_srcs:
+            gujan_srcs.append(src)
+
+    return {
+        "title": title_element.get_text(strip=True) if title_element else None,
+        "gujan_srcs": gujan_srcs,
+        "playhouse_url": _find_playhouse_url(soup),
+        "fallback": _find_fallback_iframe(soup, page_url),
+        "fingerprint": player_fingerprint(content),
+    }
+
+
+def _find_playhouse_url(soup):
+    """Playhouse iframe'i, yoksa script'lerdeki hexToString değerlerinden çözülen URL"""
+    for selector in PLAYHOUSE_SELECTORS:
+        element = soup.select_one(selector)
+        src = element.get("src") if element else None
+        if src and "playhouse.premiumvideo.click" in src:
+            return "https:" + src if src.startswith("//") else src
+
+    for script in soup.find_all("script"):
+        for hex_value in _HEX_RE.findall(script.get_text() or ""):
+            try:
+                decoded_url = bytes.fromhex(hex_value).decode("utf-8")
+            except ValueError:
+                continue
+            if "playhouse.premiumvideo.click" in decoded_url:
+                return "https:" + decoded_url if decoded_url.startswith("//") else decoded_url
+    return None
+
+
+def _find_fallback_iframe(soup, page_url):
+    """Eski sistem: player.php?file_id= içeren ilk iframe için (iframe URL'si, file_id)"""
+    for selector in FALLBACK_SELECTORS:
+        element = soup.select_one(selector)
+        if not element:
+            continue
+        src = element.get("src")
+        if not src or src == "about:blank":
+            src = element.get("data-src")
+        if src and src != "about:blank":
+            iframe_url = urljoin(page_url, src) if src.startswith("/") else src
+            match = _FALLBACK_FILE_ID_RE.search(iframe_url)
+            if match:
+                return iframe_url, match.group(1)
+    return None
+
+
+def gujan_stream(content, mode=None):
+    """Gujan player sayfasındaki m3u8 (source etiketi, yoksa script içi), bulunamazsa None"""
+    soup = parse_player_page(content, mode)
+    stream = _gujan_stream(soup)
+    if stream is None and _fast_missed(soup):
+        stream = _gujan_stream(soup.full())
+    return stream
+
+
+def _gujan_stream(soup):
+    source_element = soup.select_one('source[type="application/x-mpegURL"]')
+    if source_element and source_element.get("src"):
+        return source_element.get("src")
+    for script in soup.find_all("script"):
+        script_content = script.get_text() or ""
+        for pattern in _GUJAN_M3U8_PATTERNS:
+            matches = pattern.findall(script_content)
+            if matches:
+                return matches[0]
+    return None
+
+
+def report():
+    logger.info("[AYRIŞTIRMA] " + ", ".join(f"{k}: {v}" for k, v in stats.items()))
+
+
+def benchmark(paths, rounds=5):
+    """Kayıtlı sayfalarda mod başına sayfa başı CPU süresini (ms) döndürür"""
+    pages = []
+    for path in paths:
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            pages.append(f.read())
+    results = {}
+    for mode in ("full", "partial", "fast"):
+        start = time.process_time()
+        for _ in range(rounds):
+            for content in pages:
+                player_candidates(content, "https://dizifun5.com/", mode)
+        results[mode] = (time.process_time() - start) / (rounds * len(pages)) * 1000
+    return results
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if len(sys.argv) < 2:
+        print("Kullanım: python extraction.py sayfa1.html [sayfa2.html ...]")
+        sys.exit(1)
+    results = benchmark(sys.argv[1:])
+    for mode, ms in results.items():
+        speedup = results["full"] / ms if ms else float("inf")
+        print(f"{mode:8s} {ms:8.3f} ms/sayfa  (x{speedup:.1f})")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Çözülemeyen bölüm / film defteri (negatif önbellek, SQLite)
+
+m3u8'i bulunamayan her bölüm ya da film için hata nedeni, deneme sayısı,
+oyuncu parmak izi (extraction.player_fingerprint) ve son denemenin attığı
+istek sayısı saklanır. Yeniden deneme üstel aralıkla yapılır (6 saat, 12
+saat, 1 gün ... en fazla 30 gün). Sayfanın oyuncu kısmı değişirse (parmak
+izi farklıysa) süre beklenmeden yeniden denenir.
+
+Denemede geçici ağ hatası (timeout, bağlantı hatası, 429 / 5xx) olduysa
+sonuç kesin sayılmaz (M3U8Validator'daki kesin olmayan kararlar gibi): deneme
+sayısı artmaz, kayıt yalnızca TRANSIENT_DELAY kadar ertelenir; tek bir
+sorunlu CI çalışması çalışan bir bölümü günlerce gizlemez.
+
+Kaydı olan bir URL'nin sayfası, parmak izi hesaplanmadan önce HTTP
+önbelleğinde taze olsa da yeniden doğrulanır (If-None-Match /
+If-Modified-Since); aksi halde bölüm sayfaları süresiz saklandığından parmak
+izi hiç değişmez ve düzelen bir bölüm erteleme bitene kadar atlanırdı.
+
+Ertelenen bir kayıt için yalnızca sayfa (çoğu zaman 304 ile) okunur;
+iframe, Playhouse ve mirror istekleri atılmaz. Çalışma sonunda atlanan
+kayıtlar ve bunların son denemede harcadığı istek sayısı raporlanır.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from collections import Counter
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_LEDGER_PATH = BASE_DIR / ".cache" / "failures.sqlite3"
+BASE_DELAY = 6 * 3600
+MAX_DELAY = 30 * 24 * 3600
+TRANSIENT_DELAY = 3600
+
+
+class FailureLedger:
+    """URL → (neden, deneme sayısı, parmak izi, maliyet, sonraki deneme zamanı)"""
+
+    def __init__(self, path=DEFAULT_LEDGER_PATH, base_delay=BASE_DELAY, max_delay=MAX_DELAY):
+        self.path = str(path)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.db = sqlite3.connect(self.path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS failures ("
+            " url TEXT PRIMARY KEY, reason TEXT, attempts INTEGER NOT NULL,"
+            " fingerprint TEXT, cost INTEGER NOT NULL, last_failed REAL NOT NULL,"
+            " next_retry REAL NOT NULL)"
+        )
+        self.db.commit()
+        self.stats = Counter()
+
+    def has_entry(self, url):
+        """URL için hata kaydı varsa True (sayfa yeniden doğrulanarak okunmalı)"""
+        return self.db.execute("SELECT 1 FROM failures WHERE url = ?", (url,)).fetchone() is not None
+
+    def should_skip(self, url, fingerprint):
+        """Kayıt erteleme süresindeyse ve oyuncu kısmı değişmediyse True"""
+        row = self.db.execute("SELECT * FROM failures WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return False
+        if row["fingerprint"] != fingerprint:
+            self.stats["parmak_izi_değişti"] += 1
+            logger.info(f"[LEDGER] Sayfa değişmiş, yeniden deneniyor: {url}")
+            return False
+        if time.time() >= row["next_retry"]:
+            self.stats["süresi_doldu"] += 1
+            return False
+        self.stats["atlanan"] += 1
+        self.stats["önlenen_istek"] += row["cost"]
+        logger.info(f"[LEDGER] Atlandı ({row['attempts']}. hata: {row['reason']}): {url}")
+        return True
+
+    def record(self, url, success, fingerprint, cost, reason=None, transient=False):
+        """Deneme sonucunu işler: başarıda kaydı siler, hatada bir sonraki denemeyi erteler
+
+        transient: hata geçici ağ sorunundan olabilir; üstel erteleme uygulanmaz.
+        """
+        if success:
+            with self.db:
+                if self.db.execute("DELETE FROM failures WHERE url = ?", (url,)).rowcount:
+                    self.stats["iyileşen"] += 1
+            return
+
+        row = self.db.execute("SELECT attempts FROM failures WHERE url = ?", (url,)).fetchone()
+        if transient:
+            attempts = row["attempts"] if row else 0
+            delay = TRANSIENT_DELAY
+            reason = f"geçici: {reason}"
+            self.stats["geçici"] += 1
+        else:
+            attempts = (row["attempts"] if row else 0) + 1
+            delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        now = time.time()
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO failures"
+                " (url, reason, attempts, fingerprint, cost, last_failed, next_retry)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, reason, attempts, fingerprint, cost, now, now + delay),
+            )
+        self.stats["hata"] += 1
+
+    def report(self):
+        logger.info("[LEDGER] " + ", ".join(f"{k}: {v}" for k, v in self.stats.items()))
+
+    def close(self):
+        self.db.close()
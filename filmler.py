@@ -2,13 +2,20 @@ import asyncio
 import aiohttp
 import re
 import os
+import sys
 from itertools import islice
 from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
 import logging
-from concurrent.futures import ThreadPoolExecutor
 import time
 
+import extraction
+from adaptive_limit import HostLimits, request_meter
+from failure_ledger import FailureLedger
+from http_cache import HttpCache, SingleFlight
+from parse_pool import LoopLagMonitor, ParsePool
+from premiumvideo import PREMIUMVIDEO_DOMAINS, DomainResolver, M3U8Validator, DEFAULT_VALIDATION_PATH, Speculation, build_gujan_url, build_master_url, race_domains
+
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -25,6 +32,32 @@ HEADERS = {
     "Upgrade-Insecure-Requests": "1",
 }
 
+# Kalıcı yanıt önbelleği (http_cache.HttpCache); None ise kapalı, --cache ile açılır
+response_cache = None
+# file_id → domain önbelleği ve dizi / genel domain yakınlığı (çalışma boyunca)
+domain_resolver = DomainResolver()
+# Host başına AIMD eşzamanlılık penceresi (fetch_page, m3u8 testi, Playhouse redirect'i)
+host_limits = HostLimits()
+# m3u8 doğrulama kararları; --cache ile çalışmalar arasında da saklanır
+m3u8_validator = M3U8Validator(limits=host_limits)
+# file_id'den kurulan akış adreslerinin iframe / redirect'siz denenmesi ve kazanma oranı
+speculation = Speculation()
+# Ayrıştırma işlem havuzu; main'de başlatılır, --inline-parse ile loop içinde kalır
+parse_pool = ParsePool()
+# Aynı URL için eşzamanlı istekleri birleştirir, son sayfaları bellekte tutar
+page_flight = SingleFlight()
+# Çözülemeyen filmler defteri (failure_ledger.FailureLedger); --incremental ile açılır
+failure_ledger = None
+
+# Film işçisi sayısı; host başına gerçek eşzamanlılığı
+# host_limits'teki AIMD penceresi belirler
+MOVIE_WORKERS = 32
+# Bağlantı havuzu üst sınırı (host pencerelerinin toplamı için)
+CONNECTION_LIMIT = 64
+# İşçilere bekleyen film kuyruğu ve yazıcının önünde bulunabilecek en fazla film
+MOVIE_QUEUE_SIZE = 64
+MOVIE_WINDOW = 256
+
 
 def create_proxy_url(original_url):
     """Orijinal URL'yi proxy üzerinden geçirir"""
@@ -91,16 +124,33 @@ def fix_url(url, base=BASE_URL):
         return urljoin(base, url)
     return url
 
-async def fetch_page(session, url, timeout=45):  
+async def fetch_page(session, url, timeout=45):
     """Async olarak sayfa içeriğini getirir"""
+    return await page_flight.fetch(url, lambda: _download_page(session, url, timeout))
+
+async def _download_page(session, url, timeout):
     try:
-        async with session.get(url, headers=HEADERS, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
-            if response.status == 200:
-                content = await response.text()
-                return content
-            else:
-                logger.warning(f"[!] HTTP {response.status} hatası: {url}")
-                return None
+        headers = HEADERS
+        cached = response_cache.lookup(url) if response_cache else None
+        if cached is not None:
+            if cached.fresh:
+                return cached.text
+            headers = {**HEADERS, **cached.conditional_headers()}
+        
+        async with host_limits.slot(url) as slot:
+            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=slot.timeout(timeout))) as response:
+                slot.observe(response.status)
+                if response.status == 304 and cached is not None:
+                    response_cache.record_not_modified(url, cached)
+                    return cached.text
+                if response.status == 200:
+                    content = await response.text()
+                    if response_cache:
+                        response_cache.store(url, content.encode("utf-8"), response.headers)
+                    return content
+                else:
+                    logger.warning(f"[!] HTTP {response.status} hatası: {url}")
+                    return None
     except asyncio.TimeoutError:
         logger.error(f"[!] Timeout hatası ({timeout}s): {url}")
         return None
@@ -109,8 +159,18 @@ async def fetch_page(session, url, timeout=45):
         return None
 
 async def extract_gujan_m3u8(session, iframe_url, file_id):
-    """Gujan player'dan M3U8 URL'ini çıkarır"""
+    """Gujan player'dan M3U8 URL'ini çıkarır
+
+    Önce file_id'den kurulan adres doğrulanır; player sayfası yalnızca bu
+    adres doğrulanamazsa indirilir ve içindeki m3u8 aranır.
+    """
     try:
+        m3u8_url = build_gujan_url(file_id)
+        is_valid = await test_m3u8_url(session, m3u8_url)
+        speculation.record("gujan", is_valid)
+        if is_valid:
+            logger.info(f"[✅] Gujan M3U8 URL doğrulandı: {m3u8_url}")
+            return m3u8_url
         
         logger.info(f"[*] Gujan player sayfası getiriliyor: {iframe_url}")
         
@@ -123,134 +183,119 @@ async def extract_gujan_m3u8(session, iframe_url, file_id):
             logger.warning(f"[!] Gujan player sayfası alınamadı: {iframe_url}")
             return None
         
+        page_m3u8 = await parse_pool.run(extraction.gujan_stream, content, extraction.EXTRACTION_MODE)
+        if page_m3u8 and page_m3u8 != m3u8_url:
+            logger.info(f"[✅] Gujan player sayfasında M3U8 bulundu: {page_m3u8}")
+            return page_m3u8
         
-        m3u8_url = f"https://gujan.premiumvideo.click/hls/{file_id}_o/playlist.m3u8"
-        
-        
-        is_valid = await test_m3u8_url(session, m3u8_url)
-        if is_valid:
-            logger.info(f"[✅] Gujan M3U8 URL doğrulandı: {m3u8_url}")
-            return m3u8_url
-        else:
-            logger.warning(f"[⚠️] Gujan M3U8 URL doğrulanamadı: {m3u8_url}")
-            return m3u8_url  
+        logger.warning(f"[⚠️] Gujan M3U8 URL doğrulanamadı: {m3u8_url}")
+        return m3u8_url  
     
     except Exception as e:
         logger.error(f"[!] Gujan M3U8 çıkarma hatası: {e}")
         return None
 
-async def get_correct_domain_from_playhouse(session, file_id, timeout=15):
+async def get_correct_domain_from_playhouse(session, file_id, timeout=15, series_key=None):
     """Playhouse URL'ine istek atıp redirect edilen doğru domain'i bulur"""
+    cached = domain_resolver.lookup(file_id)
+    if cached:
+        return cached
+    
+    # Dizinin (ya da genelin) domain'i yeterince belliyse redirect atlanır;
+    # değilse spekülatif olarak en olası domain denenir
+    guessed_domain = domain_resolver.confident_domain(series_key)
+    speculative = False
+    if not guessed_domain and speculation.enabled("playhouse"):
+        guessed_domain = domain_resolver.ordered_domains(series_key)[0]
+        speculative = True
+    if guessed_domain:
+        m3u8_url = build_master_url(guessed_domain, file_id)
+        is_valid = await test_m3u8_url(session, m3u8_url)
+        if speculative:
+            speculation.record("playhouse", is_valid)
+        else:
+            domain_resolver.record_guess(is_valid)
+        if is_valid:
+            logger.info(f"[✅] Öğrenilen domain doğrulandı, redirect atlandı: {guessed_domain}")
+            domain_resolver.record(file_id, guessed_domain, m3u8_url, series_key)
+            return guessed_domain, m3u8_url
+    
     playhouse_url = f"https://playhouse.premiumvideo.click/player/{file_id}"
     
     try:
         logger.info(f"[*] Playhouse URL'ine redirect testi: {playhouse_url}")
+        domain_resolver.stats["redirect"] += 1
         
-        async with session.get(playhouse_url, 
-                              headers=HEADERS, 
-                              timeout=aiohttp.ClientTimeout(total=timeout),
-                              allow_redirects=True) as response:
+        async with host_limits.slot(playhouse_url) as slot:
+            async with session.get(playhouse_url,
+                                   headers=HEADERS,
+                                   timeout=aiohttp.ClientTimeout(total=slot.timeout(timeout)),
+                                   allow_redirects=True) as response:
+                slot.observe(response.status)
+                final_url = str(response.url)
+        logger.info(f"[*] Final redirect URL: {final_url}")
+        
+        
+        domain_match = re.search(r'https://([^.]+)\.premiumvideo\.click', final_url)
+        if domain_match:
+            domain = domain_match.group(1)
+            logger.info(f"[✅] Redirect edilen domain bulundu: {domain}")
             
-            final_url = str(response.url)
-            logger.info(f"[*] Final redirect URL: {final_url}")
             
-            domain_match = re.search(r'https://([^.]+)\.premiumvideo\.click', final_url)
-            if domain_match:
-                domain = domain_match.group(1)
-                logger.info(f"[✅] Redirect edilen domain bulundu: {domain}")
-                
-                m3u8_url = f"https://{domain}.premiumvideo.click/uploads/encode/{file_id}/master.m3u8"
-                
-                is_valid = await test_m3u8_url(session, m3u8_url)
-                if is_valid:
-                    logger.info(f"[✅] M3U8 URL doğrulandı: {m3u8_url}")
-                    return domain, m3u8_url
-                else:
-                    logger.warning(f"[⚠️] M3U8 URL doğrulanamadı ama domain bulundu: {domain}")
-                    return domain, m3u8_url
+            m3u8_url = build_master_url(domain, file_id)
+            domain_resolver.record(file_id, domain, m3u8_url, series_key)
+            
+            
+            is_valid = await test_m3u8_url(session, m3u8_url)
+            if is_valid:
+                logger.info(f"[✅] M3U8 URL doğrulandı: {m3u8_url}")
+                return domain, m3u8_url
             else:
-                logger.warning(f"[⚠️] Redirect URL'den domain çıkarılamadı: {final_url}")
-                logger.info(f"[*] Fallback: Eski domain test sistemi kullanılıyor")
-                return await find_working_domain_fallback(session, file_id)
-                
+                logger.warning(f"[⚠️] M3U8 URL doğrulanamadı ama domain bulundu: {domain}")
+                return domain, m3u8_url
+        else:
+            logger.warning(f"[⚠️] Redirect URL'den domain çıkarılamadı: {final_url}")
+            
+            
+            logger.info(f"[*] Fallback: Eski domain test sistemi kullanılıyor")
+            return await find_working_domain_fallback(session, file_id, series_key=series_key)
+            
     except asyncio.TimeoutError:
         logger.warning(f"[⚠️] Playhouse timeout, fallback sistem kullanılıyor")
-        return await find_working_domain_fallback(session, file_id)
+        return await find_working_domain_fallback(session, file_id, series_key=series_key)
     except Exception as e:
         logger.warning(f"[⚠️] Playhouse hatası: {e}, fallback sistem kullanılıyor")
-        return await find_working_domain_fallback(session, file_id)
+        return await find_working_domain_fallback(session, file_id, series_key=series_key)
 
-async def find_working_domain_fallback(session, file_id, domains=["d1", "d2", "d3", "d4"]):
-    """Fallback: Eski sistem ile çalışan domain bulma"""
-    logger.info(f"[*] Fallback domain testi başlıyor...")
+async def find_working_domain_fallback(session, file_id, domains=PREMIUMVIDEO_DOMAINS, series_key=None):
+    """Fallback: Tüm mirror'ları yarıştırır, ilk doğrulanan domain'i kullanır"""
+    logger.info(f"[*] Fallback domain yarışı başlıyor...")
+    domain_resolver.stats["fallback"] += 1
+    
+    candidates = domain_resolver.ordered_domains(series_key, domains)
+    domain = await race_domains(
+        lambda d: test_m3u8_url(session, build_master_url(d, file_id)),
+        candidates,
+        on_result=domain_resolver.record_probe,
+    )
+    
+    if domain:
+        m3u8_url = build_master_url(domain, file_id)
+        logger.info(f"[✅] Fallback domain çalışıyor: {domain}")
+        domain_resolver.record(file_id, domain, m3u8_url, series_key)
+        return domain, m3u8_url
     
-    for domain in domains:
-        m3u8_url = f"https://{domain}.premiumvideo.click/uploads/encode/{file_id}/master.m3u8"
-        
-        logger.info(f"[*] Fallback test: {domain}")
-        is_working = await test_m3u8_url(session, m3u8_url)
-        
-        if is_working:
-            logger.info(f"[✅] Fallback domain çalışıyor: {domain}")
-            return domain, m3u8_url
     
     logger.warning(f"[⚠️] Hiçbir domain çalışmıyor! Default d2 kullanılacak.")
-    return "d2", f"https://d2.premiumvideo.click/uploads/encode/{file_id}/master.m3u8"
+    return "d2", build_master_url("d2", file_id)
 
 async def test_m3u8_url(session, url, timeout=15):
-    """M3U8 URL test fonksiyonu"""
-    try:
-        async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout), allow_redirects=True) as response:
-            final_url = str(response.url)
-            content_type = response.headers.get("Content-Type", "").lower()
-            content_length = response.headers.get("Content-Length")
-            
-            if response.status != 200:
-                return False
-            
-            if "premiumvideo.click" not in final_url:
-                return False
-            
-            try:
-                content = await response.content.read(4096)
-                text = content.decode('utf-8', errors='ignore')
-                
-                if not text.strip().startswith("#EXTM3U"):
-                    return False
-                
-                suspicious_patterns = [
-                    r"<html", r"<body", r"<title", r"error", r"not found", 
-                    r"access denied", r"kerimkirac\.com", r"404", r"403", r"500"
-                ]
-                
-                for pattern in suspicious_patterns:
-                    if re.search(pattern, text, re.IGNORECASE):
-                        return False
-                
-                if content_length and int(content_length) < 50:
-                    return False
-                
-                return True
-                
-            except UnicodeDecodeError:
-                return False
-                
-    except asyncio.TimeoutError:
-        return False
-    except Exception as e:
-        return False
+    """m3u8 URL test fonksiyonu (premiumvideo.M3U8Validator: Range isteği + karar önbelleği)"""
+    return await m3u8_validator.validate(session, url, timeout)
 
-async def get_movies_from_page(session, page_num):
-    """Belirli bir sayfadan film listesini alır"""
-    filmler_url = f"{BASE_URL}/filmler?p={page_num}"
-    logger.info(f"Sayfa {page_num} alınıyor: {filmler_url}")
-    
-    content = await fetch_page(session, filmler_url)
-    if not content:
-        logger.warning(f"[!] Film sayfası {page_num} alınamadı.")
-        return [], False
-    
-    soup = BeautifulSoup(content, 'html.parser')
+def _parse_movie_listing(content, page_num):
+    """Film liste sayfasından film linklerini ve sonraki sayfa bağlantısı olup olmadığını çıkarır"""
+    soup = extraction.parse_links_page(content)
     
     
     movie_links = []
@@ -299,14 +344,30 @@ async def get_movies_from_page(session, page_num):
         if has_next_page:
             break
     
+    return movie_links, has_next_page
+
+def _has_movie_links(content):
+    """Sayfada film linki var mı (sonraki sayfa kontrolü)"""
+    return bool(extraction.parse_links_page(content).select("a[href*='/film/']"))
+
+async def get_movies_from_page(session, page_num):
+    """Belirli bir sayfadan film listesini alır"""
+    filmler_url = f"{BASE_URL}/filmler?p={page_num}"
+    logger.info(f"Sayfa {page_num} alınıyor: {filmler_url}")
+    
+    content = await fetch_page(session, filmler_url)
+    if not content:
+        logger.warning(f"[!] Film sayfası {page_num} alınamadı.")
+        return [], False
+    
+    movie_links, has_next_page = await parse_pool.run(_parse_movie_listing, content, page_num)
+    
     
     if not has_next_page and movie_links:
         next_page_url = f"{BASE_URL}/filmler?p={page_num + 1}"
         next_content = await fetch_page(session, next_page_url)
         if next_content:
-            next_soup = BeautifulSoup(next_content, 'html.parser')
-            next_links = next_soup.select("a[href*='/film/']")
-            if next_links:
+            if await parse_pool.run(_has_movie_links, next_content):
                 has_next_page = True
     
     logger.info(f"[+] Sayfa {page_num}: {len(movie_links)} film linki toplandı. Sonraki sayfa: {'Var' if has_next_page else 'Yok'}")
@@ -353,6 +414,10 @@ async def get_movie_metadata(session, movie_url):
     if not content:
         return "Bilinmeyen Film", ""
     
+    return await parse_pool.run(_parse_movie_metadata, content)
+
+def _parse_movie_metadata(content):
+    """Film sayfasından başlık ve logo"""
     soup = BeautifulSoup(content, 'html.parser')
     
     
@@ -370,129 +435,74 @@ async def get_movie_metadata(session, movie_url):
     return title, logo_url
 
 async def extract_m3u8_from_movie(session, movie_url):
-    """Film sayfasından m3u8 linkini çıkarır"""
+    """Film sayfasından m3u8 linkini çıkarır; çözülemeyen filmler failure_ledger'a göre ertelenir"""
     content = await fetch_page(session, movie_url)
     if not content:
         return None
     
-    soup = BeautifulSoup(content, 'html.parser')
+    candidates = await parse_pool.run(extraction.player_candidates, content, movie_url,
+                                      extraction.EXTRACTION_MODE)
+    fingerprint = candidates["fingerprint"]
+    if failure_ledger and failure_ledger.should_skip(movie_url, fingerprint):
+        return None
     
+    meter = [0, 0]
+    token = request_meter.set(meter)
+    try:
+        m3u8_url = await _resolve_movie_stream(session, movie_url, candidates)
+    finally:
+        request_meter.reset(token)
+    
+    if failure_ledger:
+        failure_ledger.record(movie_url, bool(m3u8_url), fingerprint, meter[0],
+                              None if m3u8_url else "Gujan / Playhouse / fallback sonuçsuz",
+                              transient=meter[1] > 0)
+    return m3u8_url
+
+async def _resolve_movie_stream(session, movie_url, candidates):
+    """Sayfa adaylarından proxy'li m3u8'i çıkarır (Gujan → Playhouse → fallback)"""
     logger.info(f"[*] Film işleniyor: {movie_url}")
     
     m3u8_url = None
     
     try:
         
-        gujan_iframe = soup.select_one('iframe[title="dizifunplay"]')
-        if gujan_iframe:
-            src = gujan_iframe.get("src")
-            if src and "gujan.premiumvideo.click/e/" in src:
+        for src in candidates["gujan_srcs"]:
+            gujan_match = re.search(r'gujan\.premiumvideo\.click/e/([a-zA-Z0-9]+)', src)
+            if gujan_match:
                 logger.info(f"[+] Gujan player iframe bulundu: {src}")
+                file_id = gujan_match.group(1)
+                logger.info(f"[+] Gujan File ID: {file_id}")
                 
                 
-                gujan_match = re.search(r'gujan\.premiumvideo\.click/e/([a-zA-Z0-9]+)', src)
-                if gujan_match:
-                    file_id = gujan_match.group(1)
-                    logger.info(f"[+] Gujan File ID: {file_id}")
-                    
-                    
-                    m3u8_url = await extract_gujan_m3u8(session, src, file_id)
-                    if m3u8_url:
-                        logger.info(f"[✅] Gujan M3U8 bulundu: {m3u8_url}")
-                        return create_proxy_url(m3u8_url)
+                m3u8_url = await extract_gujan_m3u8(session, src, file_id)
+                if m3u8_url:
+                    logger.info(f"[✅] Gujan M3U8 bulundu: {m3u8_url}")
+                    return create_proxy_url(m3u8_url)
+                break
         
         
-        if not m3u8_url:
-            iframe_selectors = [
-                'iframe[title="playhouse"]',
-                'iframe[src*="playhouse.premiumvideo.click"]',
-                'iframe[src*="premiumvideo.click/player"]'
-            ]
-            
-            playhouse_url = None
-            file_id = None
-            
-            
-            for selector in iframe_selectors:
-                iframe_element = soup.select_one(selector)
-                if iframe_element:
-                    src = iframe_element.get("src")
-                    if src and "playhouse.premiumvideo.click" in src:
-                        if src.startswith("//"):
-                            src = "https:" + src
-                        playhouse_url = src
-                        logger.info(f"[+] Playhouse iframe bulundu: {playhouse_url}")
-                        break
-            
-            
-            if not playhouse_url:
-                scripts = soup.find_all('script')
-                for script in scripts:
-                    script_content = script.get_text() or ""
-                    
-                    hex_pattern = re.compile(r'hexToString\w*\("([a-fA-F0-9]+)"\)')
-                    hex_matches = hex_pattern.findall(script_content)
-                    
-                    if hex_matches:
-                        logger.info(f"[+] Script içinde {len(hex_matches)} hex URL bulundu.")
-                        for hex_value in hex_matches:
-                            try:
-                                decoded_url = bytes.fromhex(hex_value).decode('utf-8')
-                                if decoded_url and "playhouse.premiumvideo.click" in decoded_url:
-                                    playhouse_url = decoded_url
-                                    if playhouse_url.startswith("//"):
-                                        playhouse_url = "https:" + playhouse_url
-                                    logger.info(f"[+] Hex'ten çözülen playhouse URL: {playhouse_url}")
-                                    break
-                            except Exception as e:
-                                logger.error(f"[!] Hex çözme hatası: {e}")
-                        
-                        if playhouse_url:
-                            break
-            
-            
-            if playhouse_url:
-                playhouse_match = re.search(r'playhouse\.premiumvideo\.click/player/([a-zA-Z0-9]+)', playhouse_url)
-                if playhouse_match:
-                    file_id = playhouse_match.group(1)
-                    logger.info(f"[+] Playhouse File ID bulundu: {file_id}")
-                    
-                    
-                    working_domain, m3u8_url = await get_correct_domain_from_playhouse(session, file_id)
-                    logger.info(f"[+] Bulunan domain: {working_domain}, M3U8: {m3u8_url}")
+        playhouse_url = candidates["playhouse_url"]
+        if not m3u8_url and playhouse_url:
+            logger.info(f"[+] Playhouse URL bulundu: {playhouse_url}")
+            playhouse_match = re.search(r'playhouse\.premiumvideo\.click/player/([a-zA-Z0-9]+)', playhouse_url)
+            if playhouse_match:
+                file_id = playhouse_match.group(1)
+                logger.info(f"[+] Playhouse File ID bulundu: {file_id}")
+                
+                
+                working_domain, m3u8_url = await get_correct_domain_from_playhouse(session, file_id)
+                logger.info(f"[+] Bulunan domain: {working_domain}, M3U8: {m3u8_url}")
         
         # 3. FALLBACK KONTROLÜ
-        if not m3u8_url:
+        if not m3u8_url and candidates["fallback"]:
             logger.info("[*] Playhouse ve Gujan bulunamadı, fallback sistem ile deneniyor...")
+            iframe_url, file_id = candidates["fallback"]
+            logger.info(f"[+] Fallback iframe URL: {iframe_url}")
+            logger.info(f"[+] Fallback File ID: {file_id}")
             
-            iframe_selectors_fallback = [
-                "iframe#londonIframe",
-                "iframe[src*=premiumvideo]",
-                "iframe[data-src*=premiumvideo]",
-                "iframe[src*=player]",
-                "iframe"
-            ]
             
-            for selector in iframe_selectors_fallback:
-                iframe_element = soup.select_one(selector)
-                if iframe_element:
-                    src = iframe_element.get("src")
-                    if not src or src == "about:blank":
-                        src = iframe_element.get("data-src")
-                    
-                    if src and src != "about:blank":
-                        iframe_url = fix_url(src)
-                        logger.info(f"[+] Fallback iframe URL: {iframe_url}")
-                        
-                        
-                        premium_video_match = re.search(r'premiumvideo\.click/player\.php\?file_id=([a-zA-Z0-9]+)', iframe_url)
-                        if premium_video_match:
-                            file_id = premium_video_match.group(1)
-                            logger.info(f"[+] Fallback File ID: {file_id}")
-                            
-                            
-                            working_domain, m3u8_url = await find_working_domain_fallback(session, file_id)
-                            break
+            working_domain, m3u8_url = await find_working_domain_fallback(session, file_id)
     
     except Exception as e:
         logger.error(f"[!] Film işleme genel hatası: {e}")
@@ -503,83 +513,159 @@ async def extract_m3u8_from_movie(session, movie_url):
     
     return None
 
+async def resolve_movie(session, movie_url):
+    """Filmin başlık, logo ve proxy'li m3u8 bilgisini döndürür; bulunamazsa None"""
+    try:
+        
+        title, logo_url = await get_movie_metadata(session, movie_url)
+        logger.info(f"\n[+] İşleniyor: {title}")
+        
+        
+        m3u8_url = await extract_m3u8_from_movie(session, movie_url)
+        
+        if m3u8_url:
+            tvg_id = sanitize_id(title)
+            
+            return {
+                'title': title,
+                'logo_url': logo_url,
+                'tvg_id': tvg_id,
+                'm3u8_url': m3u8_url
+            }
+        else:
+            logger.warning(f"[!] m3u8 URL bulunamadı: {title}")
+            return None
+    
+    except Exception as e:
+        logger.error(f"[!] Film işleme hatası ({movie_url}): {e}")
+        return None
+
+def write_movie_entry(f, result):
+    """Çözülmüş bir filmi M3U dosyasına yazar"""
+    f.write(
+        f'#EXTINF:-1 tvg-name="{result["title"]}" '
+        f'tvg-language="Turkish" tvg-country="TR" '
+        f'tvg-id="{result["tvg_id"]}" '
+        f'tvg-logo="{result["logo_url"]}" '
+        f'group-title="Filmler",{result["title"]}\n'
+    )
+    f.write(result["m3u8_url"].strip() + "\n")
+    logger.info(f"[✓] {result['title']} eklendi.")
+
 async def process_movies(all_movie_links, output_filename="filmler.m3u"):
-    """Tüm filmleri tek bir dosyaya yazar"""
-    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=10)) as session:
-        with open(output_filename, "w", encoding="utf-8") as f:
+    """Tüm filmleri tek bir dosyaya, sınırlı bir üretici / tüketici hattıyla yazar
+
+    Üretici film URL'lerini sınırlı kuyruğa koyar, MOVIE_WORKERS işçi çözer,
+    yazıcı sonuçları liste sırasıyla dosyaya ekler. Yazıcının önündeki film
+    sayısı MOVIE_WINDOW ile sınırlı olduğundan bellek katalog boyutuyla
+    büyümez; ilk girdiler ilk filmler çözülür çözülmez <çıktı>.partial
+    dosyasında görünür. Bu dosya yalnızca çalışma tamamlanınca os.replace ile
+    çıktının yerine konur; yarıda kesilen bir çalışma eski listeyi bozmaz.
+    """
+    partial_filename = output_filename + ".partial"
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=CONNECTION_LIMIT)) as session:
+        with open(partial_filename, "w", encoding="utf-8") as f:
             f.write("#EXTM3U\n")
+            f.flush()
             
+            queue = asyncio.Queue(maxsize=MOVIE_QUEUE_SIZE)
+            results = asyncio.Queue()
+            # Yazılmamış (kuyrukta, çözülmekte ya da sıra bekleyen) film sayısını sınırlar
+            window = asyncio.Semaphore(MOVIE_WINDOW)
             
-            semaphore = asyncio.Semaphore(5)
-            
-            async def process_single_movie(movie_url):
-                async with semaphore:
-                    try:
-                        
-                        title, logo_url = await get_movie_metadata(session, movie_url)
-                        logger.info(f"\n[+] İşleniyor: {title}")
-                        
-                        
-                        m3u8_url = await extract_m3u8_from_movie(session, movie_url)
-                        
-                        if m3u8_url:
-                            tvg_id = sanitize_id(title)
-                            
-                            return {
-                                'title': title,
-                                'logo_url': logo_url,
-                                'tvg_id': tvg_id,
-                                'm3u8_url': m3u8_url
-                            }
-                        else:
-                            logger.warning(f"[!] m3u8 URL bulunamadı: {title}")
-                            return None
-                    
-                    except Exception as e:
-                        logger.error(f"[!] Film işleme hatası ({movie_url}): {e}")
-                        return None
+            async def produce():
+                for index, movie_url in enumerate(all_movie_links):
+                    await window.acquire()
+                    await queue.put((index, movie_url))
+                for _ in range(MOVIE_WORKERS):
+                    await queue.put(None)
             
+            async def consume():
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        return
+                    index, movie_url = item
+                    await results.put((index, await resolve_movie(session, movie_url)))
             
-            tasks = [process_single_movie(movie_url) for movie_url in all_movie_links]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            async def write():
+                buffered = {}
+                next_index = 0
+                written = 0
+                while next_index < len(all_movie_links):
+                    index, result = await results.get()
+                    buffered[index] = result
+                    # Sıradaki film gelene kadar sonrakiler bekletilir (kararlı sıra)
+                    while next_index in buffered:
+                        result = buffered.pop(next_index)
+                        next_index += 1
+                        window.release()
+                        if result is not None:
+                            write_movie_entry(f, result)
+                            f.flush()
+                            written += 1
+                return written
             
-            
-            successful_count = 0
-            for result in results:
-                if isinstance(result, Exception):
-                    logger.error(f"[!] Task hatası: {result}")
-                    continue
-                
-                if result is None:
-                    continue
-                
-                f.write(
-                    f'#EXTINF:-1 tvg-name="{result["title"]}" '
-                    f'tvg-language="Turkish" tvg-country="TR" '
-                    f'tvg-id="{result["tvg_id"]}" '
-                    f'tvg-logo="{result["logo_url"]}" '
-                    f'group-title="Filmler",{result["title"]}\n'
-                )
-                f.write(result["m3u8_url"].strip() + "\n")
-                logger.info(f"[✓] {result['title']} eklendi.")
-                successful_count += 1
+            tasks = [asyncio.ensure_future(produce()), asyncio.ensure_future(write())]
+            tasks += [asyncio.ensure_future(consume()) for _ in range(MOVIE_WORKERS)]
+            try:
+                successful_count = (await asyncio.gather(*tasks))[1]
+            finally:
+                for task in tasks:
+                    task.cancel()
 
             logger.info(f"\n[✓] {successful_count} film başarıyla eklendi.")
+            f.flush()
+            os.fsync(f.fileno())
 
+    os.replace(partial_filename, output_filename)
     logger.info(f"\n[✓] {output_filename} dosyası oluşturuldu.")
 
 
 async def main():
+    global response_cache, m3u8_validator, failure_ledger
     start_time = time.time()
     
+    if "--full-parse" in sys.argv:
+        extraction.EXTRACTION_MODE = "full"
+    if "--incremental" in sys.argv:
+        failure_ledger = FailureLedger()
+    if "--cache" in sys.argv:
+        response_cache = HttpCache()
+        m3u8_validator = M3U8Validator(DEFAULT_VALIDATION_PATH, limits=host_limits)
     
-    movie_urls = await get_movies_from_homepage()
-    if not movie_urls:
-        logger.error("[!] Film listesi boş, seçicileri kontrol et.")
-        return
-
     
-    await process_movies(movie_urls)
+    if "--inline-parse" not in sys.argv:
+        parse_pool.start()
+    lag_monitor = LoopLagMonitor()
+    lag_monitor.start()
+    
+    try:
+        movie_urls = await get_movies_from_homepage()
+        if not movie_urls:
+            logger.error("[!] Film listesi boş, seçicileri kontrol et.")
+            return
+        
+        await process_movies(movie_urls)
+    finally:
+        await lag_monitor.stop()
+        parse_pool.close()
+    
+    lag_monitor.report("inline ayrıştırma, " if "--inline-parse" in sys.argv else "havuzlu ayrıştırma, ")
+
+    domain_resolver.report()
+    m3u8_validator.report()
+    m3u8_validator.close()
+    page_flight.report()
+    speculation.report()
+    host_limits.report()
+    extraction.report()
+    if response_cache:
+        response_cache.report()
+        response_cache.close()
+    if failure_ledger:
+        failure_ledger.report()
+        failure_ledger.close()
 
     end_time = time.time()
     logger.info(f"\n[✓] Tüm işlemler tamamlandı. Süre: {end_time - start_time:.2f} saniye")
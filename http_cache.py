@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Kalıcı HTTP yanıt önbelleği (SQLite + zlib)
+
+- Gövdeler sıkıştırılmış olarak ETag / Last-Modified ile birlikte saklanır.
+- Süresi dolan kayıtlar If-None-Match / If-Modified-Since ile yeniden
+  doğrulanır; 304 gelirse gövde diskten döner.
+- TTL'ler URL desenine göre verilir (None = değişmez, hiç yeniden doğrulanmaz).
+- Yazımlar COMMIT_EVERY kayıtta bir (ve close()'da) diske işlenir; event
+  loop'ta yanıt başına senkron commit yapılmaz.
+- Çalışma sonunda hit / miss / revalidated sayıları ve tasarruf edilen bayt loglanır.
+
+aiohttp tarafında dizi.fetch_page / filmler.fetch_page, requests tarafında
+cached_get() bu önbelleği kullanabilir.
+
+SingleFlight: aynı URL için eşzamanlı istekleri tek istekte birleştirir ve
+son gövdeleri çalışma boyunca küçük, sınırlı bir bellek içi LRU'da tutar
+(ör. dizi sayfası hem meta veri hem bölüm listesi için okunur).
+"""
+
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+import time
+import zlib
+from collections import Counter, OrderedDict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_CACHE_PATH = BASE_DIR / ".cache" / "http_cache.sqlite3"
+
+# (desen, TTL saniye) — ilk eşleşen kural geçerlidir; None = değişmez
+DEFAULT_TTL_RULES = [
+    (r"[?&](bolum|episode)[=-]?\d", None),       # dizifun bölüm sayfaları
+    (r"gujan\.premiumvideo\.click/e/", None),     # Gujan iframe sayfaları
+    (r"/film/", 24 * 3600),
+    (r"\?p=\d+", 0),                              # liste sayfaları
+]
+DEFAULT_TTL = 0
+DEFAULT_LRU_SIZE = 128
+# Bu kadar yazımda bir commit (M3U8Validator'daki 100 denemede bir commit gibi)
+COMMIT_EVERY = 100
+
+
+class CacheEntry:
+    """Önbellekteki tek bir yanıt"""
+
+    def __init__(self, body, etag, last_modified, stored_at, fresh):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+        self.fresh = fresh
+
+    @property
+    def text(self):
+        return self.body.decode("utf-8", errors="replace")
+
+    def conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """URL anahtarlı kalıcı yanıt önbelleği"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl_rules=None, default_ttl=DEFAULT_TTL):
+        self.path = str(path)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.ttl_rules = [(re.compile(p), ttl) for p, ttl in (ttl_rules or DEFAULT_TTL_RULES)]
+        self.default_ttl = default_ttl
+        self.db = sqlite3.connect(self.path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " url TEXT PRIMARY KEY, body BLOB NOT NULL, etag TEXT,"
+            " last_modified TEXT, stored_at REAL NOT NULL)"
+        )
+        self.db.commit()
+        self.unsaved = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.bytes_saved = 0
+
+    def ttl_for(self, url):
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+
+    def lookup(self, url):
+        """Kaydı döndürür; taze ise hit sayılır, bayatsa çağıran yeniden doğrulamalı"""
+        row = self.db.execute(
+            "SELECT body, etag, last_modified, stored_at FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+        if not row:
+            return None
+        body, etag, last_modified, stored_at = row
+        ttl = self.ttl_for(url)
+        fresh = ttl is None or (ttl > 0 and time.time() - stored_at < ttl)
+        entry = CacheEntry(zlib.decompress(body), etag, last_modified, stored_at, fresh)
+        if fresh:
+            self.hits += 1
+            self.bytes_saved += len(entry.body)
+        return entry
+
+    def record_not_modified(self, url, entry):
+        """304 yanıtından sonra kaydın zamanını yeniler"""
+        self.revalidated += 1
+        self.bytes_saved += len(entry.body)
+        self.db.execute("UPDATE responses SET stored_at = ? WHERE url = ?", (time.time(), url))
+        self._written()
+
+    def store(self, url, body, headers):
+        """Ağdan tam gövdeyle gelen yanıtı kaydeder (doğrulayıcı ya da TTL yoksa saklamaz)"""
+        self.misses += 1
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not (etag or last_modified or self.ttl_for(url) != 0):
+            return
+        self.db.execute(
+            "INSERT OR REPLACE INTO responses (url, body, etag, last_modified, stored_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (url, zlib.compress(body), etag, last_modified, time.time()),
+        )
+        self._written()
+
+    def _written(self):
+        self.unsaved += 1
+        if self.unsaved >= COMMIT_EVERY:
+            self.db.commit()
+            self.unsaved = 0
+
+    def report(self):
+        logger.info(
+            f"[CACHE] hit: {self.hits}, miss: {self.misses}, revalidated: {self.revalidated}, "
+            f"tasarruf: {self.bytes_saved / 1024:.1f} KB"
+        )
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+
+class SingleFlight:
+    """URL başına tek uçuştaki istek + sınırlı LRU gövde önbelleği"""
+
+    def __init__(self, maxsize=DEFAULT_LRU_SIZE):
+        self.maxsize = maxsize
+        self.recent = OrderedDict()
+        self.pending = {}
+        self.stats = Counter()
+
+    async def fetch(self, url, loader):
+        """loader() coroutine'ini URL başına bir kez çalıştırır; None sonuçlar saklanmaz"""
+        if url in self.recent:
+            self.recent.move_to_end(url)
+            self.stats["lru"] += 1
+            return self.recent[url]
+
+        pending = self.pending.get(url)
+        if pending is not None:
+            self.stats["birleştirilen"] += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # Asıl istek iptal edildi, yeniden dene
+                return await self.fetch(url, loader)
+
+        future = asyncio.get_running_loop().create_future()
+        self.pending[url] = future
+        try:
+            result = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception:
+            future.set_result(None)
+            raise
+        finally:
+            del self.pending[url]
+
+        self.stats["istek"] += 1
+        if result is not None:
+            self.recent[url] = result
+            if len(self.recent) > self.maxsize:
+                self.recent.popitem(last=False)
+        future.set_result(result)
+        return result
+
+    def forget(self, url):
+        """URL'nin LRU'daki gövdesini bırakır; sonraki fetch yeniden yükler"""
+        self.recent.pop(url, None)
+
+    def report(self):
+        avoided = self.stats["lru"] + self.stats["birleştirilen"]
+        logger.info(
+            f"[FETCH] istek: {self.stats['istek']}, önlenen yinelenen: {avoided} "
+            f"(LRU: {self.stats['lru']}, birleştirilen: {self.stats['birleştirilen']})"
+        )
+
+
+def cached_get(session, url, cache, **kwargs):
+    """requests.Session.get'in önbellekli karşılığı; yanıt gövdesini (bytes) döndürür"""
+    entry = cache.lookup(url) if cache else None
+    if entry is not None and entry.fresh:
+        return entry.body
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    if entry is not None:
+        headers.update(entry.conditional_headers())
+
+    r = session.get(url, headers=headers, **kwargs)
+    if r.status_code == 304 and entry is not None:
+        cache.record_not_modified(url, entry)
+        return entry.body
+    r.raise_for_status()
+    if cache:
+        cache.store(url, r.content, r.headers)
+    return r.content
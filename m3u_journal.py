@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Çökmeye dayanıklı M3U yazımı
+
+SeriesJournal: tamamlanan her dizinin çözüm sonucu (başlık, logo, proxy'siz
+bölüm akışları) bir kontrol noktası günlüğüne (JSON satırları) eklenir ve
+diske fsync edilir. İş yarıda kesilirse (CI süre sınırı, OOM, ağ kopması)
+--resume ile başlatılan bir sonraki çalışma günlükteki dizileri yeniden
+çözmez; hiç bölümü çözülemeyen ya da hata veren diziler günlüğe girmez ve
+yeniden denenir.
+
+atomic_write: .m3u dosyası önce geçici dosyaya yazılır, sonra os.replace ile
+yerine konur; yarım kalmış bir çıktı hiçbir zaman görünmez.
+
+read_playlist_groups: önceki .m3u'yu group-title (dizi başlığı) bazında
+okur; süre sınırıyla kesilen bir çalışmada ertelenen dizilerin eski
+girdileri buradan korunur.
+
+read_series_index / write_series_index: dizi URL'si → (yazılan başlık, girdi
+sayısı, son çözüm zamanı) dizini. Önceki .m3u yalnızca başlık taşıdığından
+ertelenen bir dizinin eski grubu bu dizinle URL'den bulunur; dizin ayrıca
+süre sınırlı çalışmada yeni dizileri ve uzun süredir çözülmeyenleri öne
+almak için kullanılır (stream_store / recrawl_schedule gerekmez).
+"""
+
+import json
+import logging
+import os
+import re
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_JOURNAL_DIR = BASE_DIR / ".cache" / "journal"
+
+_GROUP_RE = re.compile(r'group-title="([^"]*)"')
+
+
+def journal_path_for(output_path, journal_dir=DEFAULT_JOURNAL_DIR):
+    """Çıktı dosyası için günlük yolu (ör. m3u/Netflix.m3u → .cache/journal/Netflix.m3u.journal)"""
+    return Path(journal_dir) / (Path(output_path).name + ".journal")
+
+
+class SeriesJournal:
+    """Dizi URL'si → (başlık, logo, bölümler) kontrol noktası günlüğü"""
+
+    def __init__(self, path, resume=False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.done = self._load() if resume else {}
+        self.resumed = len(self.done)
+        if self.resumed:
+            logger.info(f"[JOURNAL] {self.resumed} dizi önceki çalışmadan devralındı: {self.path}")
+        self.file = open(self.path, "a" if resume else "w", encoding="utf-8")
+
+    def _load(self):
+        done = {}
+        if not self.path.exists():
+            return done
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Kesinti anında yarım yazılmış son satır
+                    continue
+                done[record["series_url"]] = (
+                    record["title"], record["logo_url"], [tuple(e) for e in record["entries"]]
+                )
+        return done
+
+    def __contains__(self, series_url):
+        return series_url in self.done
+
+    def get(self, series_url):
+        return self.done.get(series_url)
+
+    def record(self, series_url, result):
+        """Tamamlanan diziyi günlüğe ekler ve diske yazılmasını bekler
+
+        Hiç bölümü çözülemeyen diziler (boş ya da None sonuç) kaydedilmez;
+        --resume bunları yeniden dener.
+        """
+        if not result or not result[2]:
+            return
+        title, logo_url, entries = result
+        self.file.write(json.dumps({
+            "series_url": series_url, "title": title, "logo_url": logo_url,
+            "entries": [list(e) for e in entries],
+        }, ensure_ascii=False) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.done[series_url] = result
+
+    def close(self, completed=False):
+        """Günlüğü kapatır; çıktı başarıyla oluşturulduysa siler"""
+        self.file.close()
+        if completed:
+            self.path.unlink(missing_ok=True)
+
+
+def atomic_write(output_path, write):
+    """write(f) ile geçici dosyaya yazar, ardından hedefin yerine atomik olarak koyar"""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, output_path)
+
+
+def read_series_index(path):
+    """Dizi URL'si → {"title", "entries", "resolved_at"}; dosya yoksa ya da bozuksa boş"""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except ValueError:
+        logger.warning(f"[JOURNAL] Dizi dizini okunamadı, yok sayılıyor: {path}")
+        return {}
+
+
+def write_series_index(path, index):
+    atomic_write(path, lambda f: json.dump(index, f, ensure_ascii=False, indent=0))
+
+
+def read_playlist_groups(path):
+    """Önceki .m3u'daki girdileri group-title'a göre (dosya sırasıyla) döndürür: başlık → satırlar"""
+    groups = {}
+    path = Path(path)
+    if not path.exists():
+        return groups
+    with open(path, encoding="utf-8") as f:
+        lines = [line.rstrip("\n") for line in f]
+    for i, line in enumerate(lines):
+        if not line.startswith("#EXTINF") or i + 1 >= len(lines):
+            continue
+        match = _GROUP_RE.search(line)
+        if match:
+            groups.setdefault(match.group(1), []).extend((line, lines[i + 1]))
+    return groups
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+HTML ayrıştırmayı event loop dışına taşıma ve loop gecikmesi ölçümü
+
+ParsePool: saf ayrıştırma fonksiyonlarını (HTML metni → küçük sonuç)
+ProcessPoolExecutor'da çalıştırır; loop'a yalnızca çıkarılan linkler /
+adaylar döner. Havuz başlatılmadıysa (--inline-parse) fonksiyon eskisi gibi
+loop içinde çalışır.
+
+extraction.stats sayaçları (hızlı / tam / ıska) işçi işlemlerde artar; her
+iş sonucuyla birlikte o işin sayaç farkı döner ve ana işlemdeki sayaca
+eklenir, böylece havuzlu çalışmanın ayrıştırma raporu da gerçek kalır.
+
+LoopLagMonitor: loop'ta kısa aralıklarla uyuyan bir görev, uyanmasının ne
+kadar geciktiğini ölçer; ayrıştırma loop'u bloklarsa bu gecikme büyür.
+Havuzlu ve --inline-parse çalışmaların raporları karşılaştırılabilir.
+"""
+
+import asyncio
+import logging
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import extraction
+
+logger = logging.getLogger(__name__)
+
+LAG_INTERVAL = 0.05
+# Bu süreden uzun gecikmeler "takılma" sayılır (sn)
+STALL_THRESHOLD = 0.1
+
+
+class ParsePool:
+    """Ayrıştırma işlerini işlem havuzuna (ya da havuz yoksa loop içine) gönderir"""
+
+    def __init__(self):
+        self.executor = None
+        self.jobs = 0
+
+    def start(self, workers=None):
+        workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        logger.info(f"[PARSE] Ayrıştırma {workers} işlemli havuzda çalışacak")
+
+    async def run(self, func, *args):
+        self.jobs += 1
+        if self.executor is None:
+            return func(*args)
+        result, counts = await asyncio.get_running_loop().run_in_executor(
+            self.executor, _counted, func, *args)
+        extraction.stats.update(counts)
+        return result
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+def _counted(func, *args):
+    """İşçi işlemde çalışır: sonuç ve bu işin extraction.stats farkı"""
+    before = Counter(extraction.stats)
+    result = func(*args)
+    return result, extraction.stats - before
+
+
+class LoopLagMonitor:
+    """Event loop gecikmesini örnekler"""
+
+    def __init__(self, interval=LAG_INTERVAL):
+        self.interval = interval
+        self.samples = []
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - start - self.interval))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def report(self, label=""):
+        if not self.samples:
+            return
+        ordered = sorted(self.samples)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        stalls = sum(1 for s in ordered if s >= STALL_THRESHOLD)
+        logger.info(
+            f"[LOOP] {label}gecikme ort: {sum(ordered) / len(ordered) * 1000:.1f} ms, "
+            f"p99: {p99 * 1000:.1f} ms, en fazla: {ordered[-1] * 1000:.1f} ms, "
+            f">{STALL_THRESHOLD * 1000:.0f} ms takılma: {stalls}/{len(ordered)}"
+        )
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+premiumvideo.click ortak yardımcıları
+
+DomainResolver: file_id → dN.premiumvideo.click eşlemesini çalışma boyunca
+önbelleğe alır ve hangi dN sunucusunun kullanıldığını dizi bazında ve genel
+olarak öğrenir. Bir dizinin bölümleri pratikte aynı sunucuda durduğundan,
+güven yeterince yüksekse Playhouse redirect'i atlanıp doğrudan tahmin edilen
+domain denenir.
+
+race_domains: aday mirror'ları aynı anda (isteğe bağlı kademeli) dener, ilk
+doğrulananı döndürür ve diğerlerini iptal eder; ölçülen gecikmeler
+DomainResolver'a yazılarak sonraki denemelerin sırası güncellenir.
+
+M3U8Validator: m3u8 adaylarını Range isteğiyle (ilk 4 KB) tek geçişte
+doğrular; kararları çalışma içinde ve (yol verilirse) çalışmalar arasında
+TTL ile önbelleğe alır, aynı URL için eşzamanlı denemeleri birleştirir;
+limits (adaptive_limit.HostLimits) verilirse istekler host penceresinden geçer.
+
+Speculation: file_id'den kurulan akış adresinin (Gujan hls, tahmin edilen
+dN domain'i) iframe / redirect isteği atılmadan doğrudan doğrulanması;
+tür başına kazanma oranını tutar, oran düşerse spekülatif yolu seyrekleştirir.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_VALIDATION_PATH = BASE_DIR / ".cache" / "m3u8_validation.sqlite3"
+
+PREMIUMVIDEO_DOMAINS = ("d1", "d2", "d3", "d4")
+
+# Redirect'i atlamak için gereken gözlem sayısı ve en sık domain'in payı
+SERIES_MIN_SAMPLES = 3
+SERIES_MIN_SHARE = 0.8
+GLOBAL_MIN_SAMPLES = 20
+GLOBAL_MIN_SHARE = 0.9
+
+# Yarışta sıradaki mirror'ın başlatılmadan önce beklediği süre (sn)
+RACE_STAGGER = 0.25
+# Gecikme ortalaması (EWMA) ağırlığı ve başarısız denemenin ceza süresi (sn)
+LATENCY_ALPHA = 0.3
+FAILURE_PENALTY = 15.0
+
+# Spekülatif yol: karar için gereken deneme sayısı, yolu açık tutan en düşük
+# kazanma oranı ve oran düşükken yine de kaç fırsatta bir deneneceği
+SPECULATION_MIN_SAMPLES = 10
+SPECULATION_MIN_WIN_RATE = 0.5
+SPECULATION_PROBE_EVERY = 20
+
+# Doğrulama: okunan bayt, karar ömürleri (sn) ve tek geçişte aranan şüpheli içerik
+VALIDATION_READ_BYTES = 4096
+VALID_VERDICT_TTL = 6 * 3600
+INVALID_VERDICT_TTL = 30 * 60
+SUSPICIOUS_CONTENT = re.compile(
+    r"<html|<body|<title|error|not found|access denied|kerimkirac\.com|404|403|500",
+    re.IGNORECASE,
+)
+
+
+def build_master_url(domain, file_id):
+    return f"https://{domain}.premiumvideo.click/uploads/encode/{file_id}/master.m3u8"
+
+
+def build_gujan_url(file_id):
+    return f"https://gujan.premiumvideo.click/hls/{file_id}_o/playlist.m3u8"
+
+
+def series_key_from_url(url):
+    """Bölüm URL'sinden dizi anahtarını çıkarır (sorgu kısmı atılır)"""
+    return url.split("?", 1)[0] if url else None
+
+
+class DomainResolver:
+    """file_id önbelleği + dizi / genel domain yakınlığı"""
+
+    def __init__(self):
+        self.by_file_id = {}
+        self.series_counts = defaultdict(Counter)
+        self.global_counts = Counter()
+        self.latency = {}
+        self.stats = Counter()
+
+    def lookup(self, file_id):
+        """Bu çalışmada daha önce çözülmüş file_id için (domain, m3u8) döndürür"""
+        result = self.by_file_id.get(file_id)
+        if result:
+            self.stats["file_id_hit"] += 1
+        return result
+
+    def confident_domain(self, series_key=None):
+        """Redirect'siz denenecek kadar emin olunan domain (yoksa None)"""
+        counts = self.series_counts.get(series_key) if series_key else None
+        if counts:
+            domain, n = counts.most_common(1)[0]
+            total = sum(counts.values())
+            if total >= SERIES_MIN_SAMPLES and n / total >= SERIES_MIN_SHARE:
+                return domain
+        if self.global_counts:
+            domain, n = self.global_counts.most_common(1)[0]
+            total = sum(self.global_counts.values())
+            if total >= GLOBAL_MIN_SAMPLES and n / total >= GLOBAL_MIN_SHARE:
+                return domain
+        return None
+
+    def ordered_domains(self, series_key=None, domains=PREMIUMVIDEO_DOMAINS):
+        """Domain'leri önce dizi, sonra genel sıklığa, eşitlikte ölçülen gecikmeye göre sıralar"""
+        series_counts = self.series_counts.get(series_key, Counter()) if series_key else Counter()
+        return sorted(domains, key=lambda d: (-series_counts[d], -self.global_counts[d],
+                                              self.latency.get(d, float("inf"))))
+
+    def record_probe(self, domain, success, seconds):
+        """Bir mirror denemesinin süresini gecikme ortalamasına işler"""
+        sample = seconds if success else seconds + FAILURE_PENALTY
+        previous = self.latency.get(domain)
+        self.latency[domain] = sample if previous is None else (
+            LATENCY_ALPHA * sample + (1 - LATENCY_ALPHA) * previous)
+
+    def record(self, file_id, domain, m3u8_url, series_key=None):
+        self.by_file_id[file_id] = (domain, m3u8_url)
+        self.global_counts[domain] += 1
+        if series_key:
+            self.series_counts[series_key][domain] += 1
+
+    def record_guess(self, success):
+        self.stats["tahmin_isabet" if success else "tahmin_iska"] += 1
+
+    def report(self):
+        guesses = self.stats["tahmin_isabet"] + self.stats["tahmin_iska"]
+        hit_rate = self.stats["tahmin_isabet"] / guesses * 100 if guesses else 0.0
+        logger.info(
+            f"[DOMAIN] file_id önbellek: {self.stats['file_id_hit']}, "
+            f"redirect atlandı: {self.stats['tahmin_isabet']}/{guesses} (%{hit_rate:.1f}), "
+            f"redirect: {self.stats['redirect']}, fallback: {self.stats['fallback']}, "
+            f"dağılım: {dict(self.global_counts)}, "
+            f"gecikme: {', '.join(f'{d}={t:.2f}s' for d, t in sorted(self.latency.items()))}"
+        )
+
+
+async def race_domains(probe, domains, stagger=RACE_STAGGER, on_result=None):
+    """Domain'leri kademeli olarak aynı anda dener; ilk doğrulanan kazanır, kalanlar iptal edilir
+
+    probe(domain) -> bool döndüren bir coroutine olmalı; on_result(domain, success, seconds)
+    her tamamlanan deneme için çağrılır.
+    """
+    loop = asyncio.get_running_loop()
+
+    async def attempt(index, domain):
+        if stagger and index:
+            await asyncio.sleep(index * stagger)
+        start = loop.time()
+        success = await probe(domain)
+        if on_result:
+            on_result(domain, success, loop.time() - start)
+        return domain if success else None
+
+    tasks = [asyncio.ensure_future(attempt(i, d)) for i, d in enumerate(domains)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            domain = await next_done
+            if domain:
+                return domain
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+class Speculation:
+    """Tür (gujan / playhouse) → spekülatif deneme / kazanma sayıları"""
+
+    def __init__(self, min_samples=SPECULATION_MIN_SAMPLES, min_win_rate=SPECULATION_MIN_WIN_RATE,
+                 probe_every=SPECULATION_PROBE_EVERY):
+        self.min_samples = min_samples
+        self.min_win_rate = min_win_rate
+        self.probe_every = probe_every
+        self.counts = defaultdict(lambda: [0, 0])
+        self.skipped = Counter()
+
+    def enabled(self, kind):
+        """Spekülatif yol denensin mi; oran düşükse yalnızca ara sıra (site değişirse yeniden açılır)"""
+        wins, attempts = self.counts[kind]
+        if attempts < self.min_samples or wins / attempts >= self.min_win_rate:
+            return True
+        self.skipped[kind] += 1
+        return self.skipped[kind] % self.probe_every == 0
+
+    def record(self, kind, won):
+        entry = self.counts[kind]
+        entry[1] += 1
+        if won:
+            entry[0] += 1
+
+    def report(self):
+        parts = []
+        for kind, (wins, attempts) in sorted(self.counts.items()):
+            rate = wins / attempts * 100 if attempts else 0.0
+            parts.append(f"{kind}: {wins}/{attempts} (%{rate:.1f}), atlanan: {self.skipped[kind]}")
+        if parts:
+            logger.info("[SPEKÜLATİF] " + "; ".join(parts))
+
+
+class M3U8Validator:
+    """Önbellekli, Range isteğiyle çalışan m3u8 doğrulayıcı"""
+
+    def __init__(self, path=None, valid_ttl=VALID_VERDICT_TTL, invalid_ttl=INVALID_VERDICT_TTL, limits=None):
+        self.valid_ttl = valid_ttl
+        self.limits = limits
+        self.invalid_ttl = invalid_ttl
+        self.verdicts = {}
+        self.pending = {}
+        self.stats = Counter()
+        self.db = None
+        if path:
+            os.makedirs(os.path.dirname(str(path)) or ".", exist_ok=True)
+            self.db = sqlite3.connect(str(path))
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts ("
+                " url TEXT PRIMARY KEY, valid INTEGER NOT NULL, checked_at REAL NOT NULL)"
+            )
+            for url, valid, checked_at in self.db.execute("SELECT url, valid, checked_at FROM verdicts"):
+                self.verdicts[url] = (bool(valid), checked_at)
+
+    def cached_verdict(self, url):
+        """Süresi dolmamış karar varsa True/False, yoksa None"""
+        cached = self.verdicts.get(url)
+        if cached is None:
+            return None
+        valid, checked_at = cached
+        ttl = self.valid_ttl if valid else self.invalid_ttl
+        if time.time() - checked_at >= ttl:
+            return None
+        return valid
+
+    def remember(self, url, valid):
+        checked_at = time.time()
+        self.verdicts[url] = (valid, checked_at)
+        if self.db is not None:
+            self.db.execute(
+                "INSERT OR REPLACE INTO verdicts (url, valid, checked_at) VALUES (?, ?, ?)",
+                (url, int(valid), checked_at),
+            )
+            if self.stats["deneme"] % 100 == 0:
+                self.db.commit()
+
+    async def validate(self, session, url, timeout=15):
+        """URL geçerli bir premiumvideo m3u8'i mi; önbellek ve eşzamanlı denemeler paylaşılır"""
+        verdict = self.cached_verdict(url)
+        if verdict is not None:
+            self.stats["önbellek"] += 1
+            return verdict
+
+        pending = self.pending.get(url)
+        if pending is not None:
+            self.stats["birleştirilen"] += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # Asıl deneme iptal edildi (ör. kaybeden yarış), yeniden dene
+                return await self.validate(session, url, timeout)
+
+        future = asyncio.get_running_loop().create_future()
+        self.pending[url] = future
+        try:
+            valid, definitive = await self._probe(session, url, timeout)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        finally:
+            del self.pending[url]
+
+        if definitive:
+            self.remember(url, valid)
+        future.set_result(valid)
+        return valid
+
+    async def _probe(self, session, url, timeout):
+        """Tek istek, tek geçiş: (geçerli mi, karar önbelleğe alınabilir mi)"""
+        self.stats["deneme"] += 1
+        slot = self.limits.slot(url) if self.limits else _Unlimited()
+        try:
+            async with slot:
+                async with session.get(url,
+                                       headers={"Range": f"bytes=0-{VALIDATION_READ_BYTES - 1}"},
+                                       timeout=aiohttp.ClientTimeout(total=slot.timeout(timeout)),
+                                       allow_redirects=True) as response:
+                    slot.observe(response.status)
+                    final_url = str(response.url)
+                    if response.status not in (200, 206):
+                        reason = f"status {response.status}"
+                    elif "premiumvideo.click" not in final_url:
+                        reason = f"premiumvideo.click dışına yönlendi: {final_url}"
+                    elif "master.m3u8" not in final_url and "playlist.m3u8" not in final_url:
+                        reason = f"URL'de m3u8 yok: {final_url}"
+                    else:
+                        content = await response.content.read(VALIDATION_READ_BYTES)
+                        text = content.decode("utf-8", errors="ignore")
+                        total_length = _total_length(response.headers, len(content))
+                        suspicious = SUSPICIOUS_CONTENT.search(text)
+                        if not text.strip().startswith("#EXTM3U"):
+                            reason = "#EXTM3U ile başlamıyor"
+                        elif suspicious:
+                            reason = f"şüpheli içerik: {suspicious.group(0)}"
+                        elif total_length < 50:
+                            reason = f"içerik çok küçük: {total_length}"
+                        else:
+                            reason = None
+
+                    logger.debug(f"[M3U8] {url} -> {'geçerli' if reason is None else reason}")
+                    return reason is None, True
+
+        except asyncio.TimeoutError:
+            logger.debug(f"[M3U8] Timeout: {url}")
+            return False, False
+        except Exception as e:
+            logger.warning(f"[M3U8] Test hatası ({url}): {e}")
+            return False, False
+
+    def report(self):
+        avoided = self.stats["önbellek"] + self.stats["birleştirilen"]
+        logger.info(
+            f"[M3U8] deneme: {self.stats['deneme']}, önlenen: {avoided} "
+            f"(önbellek: {self.stats['önbellek']}, birleştirilen: {self.stats['birleştirilen']})"
+        )
+
+    def close(self):
+        if self.db is not None:
+            self.db.commit()
+            self.db.close()
+            self.db = None
+
+
+class _Unlimited:
+    """Sınırlayıcı verilmediğinde kullanılan boş slot"""
+
+    def timeout(self, default):
+        return default
+
+    def observe(self, status):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+def _total_length(headers, read_length):
+    """Content-Range / Content-Length'ten toplam gövde boyunu çıkarır"""
+    content_range = headers.get("Content-Range", "")
+    if "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        if total.isdigit():
+            return int(total)
+    content_length = headers.get("Content-Length")
+    if content_length and content_length.isdigit():
+        return int(content_length)
+    return read_length
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Host başına token-bucket hız sınırlayıcı (sync + async)
+
+Her istekten önce sabit REQUEST_PAUSE uyumak, yanıtlar 50 ms'de gelse bile
+hızı 5 istek/sn'ye sabitler ve her şeyi sıraya sokar. Bunun yerine her host
+için bir kova tutulur:
+- kova saniyede `rate` jeton dolar, en fazla `burst` jeton birikir,
+- her istek bir jeton ayırır; jeton yoksa gereken süre kadar beklenir
+  (GCRA biçiminde: kilitli sayaç yalnızca "sonraki uygun zaman"ı tutar,
+  bekleme kilidin dışında yapılır; thread'lerden ve event loop'tan
+  aynı kova kullanılabilir),
+- 429 / 503 yanıtındaki Retry-After süresince o host'a istek verilmez.
+
+Kullanım:
+    limiter = HostRateLimiter(rate=10, burst=20)
+    limiter.wait(url)                     # requests tarafı
+    await limiter.wait_async(url)         # aiohttp tarafı
+    limiter.observe(url, status, headers) # Retry-After'ı işler
+"""
+
+import asyncio
+import email.utils
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = 10.0
+DEFAULT_BURST = 20
+# Retry-After yoksa 429 sonrası host'un dinlendirildiği süre (sn)
+DEFAULT_PENALTY = 5.0
+MAX_RETRY_AFTER = 300.0
+
+
+def parse_retry_after(value, now=None):
+    """Retry-After (saniye ya da HTTP tarihi) → saniye; okunamazsa None"""
+    if not value:
+        return None
+    try:
+        return min(MAX_RETRY_AFTER, max(0.0, float(value)))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return min(MAX_RETRY_AFTER, max(0.0, when - (now if now is not None else time.time())))
+
+
+class TokenBucket:
+    """Tek host için jeton kovası"""
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.interval = 1.0 / self.rate
+        # Kova doluyken bu kadar istek beklemeden geçer
+        self.tolerance = (self.burst - 1) * self.interval
+        self.next_free = time.monotonic()
+        self.waited = 0.0
+        self.requests = 0
+        self.blocked = 0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Bir jeton ayırır, kullanılabilir olmasına kalan süreyi (sn) döndürür"""
+        with self._lock:
+            now = time.monotonic()
+            self.next_free = max(self.next_free, now)
+            delay = max(0.0, self.next_free - self.tolerance - now)
+            self.next_free += self.interval
+            self.requests += 1
+            self.waited += delay
+            return delay
+
+    def block(self, seconds):
+        """seconds boyunca hiçbir jeton verilmez (Retry-After)"""
+        with self._lock:
+            now = time.monotonic()
+            self.next_free = max(self.next_free, now + seconds + self.tolerance)
+            self.blocked += 1
+
+
+class HostRateLimiter:
+    """Host adı → TokenBucket"""
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, penalty=DEFAULT_PENALTY):
+        self.rate = rate
+        self.burst = burst
+        self.penalty = penalty
+        self.buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url):
+        host = urlparse(url).hostname or ""
+        with self._lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(self.rate, self.burst)
+            return bucket
+
+    def wait(self, url):
+        delay = self.bucket(url).reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def wait_async(self, url):
+        delay = self.bucket(url).reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def observe(self, url, status, headers=None):
+        """429 / 503'te host'u Retry-After (yoksa penalty) kadar dinlendirir"""
+        if status not in (429, 503):
+            return
+        retry_after = parse_retry_after((headers or {}).get("Retry-After"))
+        seconds = self.penalty if retry_after is None else retry_after
+        self.bucket(url).block(seconds)
+        logger.warning(f"[RATE] {urlparse(url).hostname}: HTTP {status}, {seconds:.1f} sn bekleniyor")
+
+    def report(self):
+        for host, bucket in sorted(self.buckets.items()):
+            logger.info(
+                f"[RATE] {host}: {bucket.rate:g} istek/sn (kova {bucket.burst}), "
+                f"istek: {bucket.requests}, toplam bekleme: {bucket.waited:.1f} sn, "
+                f"429/503 duraklaması: {bucket.blocked}"
+            )
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Değişim sıklığına göre dizi sayfası yeniden tarama takvimi (SQLite)
+
+Her dizi sayfası ziyaretinde bölüm listesinin özeti (sıralı bölüm
+URL'lerinin sha1'i) ve bölüm sayısı saklanır. Liste değiştiyse dizinin
+kontrol aralığı yarıya iner (yayındaki diziler sık taranır), değişmediyse
+1,5 katına çıkar (biten diziler en fazla MAX_INTERVAL'da bir taranır).
+
+Artımlı (--incremental) çalışmada zamanı gelmemiş dizilerin sayfası hiç
+indirilmez; bölümleri stream_store'dan alınır (doğrulama süresi dolanlar
+yine tek m3u8 testiyle doğrulanır).
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+from collections import Counter
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_SCHEDULE_PATH = BASE_DIR / ".cache" / "recrawl.sqlite3"
+MIN_INTERVAL = 3 * 3600
+MAX_INTERVAL = 14 * 24 * 3600
+# İlk ziyaretten sonraki kontrol aralığı
+INITIAL_INTERVAL = 12 * 3600
+GROWTH = 1.5
+SHRINK = 0.5
+
+
+def episode_hash(episode_urls):
+    return hashlib.sha1("\n".join(sorted(episode_urls)).encode("utf-8")).hexdigest()
+
+
+class RecrawlSchedule:
+    """Dizi URL'si → (bölüm özeti, bölüm sayısı, aralık, sonraki kontrol zamanı)"""
+
+    def __init__(self, path=DEFAULT_SCHEDULE_PATH, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL):
+        self.path = str(path)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.db = sqlite3.connect(self.path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS series ("
+            " series_url TEXT PRIMARY KEY, episode_hash TEXT NOT NULL,"
+            " episode_count INTEGER NOT NULL, interval REAL NOT NULL,"
+            " checks INTEGER NOT NULL, changes INTEGER NOT NULL,"
+            " last_checked REAL NOT NULL, last_changed REAL NOT NULL, next_check REAL NOT NULL)"
+        )
+        self.db.commit()
+        self.stats = Counter()
+
+    def is_due(self, series_url):
+        """Dizi sayfası bu çalışmada ziyaret edilmeli mi (hiç görülmediyse True)"""
+        row = self.db.execute(
+            "SELECT next_check FROM series WHERE series_url = ?", (series_url,)
+        ).fetchone()
+        if row is None or time.time() >= row["next_check"]:
+            return True
+        self.stats["zamanı_gelmedi"] += 1
+        return False
+
+    def get(self, series_url):
+        return self.db.execute("SELECT * FROM series WHERE series_url = ?", (series_url,)).fetchone()
+
+    def observe(self, series_url, episode_urls):
+        """Ziyaret edilen dizinin bölüm listesini işler ve sonraki kontrol zamanını belirler"""
+        now = time.time()
+        digest = episode_hash(episode_urls)
+        row = self.get(series_url)
+        if row is None:
+            interval, checks, changes, last_changed = INITIAL_INTERVAL, 1, 0, now
+            self.stats["yeni"] += 1
+        elif row["episode_hash"] != digest:
+            interval = max(self.min_interval, row["interval"] * SHRINK)
+            checks, changes, last_changed = row["checks"] + 1, row["changes"] + 1, now
+            self.stats["değişti"] += 1
+            self.stats["yeni_bölüm"] += max(0, len(episode_urls) - row["episode_count"])
+        else:
+            interval = min(self.max_interval, row["interval"] * GROWTH)
+            checks, changes, last_changed = row["checks"] + 1, row["changes"], row["last_changed"]
+            self.stats["değişmedi"] += 1
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO series"
+                " (series_url, episode_hash, episode_count, interval, checks, changes,"
+                " last_checked, last_changed, next_check) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (series_url, digest, len(episode_urls), interval, checks, changes,
+                 now, last_changed, now + interval),
+            )
+
+    def report(self):
+        logger.info("[RECRAWL] " + ", ".join(f"{k}: {v}" for k, v in self.stats.items()))
+
+    def close(self):
+        self.db.close()
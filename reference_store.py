@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+DYG kanalları için bölüm → ReferenceId deposu (SQLite)
+
+DMAX / TLC tarayıcıları her çalışmada her bölüm sayfasını yalnızca
+oynatıcının data-video-code değerini okumak için indirir. Yayınlanmış bir
+bölümün ReferenceId'si değişmediğinden (kanal, bölüm URL'si) → ReferenceId
+eşlemesi kalıcı tutulur; bölüm sayfası yalnızca ilk kez görülen bölümler
+için istenir. Çalışan PublisherId öğrenildiğinde o da saklanır ve aday
+akış URL'lerinde öne alınır.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from collections import Counter
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_REFERENCE_PATH = BASE_DIR / ".cache" / "dyg_references.sqlite3"
+
+
+class ReferenceStore:
+    """(kanal, bölüm URL'si) → (ReferenceId, PublisherId)"""
+
+    def __init__(self, path=DEFAULT_REFERENCE_PATH):
+        self.path = str(path)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS refs ("
+            " channel TEXT NOT NULL, episode_url TEXT NOT NULL,"
+            " reference_id TEXT NOT NULL, publisher_id INTEGER,"
+            " updated_at REAL NOT NULL, PRIMARY KEY (channel, episode_url))"
+        )
+        self.db.commit()
+        self.stats = Counter()
+
+    def lookup(self, channel, episode_url):
+        """Kayıtlıysa (reference_id, publisher_id) döndürür; bölüm sayfası istenmez"""
+        row = self.db.execute(
+            "SELECT reference_id, publisher_id FROM refs WHERE channel = ? AND episode_url = ?",
+            (channel, episode_url),
+        ).fetchone()
+        if row is None:
+            return None
+        self.stats[channel, "depodan"] += 1
+        return row["reference_id"], row["publisher_id"]
+
+    def remember(self, channel, episode_url, reference_id, publisher_id=None):
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO refs (channel, episode_url, reference_id, publisher_id, updated_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (channel, episode_url, reference_id, publisher_id, time.time()),
+            )
+        self.stats[channel, "yeni"] += 1
+
+    def set_publisher(self, channel, episode_url, publisher_id):
+        """Bölümün çalıştığı doğrulanan PublisherId'si (sonraki çalışmalarda öne alınır)"""
+        with self.db:
+            self.db.execute(
+                "UPDATE refs SET publisher_id = ? WHERE channel = ? AND episode_url = ?",
+                (publisher_id, channel, episode_url),
+            )
+
+    def report(self):
+        for channel in sorted({channel for channel, _ in self.stats}):
+            logger.info(
+                f"[REFERANS] {channel}: kaçınılan bölüm isteği: {self.stats[channel, 'depodan']}, "
+                f"yeni bölüm: {self.stats[channel, 'yeni']}"
+            )
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Oynatmada çözüm (resolve-on-play) sunucusu
+
+--resolve-on-play ile üretilen listelerde bölüm girdileri akış yerine
+  http://HOST:PORT/resolve?src=<bölüm URL'si>&ref=<referer>
+adresini gösterir. Oynatıcı bu adresi açtığında bölüm dizi.py'deki
+Gujan / Playhouse / fallback çözücüleriyle o an çözülür, sonuç TTL ile
+bellekte tutulur ve istemci 302 ile proxy'li m3u8'e yönlendirilir. Aynı
+bölüm için eşzamanlı istekler tek çözümde birleştirilir (SingleFlight);
+çözülemeyen bölümler kısa bir süre negatif önbellekte tutulur.
+
+Böylece liste derlemesi yalnızca dizi / bölüm sayfalarını tarar, hiç
+izlenmeyen bölümler için player ve m3u8 istekleri atılmaz.
+
+Kullanım:
+  python resolver_server.py                         # 127.0.0.1:8080
+  python resolver_server.py --host 0.0.0.0 --port 9000
+  python resolver_server.py --cache                 # kalıcı HTTP önbelleği ve strateji kaydı
+"""
+
+import logging
+import re
+import sys
+import time
+from collections import Counter
+from urllib.parse import urlparse
+
+import aiohttp
+from aiohttp import web
+
+import dizi
+from http_cache import HttpCache, SingleFlight
+from premiumvideo import DEFAULT_VALIDATION_PATH, M3U8Validator
+from strategy_registry import DEFAULT_STRATEGY_PATH, StrategyRegistry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+# Çözülen akışın geçerlilik süresi (sn); premiumvideo adresleri saatlerce geçerli kalır
+STREAM_TTL = 6 * 3600
+# Çözülemeyen bölüm bu süre boyunca yeniden denenmez (sn)
+NEGATIVE_TTL = 5 * 60
+MAX_ENTRIES = 4096
+
+# Yalnızca dizifun bölüm sayfaları çözülür (sunucu açık bir proxy olmasın)
+ALLOWED_HOST_RE = re.compile(r"^(www\.)?dizifun\d*\.com$", re.IGNORECASE)
+
+
+class StreamResolver:
+    """Bölüm URL'si → (m3u8, son geçerlilik zamanı) TTL önbelleği ile istek anında çözüm"""
+
+    def __init__(self, ttl=STREAM_TTL, negative_ttl=NEGATIVE_TTL, max_entries=MAX_ENTRIES):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.entries = {}
+        # Yalnızca birleştirme için; sonuçlar TTL'li self.entries'te tutulur
+        self.flight = SingleFlight(maxsize=0)
+        self.stats = Counter()
+        self.session = None
+
+    async def start(self, app):
+        self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=dizi.CONNECTION_LIMIT))
+
+    async def stop(self, app):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+        self.report()
+
+    async def resolve(self, episode_url):
+        """Bölümün m3u8 adresi (proxy'siz), çözülemezse None"""
+        entry = self.entries.get(episode_url)
+        if entry is not None and entry[1] > time.time():
+            self.stats["önbellek"] += 1
+            return entry[0]
+        return await self.flight.fetch(episode_url, lambda: self._resolve(episode_url))
+
+    async def _resolve(self, episode_url):
+        season_num, episode_num = dizi.extract_season_episode_from_url(episode_url)
+        started = time.time()
+        try:
+            _, _, m3u8_url, strategy, _ = await dizi.extract_m3u8_from_episode(
+                self.session, episode_url, season_num, episode_num, use_proxy=False)
+        except Exception as e:
+            logger.error(f"[!] Çözüm hatası: {episode_url} - {e}")
+            m3u8_url, strategy = None, None
+
+        if len(self.entries) >= self.max_entries:
+            self._evict()
+        ttl = self.ttl if m3u8_url else self.negative_ttl
+        self.entries[episode_url] = (m3u8_url, time.time() + ttl)
+        self.stats["çözülen" if m3u8_url else "çözülemeyen"] += 1
+        logger.info(f"[RESOLVE] {episode_url} -> {strategy or 'yok'} ({time.time() - started:.2f} sn)")
+        return m3u8_url
+
+    def _evict(self):
+        """Süresi dolanları, yine de doluysa en eski kayıtları atar"""
+        now = time.time()
+        for url in [u for u, (_, expires) in self.entries.items() if expires <= now]:
+            del self.entries[url]
+        while len(self.entries) >= self.max_entries:
+            del self.entries[next(iter(self.entries))]
+
+    async def handle_resolve(self, request):
+        episode_url = request.query.get("src", "")
+        referer = request.query.get("ref") or None
+        if not ALLOWED_HOST_RE.match(urlparse(episode_url).hostname or ""):
+            self.stats["reddedilen"] += 1
+            raise web.HTTPBadRequest(text="src bir dizifun bölüm adresi olmalı\n")
+
+        m3u8_url = await self.resolve(episode_url)
+        if not m3u8_url:
+            raise web.HTTPNotFound(text="Akış bulunamadı\n")
+        raise web.HTTPFound(dizi.create_proxy_url(m3u8_url, referer))
+
+    def report(self):
+        logger.info("[RESOLVE] " + ", ".join(f"{k}: {v}" for k, v in self.stats.items()))
+
+
+def create_app(resolver=None):
+    resolver = resolver or StreamResolver()
+    app = web.Application()
+    app.router.add_get("/resolve", resolver.handle_resolve)
+    app.on_startup.append(resolver.start)
+    app.on_cleanup.append(resolver.stop)
+    return app
+
+
+def _option(args, name, default):
+    if name in args:
+        index = args.index(name)
+        if index + 1 < len(args):
+            return args[index + 1]
+    return default
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    args = sys.argv[1:]
+    host = _option(args, "--host", DEFAULT_HOST)
+    port = int(_option(args, "--port", DEFAULT_PORT))
+    if "--cache" in args:
+        dizi.response_cache = HttpCache()
+        dizi.m3u8_validator = M3U8Validator(DEFAULT_VALIDATION_PATH, limits=dizi.host_limits)
+        dizi.strategy_registry = StrategyRegistry(DEFAULT_STRATEGY_PATH)
+
+    logger.info(f"[+] Çözüm sunucusu: http://{host}:{port}/resolve?src=<bölüm URL'si>")
+    try:
+        web.run_app(create_app(), host=host, port=port, print=None)
+    finally:
+        dizi.m3u8_validator.close()
+        dizi.strategy_registry.close()
+        if dizi.response_cache:
+            dizi.response_cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Bölüm çözücü strateji kaydı (gujan / playhouse / fallback)
+
+Hangi çözücünün başarılı olduğunu site (katalog) ve dizi bazında sayar;
+bir bölüm için stratejiler geçmişte en çok kazanan önce olacak şekilde
+sıralanır. Art arda çok kez başarısız olan ("ölü") strateji sona atılır ama
+tamamen bırakılmaz, site değişirse yeniden öne çıkabilir.
+
+Yol verilirse (--cache) istatistikler çalışmalar arasında SQLite'ta saklanır;
+yazımlar COMMIT_EVERY kayıtta bir ve close()'da diske işlenir.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_STRATEGY_PATH = BASE_DIR / ".cache" / "strategies.sqlite3"
+
+DEFAULT_STRATEGIES = ("gujan", "playhouse", "fallback")
+
+# Dizi kapsamının site kapsamının önüne geçmesi için gereken deneme sayısı
+SERIES_MIN_ATTEMPTS = 2
+# Bu kadar art arda başarısızlıktan sonra strateji sona atılır
+DEAD_AFTER = 20
+# Bu kadar record() çağrısında bir commit (event loop'ta kayıt başına commit yapılmaz)
+COMMIT_EVERY = 100
+
+
+class StrategyRegistry:
+    """Kapsam (site:/series:) → strateji → kazanma / deneme / art arda ıska"""
+
+    def __init__(self, path=None, strategies=DEFAULT_STRATEGIES):
+        self.strategies = tuple(strategies)
+        self.counts = defaultdict(lambda: defaultdict(lambda: [0, 0, 0]))
+        self.stats = Counter()
+        self.db = None
+        self.unsaved = 0
+        if path:
+            os.makedirs(os.path.dirname(str(path)) or ".", exist_ok=True)
+            self.db = sqlite3.connect(str(path))
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS strategies ("
+                " scope TEXT NOT NULL, strategy TEXT NOT NULL, wins INTEGER NOT NULL,"
+                " attempts INTEGER NOT NULL, misses_in_row INTEGER NOT NULL,"
+                " updated_at REAL NOT NULL, PRIMARY KEY (scope, strategy))"
+            )
+            for scope, strategy, wins, attempts, misses_in_row in self.db.execute(
+                    "SELECT scope, strategy, wins, attempts, misses_in_row FROM strategies"):
+                self.counts[scope][strategy] = [wins, attempts, misses_in_row]
+
+    def order(self, site, series_key=None):
+        """Denenecek strateji sırası: önce dizi, yoksa site geçmişine göre"""
+        scope = f"series:{series_key}" if series_key else None
+        if not scope or sum(c[1] for c in self.counts[scope].values()) < SERIES_MIN_ATTEMPTS:
+            scope = f"site:{site}"
+        site_counts = self.counts[f"site:{site}"]
+        counts = self.counts[scope]
+
+        def key(strategy):
+            wins, attempts, _ = counts[strategy]
+            dead = site_counts[strategy][2] >= DEAD_AFTER
+            # Laplace düzeltmeli kazanma oranı; eşitlikte varsayılan sıra korunur
+            return (dead, -(wins + 1) / (attempts + 2), self.strategies.index(strategy))
+
+        return sorted(self.strategies, key=key)
+
+    def record(self, site, series_key, strategy, success):
+        rows = []
+        for scope in (f"site:{site}", f"series:{series_key}" if series_key else None):
+            if scope is None:
+                continue
+            entry = self.counts[scope][strategy]
+            entry[1] += 1
+            if success:
+                entry[0] += 1
+                entry[2] = 0
+            else:
+                entry[2] += 1
+            rows.append((scope, strategy, *entry, time.time()))
+        if self.db is not None:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO strategies"
+                " (scope, strategy, wins, attempts, misses_in_row, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            self.unsaved += 1
+            if self.unsaved >= COMMIT_EVERY:
+                self.db.commit()
+                self.unsaved = 0
+
+    def record_episode(self, tried, winner):
+        """Bölüm başına: kaç strateji denendi, ilk deneme kazandı mı"""
+        self.stats["bölüm"] += 1
+        self.stats["deneme"] += tried
+        if winner and tried == 1:
+            self.stats["ilk_denemede"] += 1
+
+    def report(self):
+        episodes = self.stats["bölüm"]
+        avg = self.stats["deneme"] / episodes if episodes else 0.0
+        sites = {scope[5:]: {s: c[0] for s, c in counts.items()}
+                 for scope, counts in self.counts.items() if scope.startswith("site:")}
+        logger.info(
+            f"[STRATEJİ] bölüm: {episodes}, ilk denemede: {self.stats['ilk_denemede']}, "
+            f"bölüm başına deneme: {avg:.2f}, site kazanımları: {sites}"
+        )
+
+    def close(self):
+        if self.db is not None:
+            self.db.commit()
+            self.db.close()
+            self.db = None
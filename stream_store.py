@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Çözülmüş bölüm akışları deposu (SQLite)
+
+Bölüm URL'si anahtarıyla çözülen m3u8'i, çözücü stratejisini (gujan /
+playhouse / fallback), file_id'yi ve son doğrulama zamanını tutar.
+Artımlı (--incremental) çalışmada:
+- depoda olmayan bölümler normal şekilde çözülür,
+- doğrulama süresi (TTL) dolmamış kayıtlar hiç istek atılmadan kullanılır,
+- süresi dolanlar tek bir m3u8 testiyle yeniden doğrulanır, geçemezse yeniden çözülür.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_STORE_PATH = BASE_DIR / ".cache" / "streams.sqlite3"
+DEFAULT_VERIFY_TTL = 3 * 24 * 3600
+
+
+class StreamStore:
+    """Bölüm URL'si → çözülmüş akış eşlemesi"""
+
+    def __init__(self, path=DEFAULT_STORE_PATH, verify_ttl=DEFAULT_VERIFY_TTL):
+        self.path = str(path)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.verify_ttl = verify_ttl
+        self.db = sqlite3.connect(self.path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(
+            "CREATE TABLE IF NOT EXISTS episodes ("
+            " episode_url TEXT PRIMARY KEY, series_url TEXT NOT NULL,"
+            " season INTEGER, episode INTEGER, m3u8_url TEXT NOT NULL,"
+            " strategy TEXT, file_id TEXT, verified_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS episodes_series ON episodes (series_url);"
+            "CREATE TABLE IF NOT EXISTS series ("
+            " series_url TEXT PRIMARY KEY, title TEXT, logo_url TEXT, updated_at REAL NOT NULL);"
+        )
+        self.db.commit()
+        self.stats = {"yeni": 0, "depodan": 0, "doğrulandı": 0, "yeniden_çözüldü": 0}
+
+    def get(self, episode_url):
+        return self.db.execute(
+            "SELECT * FROM episodes WHERE episode_url = ?", (episode_url,)
+        ).fetchone()
+
+    def is_due(self, record):
+        """Kaydın doğrulama süresi dolmuş mu"""
+        return time.time() - record["verified_at"] >= self.verify_ttl
+
+    def get_series(self, series_url):
+        return self.db.execute(
+            "SELECT title, logo_url FROM series WHERE series_url = ?", (series_url,)
+        ).fetchone()
+
+    def series_entries(self, series_url):
+        """Dizinin depodaki bölümlerini (sezon, bölüm, m3u8) sırasıyla döndürür"""
+        rows = self.db.execute(
+            "SELECT season, episode, m3u8_url FROM episodes WHERE series_url = ?"
+            " ORDER BY season, episode", (series_url,)
+        ).fetchall()
+        return [(row["season"], row["episode"], row["m3u8_url"]) for row in rows]
+
+    def series_records(self, series_url):
+        """Dizinin depodaki bölüm kayıtlarını (tam satır) sırasıyla döndürür"""
+        return self.db.execute(
+            "SELECT * FROM episodes WHERE series_url = ? ORDER BY season, episode", (series_url,)
+        ).fetchall()
+
+    def save_series(self, series_url, title, logo_url, episodes):
+        """Dizi bilgisini ve doğrulanan bölümlerini tek işlemde kaydeder
+
+        episodes: (episode_url, season, episode, m3u8_url, strategy, file_id)
+        """
+        now = time.time()
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO series (series_url, title, logo_url, updated_at)"
+                " VALUES (?, ?, ?, ?)", (series_url, title, logo_url, now)
+            )
+            self.db.executemany(
+                "INSERT OR REPLACE INTO episodes"
+                " (episode_url, series_url, season, episode, m3u8_url, strategy, file_id, verified_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(ep_url, series_url, season, episode, m3u8_url, strategy, file_id, now)
+                 for ep_url, season, episode, m3u8_url, strategy, file_id in episodes],
+            )
+
+    def report(self):
+        logger.info("[STORE] " + ", ".join(f"{k}: {v}" for k, v in self.stats.items()))
+
+    def close(self):
+        self.db.close()
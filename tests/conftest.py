@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+
+"""Testler depo kökündeki modülleri (paket olmadan) doğrudan içe aktarır"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
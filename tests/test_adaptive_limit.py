@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+"""adaptive_limit: AIMD pencere güncellemesi ve slot sayımı"""
+
+import asyncio
+
+import pytest
+
+import adaptive_limit
+from adaptive_limit import AIMDLimiter, HostLimits, request_meter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(adaptive_limit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_additive_increase_one_per_window(clock):
+    limiter = AIMDLimiter("h", initial=4, max_limit=32)
+    for _ in range(4):
+        limiter._update("ok", 0.1)
+    assert int(limiter.limit) == 4
+    for _ in range(2):
+        limiter._update("ok", 0.1)
+    assert int(limiter.limit) == 5
+
+
+def test_limit_stays_within_bounds(clock):
+    limiter = AIMDLimiter("h", initial=4, min_limit=1, max_limit=6)
+    for _ in range(200):
+        limiter._update("ok", 0.1)
+    assert limiter.limit == 6
+    for _ in range(10):
+        clock[0] += adaptive_limit.DECREASE_COOLDOWN
+        limiter._update("overload", 0.1)
+    assert limiter.limit == 1
+
+
+def test_decrease_once_per_wave(clock):
+    limiter = AIMDLimiter("h", initial=16)
+    for _ in range(5):
+        limiter._update("timeout", 1.0)
+    assert limiter.limit == 8
+    clock[0] += adaptive_limit.DECREASE_COOLDOWN
+    limiter._update("overload", 1.0)
+    assert limiter.limit == 4
+
+
+def test_latency_spike_shrinks_window(clock):
+    limiter = AIMDLimiter("h", initial=16)
+    for _ in range(adaptive_limit.MIN_LATENCY_SAMPLES):
+        limiter._update("ok", 0.1)
+    before = limiter.limit
+    limiter._update("ok", 0.1 * adaptive_limit.LATENCY_SPIKE_FACTOR * 2)
+    assert limiter.limit == pytest.approx(before * adaptive_limit.DECREASE_FACTOR)
+
+
+def test_timeout_follows_baseline(clock):
+    limiter = AIMDLimiter("h")
+    assert limiter.timeout(45) == 45
+    for _ in range(adaptive_limit.MIN_LATENCY_SAMPLES):
+        limiter._update("ok", 0.5)
+    assert limiter.timeout(45) == adaptive_limit.MIN_TIMEOUT
+    assert limiter.timeout(10) == 10
+
+
+def test_slot_counts_requests_and_transient_outcomes():
+    async def run():
+        limits = HostLimits(initial=4)
+        meter = [0, 0]
+        request_meter.set(meter)
+        async with limits.slot("https://a.example/1"):
+            pass
+        async with limits.slot("https://a.example/2") as slot:
+            slot.observe(503)
+        with pytest.raises(asyncio.TimeoutError):
+            async with limits.slot("https://a.example/3"):
+                raise asyncio.TimeoutError
+        return meter, limits.for_url("https://a.example/").in_flight
+
+    meter, in_flight = asyncio.run(run())
+    assert meter == [3, 2]
+    assert in_flight == 0
+
+
+def test_cancelled_release_does_not_leak_slot():
+    async def run():
+        limiter = AIMDLimiter("h", initial=1)
+        await limiter.acquire()
+        # Kilit başka görevde tutulurken release iptal edilir
+        await limiter._cond.acquire()
+        task = asyncio.ensure_future(limiter.release("cancelled", 0.0))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        limiter._cond.release()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.wait_for(waiter, 1.0)
+        return limiter.in_flight
+
+    assert asyncio.run(run()) == 1
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+"""crawl_shard: parça bölüşümü ve birleştirmenin tek süreçli çalışmayla eşitliği"""
+
+import pytest
+
+from crawl_shard import ShardError, artifact_path, load_artifacts, merge_artifacts, parse_shard, shard_of, \
+    write_artifact
+
+NAMES = ["netflix", "exxen"]
+LISTINGS = [
+    [f"https://dizifun5.com/dizi/{i}" for i in range(0, 40)],
+    [f"https://dizifun5.com/dizi/{i}" for i in range(30, 55)],
+]
+
+
+def _single_process_result():
+    """Tek süreçli çalışmanın journal.done'u: her dizi bir kez çözülür"""
+    resolved = {}
+    for links in LISTINGS:
+        for url in links:
+            n = int(url.rsplit("/", 1)[1])
+            resolved[url] = (f"Dizi {n}", f"https://img/{n}.jpg",
+                             [(1, f"{e:02d}", f"https://cdn/{n}/{e}.m3u8") for e in range(1, n % 4 + 1)])
+    return resolved
+
+
+def _write_shards(tmp_path, count, resolved):
+    for index in range(count):
+        mine = {url: result for url, result in resolved.items() if shard_of(url, count) == index}
+        write_artifact(artifact_path(tmp_path, index, count), index, count, NAMES, LISTINGS, mine)
+
+
+@pytest.mark.parametrize("spec, expected", [("0/1", (0, 1)), ("0/4", (0, 4)), ("3/4", (3, 4))])
+def test_parse_shard(spec, expected):
+    assert parse_shard(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["4/4", "-1/4", "0/0", "1", "a/b", ""])
+def test_parse_shard_rejects_invalid(spec):
+    with pytest.raises(ShardError):
+        parse_shard(spec)
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 7])
+def test_shards_partition_urls(count):
+    urls = {url for links in LISTINGS for url in links}
+    parts = [{url for url in urls if shard_of(url, count) == index} for index in range(count)]
+    assert set().union(*parts) == urls
+    assert sum(len(part) for part in parts) == len(urls)
+
+
+def test_shard_of_is_stable():
+    # hash() tuzlu olduğu için sha1 kullanılır; değer süreçten süreçe değişmez
+    assert shard_of("https://dizifun5.com/dizi/0", 4) == shard_of("https://dizifun5.com/dizi/0", 4)
+    assert [shard_of(f"u{i}", 1) for i in range(5)] == [0] * 5
+
+
+@pytest.mark.parametrize("count", [1, 3, 4])
+def test_merge_equals_single_process(tmp_path, count):
+    resolved = _single_process_result()
+    _write_shards(tmp_path, count, resolved)
+
+    names, listings, merged, resolver_base = merge_artifacts(load_artifacts(tmp_path))
+
+    assert names == NAMES
+    assert listings == LISTINGS
+    assert merged == resolved
+    assert resolver_base is None
+
+
+def test_missing_shard_is_rejected(tmp_path):
+    _write_shards(tmp_path, 3, _single_process_result())
+    artifact_path(tmp_path, 1, 3).unlink()
+    with pytest.raises(ShardError):
+        load_artifacts(tmp_path)
+
+
+def test_different_listings_are_rejected(tmp_path):
+    write_artifact(artifact_path(tmp_path, 0, 2), 0, 2, NAMES, LISTINGS, {})
+    write_artifact(artifact_path(tmp_path, 1, 2), 1, 2, NAMES, [LISTINGS[0][:-1], LISTINGS[1]], {})
+    with pytest.raises(ShardError):
+        merge_artifacts(load_artifacts(tmp_path))
+
+
+def test_merged_playlists_match_single_process(tmp_path, monkeypatch):
+    pytest.importorskip("aiohttp")
+    import dizifun_runner
+
+    resolved = _single_process_result()
+    catalogs = dict(dizifun_runner.select_catalogs(NAMES))
+
+    def playlists(base_dir):
+        return {name: (base_dir / catalogs[name]["output"]).read_text(encoding="utf-8") for name in NAMES}
+
+    single_dir = tmp_path / "tek"
+    monkeypatch.setattr(dizifun_runner, "BASE_DIR", single_dir)
+    for name, links in zip(NAMES, LISTINGS):
+        dizifun_runner.write_catalog(catalogs[name], links, resolved)
+
+    merged_dir = tmp_path / "parcali"
+    _write_shards(tmp_path / "shards", 4, resolved)
+    monkeypatch.setattr(dizifun_runner, "BASE_DIR", merged_dir)
+    dizifun_runner.merge_shards(tmp_path / "shards")
+
+    assert playlists(merged_dir) == playlists(single_dir)
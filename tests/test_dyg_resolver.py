@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+"""dyg_resolver: HLS süre çıkarımı ve M3U'ya yazılan kalıcı yönlendirme"""
+
+import asyncio
+
+import pytest
+
+from dyg_resolver import DEFAULT_TTL, EXPIRY_MARGIN, MAX_TTL, HlsCache, RedirectResolver, expiry_of, ttl_for
+
+NOW = 1_700_000_000.0
+REDIRECT = "https://dygvideo.dygdigital.com/api/redirect?PublisherId={}&ReferenceId=ref{}"
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://cdn/x/master.m3u8?expires=1700003600", 1700003600.0),
+    ("https://cdn/x/master.m3u8?Exp=1700003600000", 1700003600.0),
+    ("https://cdn/x/master.m3u8?hdnts=st=1699990000~exp=1700007200~acl=/*~hmac=ab", 1700007200.0),
+    ("https://cdn/x/master.m3u8?token=abc", None),
+    ("https://cdn/x/master.m3u8?expires=yarın", None),
+])
+def test_expiry_of(url, expected):
+    assert expiry_of(url) == expected
+
+
+def test_ttl_for_bounds():
+    assert ttl_for("https://cdn/x.m3u8", NOW) == DEFAULT_TTL
+    assert ttl_for(f"https://cdn/x.m3u8?expires={NOW + 3600:.0f}", NOW) == 3600 - EXPIRY_MARGIN
+    assert ttl_for(f"https://cdn/x.m3u8?expires={NOW + 10 ** 8:.0f}", NOW) == MAX_TTL
+    assert ttl_for(f"https://cdn/x.m3u8?expires={NOW - 60:.0f}", NOW) == 0.0
+
+
+def test_hls_cache_skips_expired_urls(tmp_path):
+    cache = HlsCache(tmp_path / "hls.sqlite3")
+    cache.put("r1", "https://cdn/ok.m3u8")
+    cache.put("r2", "https://cdn/old.m3u8?expires=1000")
+    assert cache.get("r1") == "https://cdn/ok.m3u8"
+    assert cache.get("r2") is None
+    cache.close()
+
+
+class FakeClient:
+    """Yalnızca working PublisherId'li yönlendirme oynatma listesi döner"""
+
+    def __init__(self, working):
+        self.working = working
+        self.fetched = []
+
+    async def fetch(self, method, url, headers=None):
+        self.fetched.append(url)
+        if f"PublisherId={self.working}&" in url:
+            return 200, b"#EXTM3U\n", {}, url.replace("dygvideo", "hls") + "&expires=9999999999"
+        return 404, b"", {}, url
+
+
+class FakeChannel:
+    name = "dmax"
+
+
+def test_playlist_keeps_stable_redirect_url():
+    client = FakeClient(working=27)
+    resolver = RedirectResolver(client)
+    episodes = [{"url": f"https://dmax/bolum-{i}",
+                 "stream_url": REDIRECT.format(20, i),
+                 "stream_url_candidates": [REDIRECT.format(20, i), REDIRECT.format(27, i)]}
+                for i in range(3)]
+
+    asyncio.run(resolver.resolve_program(FakeChannel(), {"url": "https://dmax/program"}, episodes, {}))
+
+    for i, ep in enumerate(episodes):
+        # M3U'ya süresi dolan HLS değil, çalışan PublisherId'li yönlendirme yazılır
+        assert ep["stream_url"] == REDIRECT.format(27, i)
+        assert ep["stream_url_candidates"] == [REDIRECT.format(27, i), REDIRECT.format(20, i)]
+        assert ep["resolved_url"].startswith("https://hls.")
+    # İlk bölüm PublisherId'yi öğretti; kalanlarda yalnızca o denendi
+    assert len(client.fetched) == 2 + 2
+    assert resolver.stats["öğrenilen_publisher"] == 1
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+"""extraction: kayıtlı sayfalarda hızlı / kısmi / tam modların aynı sonucu vermesi"""
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("bs4")
+
+import extraction
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+PAGE_URL = "https://dizifun5.com/bolum/ornek"
+MODES = ("fast", "partial", "full")
+
+EPISODES = {
+    "episode_gujan.html": {
+        "title": "Kuruluş Osman 6. Sezon 12. Bölüm İzle & Full HD",
+        "gujan_srcs": ["https://gujan.premiumvideo.click/player/k9x2m1",
+                       "https://gujan.premiumvideo.click/player/k9x2m1-alt"],
+        "playhouse_url": None,
+    },
+    "episode_playhouse_hex.html": {
+        "title": "Yalı Çapkını 3. Sezon 4. Bölüm",
+        "gujan_srcs": [],
+        "playhouse_url": "https://playhouse.premiumvideo.click/player/7f3a9c",
+    },
+    "episode_fallback.html": {
+        "title": "Gibi 5. Sezon 1. Bölüm",
+        "gujan_srcs": [],
+        "playhouse_url": None,
+        "fallback": ("https://premiumvideo.click/player.php?file_id=AbC123xyz", "AbC123xyz"),
+    },
+    "episode_no_player.html": {
+        "title": "Bölüm bulunamadı",
+        "gujan_srcs": [],
+        "playhouse_url": None,
+        "fallback": None,
+    },
+}
+
+PLAYERS = {
+    "gujan_player_source.html": "https://cdn3.gujan.example/hls/k9x2m1/playlist.m3u8",
+    "gujan_player_script.html": "https://cdn7.gujan.example/hls/q1w2e3/playlist.m3u8",
+    "episode_no_player.html": None,
+}
+
+
+def _page(name):
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+@pytest.fixture(autouse=True)
+def clean_stats():
+    extraction.stats.clear()
+    yield
+    extraction.stats.clear()
+
+
+@pytest.mark.parametrize("name", sorted(EPISODES))
+def test_player_candidates_agree_across_modes(name):
+    content = _page(name)
+    results = {mode: extraction.player_candidates(content, PAGE_URL, mode) for mode in MODES}
+    assert results["fast"] == results["full"]
+    assert results["partial"] == results["full"]
+    for key, expected in EPISODES[name].items():
+        assert results["fast"][key] == expected
+
+
+@pytest.mark.parametrize("name", sorted(PLAYERS))
+def test_gujan_stream_agrees_across_modes(name):
+    content = _page(name)
+    streams = {mode: extraction.gujan_stream(content, mode) for mode in MODES}
+    assert set(streams.values()) == {PLAYERS[name]}
+
+
+@pytest.mark.parametrize("name", ["episode_gujan.html", "episode_playhouse_hex.html", "episode_fallback.html"])
+def test_fast_mode_finds_candidates_without_full_parse(name):
+    extraction.player_candidates(_page(name), PAGE_URL, "fast")
+    assert extraction.stats["hızlı"] == 1
+    assert extraction.stats["tam_ayrıştırma"] == 0
+
+
+@pytest.mark.parametrize("name", ["gujan_player_source.html", "gujan_player_script.html"])
+def test_fast_mode_finds_stream_without_full_parse(name):
+    extraction.gujan_stream(_page(name), "fast")
+    assert extraction.stats["hızlı"] == 1
+    assert extraction.stats["tam_ayrıştırma"] == 0
+
+
+def test_fast_mode_skips_full_parse_without_candidate_text():
+    extraction.player_candidates(_page("episode_no_player.html"), PAGE_URL, "fast")
+    assert extraction.stats["hızlı_ıska"] == 0
+    assert extraction.stats["tam_ayrıştırma"] == 0
+
+
+def test_fast_miss_falls_back_to_full_parse():
+    # type değeri HTML'de büyük/küçük harf duyarsız; hızlı seçici birebir karşılaştırır
+    content = ('<html><body><video><source src="https://cdn/hls/a/playlist.m3u8" '
+               'type="application/x-mpegurl"></video></body></html>')
+    assert extraction.gujan_stream(content, "fast") == "https://cdn/hls/a/playlist.m3u8"
+    assert extraction.stats["hızlı_ıska"] == 1
+    assert extraction.stats["tam_ayrıştırma"] == 1
+
+
+def test_fingerprint_ignores_unrelated_markup():
+    content = _page("episode_gujan.html")
+    changed = content.replace("Önceki", "Geri").replace("app.js", "app.v2.js")
+    assert extraction.player_fingerprint(content) == extraction.player_fingerprint(changed)
+    assert extraction.player_fingerprint(content) != extraction.player_fingerprint(
+        content.replace("k9x2m1-alt", "k9x2m1-yedek"))
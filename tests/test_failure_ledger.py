@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+"""failure_ledger: üstel erteleme sınırları, parmak izi ve geçici hatalar"""
+
+import pytest
+
+import failure_ledger
+from failure_ledger import BASE_DELAY, MAX_DELAY, TRANSIENT_DELAY, FailureLedger
+
+URL = "https://dizifun5.com/bolum/1"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(failure_ledger.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    ledger = FailureLedger(tmp_path / "failures.sqlite3")
+    yield ledger
+    ledger.close()
+
+
+def _delay(ledger, url=URL):
+    row = ledger.db.execute("SELECT last_failed, next_retry FROM failures WHERE url = ?", (url,)).fetchone()
+    return row["next_retry"] - row["last_failed"]
+
+
+def _attempts(ledger, url=URL):
+    return ledger.db.execute("SELECT attempts FROM failures WHERE url = ?", (url,)).fetchone()["attempts"]
+
+
+def test_backoff_doubles_from_base_and_is_capped(ledger, clock):
+    delays = []
+    for _ in range(12):
+        ledger.record(URL, False, "fp", 3, "sonuçsuz")
+        delays.append(_delay(ledger))
+    assert delays[0] == BASE_DELAY
+    assert delays[1:4] == [2 * BASE_DELAY, 4 * BASE_DELAY, 8 * BASE_DELAY]
+    assert max(delays) == MAX_DELAY
+    assert all(BASE_DELAY <= d <= MAX_DELAY for d in delays)
+    assert delays == sorted(delays)
+
+
+def test_skip_until_retry_time(ledger, clock):
+    ledger.record(URL, False, "fp", 3, "sonuçsuz")
+    assert ledger.should_skip(URL, "fp")
+    clock[0] += BASE_DELAY - 1
+    assert ledger.should_skip(URL, "fp")
+    clock[0] += 1
+    assert not ledger.should_skip(URL, "fp")
+
+
+def test_changed_fingerprint_retries_immediately(ledger, clock):
+    ledger.record(URL, False, "fp", 3, "sonuçsuz")
+    assert not ledger.should_skip(URL, "başka")
+
+
+def test_success_clears_entry(ledger, clock):
+    ledger.record(URL, False, "fp", 3, "sonuçsuz")
+    ledger.record(URL, True, "fp", 1)
+    assert not ledger.has_entry(URL)
+    assert not ledger.should_skip(URL, "fp")
+    assert ledger.stats["iyileşen"] == 1
+
+
+def test_transient_failure_uses_short_delay(ledger, clock):
+    ledger.record(URL, False, "fp", 3, "timeout", transient=True)
+    assert _delay(ledger) == TRANSIENT_DELAY
+    assert _attempts(ledger) == 0
+    clock[0] += TRANSIENT_DELAY
+    assert not ledger.should_skip(URL, "fp")
+
+
+def test_transient_failure_does_not_grow_backoff(ledger, clock):
+    for _ in range(3):
+        ledger.record(URL, False, "fp", 3, "sonuçsuz")
+    assert _attempts(ledger) == 3
+    for _ in range(5):
+        ledger.record(URL, False, "fp", 3, "timeout", transient=True)
+    assert _attempts(ledger) == 3
+    assert _delay(ledger) == TRANSIENT_DELAY
+    # sonraki kesin hata kaldığı yerden devam eder
+    ledger.record(URL, False, "fp", 3, "sonuçsuz")
+    assert _delay(ledger) == min(MAX_DELAY, BASE_DELAY * 2 ** 3)
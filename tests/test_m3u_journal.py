@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+"""m3u_journal: atomik yazım, --resume günlüğü ve önceki .m3u grupları"""
+
+import pytest
+
+from m3u_journal import SeriesJournal, atomic_write, read_playlist_groups, read_series_index, write_series_index
+
+RESULT = ("Dizi", "https://img/1.jpg", [(1, "01", "https://cdn/1.m3u8"), (1, "02", "https://cdn/2.m3u8")])
+
+
+def test_atomic_write_replaces_target(tmp_path):
+    target = tmp_path / "m3u" / "Liste.m3u"
+    atomic_write(target, lambda f: f.write("#EXTM3U\neski\n"))
+    atomic_write(target, lambda f: f.write("#EXTM3U\nyeni\n"))
+    assert target.read_text(encoding="utf-8") == "#EXTM3U\nyeni\n"
+    assert [p.name for p in target.parent.iterdir()] == ["Liste.m3u"]
+
+
+def test_atomic_write_keeps_target_when_writer_fails(tmp_path):
+    target = tmp_path / "Liste.m3u"
+    atomic_write(target, lambda f: f.write("#EXTM3U\neski\n"))
+
+    def broken(f):
+        f.write("#EXTM3U\nyarım")
+        raise RuntimeError("kesinti")
+
+    with pytest.raises(RuntimeError):
+        atomic_write(target, broken)
+    assert target.read_text(encoding="utf-8") == "#EXTM3U\neski\n"
+
+
+def test_journal_resumes_recorded_series(tmp_path):
+    path = tmp_path / "j.journal"
+    journal = SeriesJournal(path)
+    journal.record("https://d/1", RESULT)
+    journal.record("https://d/bos", ("Boş", None, []))
+    journal.record("https://d/hata", None)
+    journal.close()
+
+    resumed = SeriesJournal(path, resume=True)
+    assert resumed.resumed == 1
+    assert resumed.get("https://d/1") == RESULT
+    assert "https://d/bos" not in resumed
+    assert "https://d/hata" not in resumed
+    resumed.close(completed=True)
+    assert not path.exists()
+
+
+def test_journal_ignores_truncated_last_line(tmp_path):
+    path = tmp_path / "j.journal"
+    journal = SeriesJournal(path)
+    journal.record("https://d/1", RESULT)
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"series_url": "https://d/2", "tit')
+
+    resumed = SeriesJournal(path, resume=True)
+    assert list(resumed.done) == ["https://d/1"]
+    resumed.close()
+
+
+def test_journal_without_resume_starts_empty(tmp_path):
+    path = tmp_path / "j.journal"
+    journal = SeriesJournal(path)
+    journal.record("https://d/1", RESULT)
+    journal.close()
+    assert SeriesJournal(path).done == {}
+
+
+def test_series_index_round_trip(tmp_path):
+    path = tmp_path / "index.json"
+    assert read_series_index(path) == {}
+    index = {"https://d/1": {"title": "Dizi", "entries": 2, "resolved_at": 12.5}}
+    write_series_index(path, index)
+    assert read_series_index(path) == index
+    path.write_text("{bozuk", encoding="utf-8")
+    assert read_series_index(path) == {}
+
+
+def test_read_playlist_groups(tmp_path):
+    path = tmp_path / "Liste.m3u"
+    path.write_text(
+        "#EXTM3U\n"
+        '#EXTINF:-1 tvg-name="A 1" group-title="A",A 1\nhttps://p/a1\n'
+        '#EXTINF:-1 tvg-name="B 1" group-title="B",B 1\nhttps://p/b1\n'
+        '#EXTINF:-1 tvg-name="A 2" group-title="A",A 2\nhttps://p/a2\n',
+        encoding="utf-8",
+    )
+    groups = read_playlist_groups(path)
+    assert list(groups) == ["A", "B"]
+    assert groups["A"] == ['#EXTINF:-1 tvg-name="A 1" group-title="A",A 1', "https://p/a1",
+                           '#EXTINF:-1 tvg-name="A 2" group-title="A",A 2', "https://p/a2"]
+    assert read_playlist_groups(tmp_path / "yok.m3u") == {}
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+"""parse_pool: işçi işlemlerdeki extraction sayaçlarının ana işleme eklenmesi"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("bs4")
+
+import extraction
+from parse_pool import ParsePool
+
+PAGE = '<html><head><title>Bölüm</title></head><body><iframe title="dizifunplay" ' \
+       'src="https://gujan.premiumvideo.click/player/a1"></iframe></body></html>'
+
+
+def _run_jobs(pool, jobs):
+    async def run():
+        return [await pool.run(extraction.player_candidates, PAGE, "https://d/b", "fast") for _ in range(jobs)]
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_pool_counters_reach_parent(workers):
+    extraction.stats.clear()
+    pool = ParsePool()
+    if workers:
+        pool.start(workers)
+    try:
+        results = _run_jobs(pool, 3)
+    finally:
+        pool.close()
+    assert all(r["gujan_srcs"] == ["https://gujan.premiumvideo.click/player/a1"] for r in results)
+    assert extraction.stats["hızlı"] == 3
+    assert pool.jobs == 3
+    extraction.stats.clear()
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+"""rate_limit: GCRA zamanlaması, Retry-After ve host başına kovalar"""
+
+import email.utils
+
+import pytest
+
+import rate_limit
+from rate_limit import HostRateLimiter, TokenBucket, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", fake)
+    return fake
+
+
+def test_burst_passes_without_waiting(clock):
+    bucket = TokenBucket(rate=10, burst=5)
+    assert [bucket.reserve() for _ in range(5)] == pytest.approx([0.0] * 5, abs=1e-9)
+
+
+def test_requests_after_burst_are_spaced_by_interval(clock):
+    bucket = TokenBucket(rate=10, burst=5)
+    for _ in range(5):
+        bucket.reserve()
+    delays = [bucket.reserve() for _ in range(3)]
+    assert delays == pytest.approx([0.1, 0.2, 0.3])
+    assert bucket.waited == pytest.approx(0.6)
+    assert bucket.requests == 8
+
+
+def test_bucket_refills_at_rate(clock):
+    bucket = TokenBucket(rate=10, burst=5)
+    for _ in range(5):
+        bucket.reserve()
+    clock.now += 0.2
+    # 0.2 sn'de iki jeton dolar
+    assert [bucket.reserve() for _ in range(3)] == pytest.approx([0.0, 0.0, 0.1])
+
+
+def test_idle_bucket_does_not_exceed_burst(clock):
+    bucket = TokenBucket(rate=10, burst=3)
+    clock.now += 3600
+    delays = [bucket.reserve() for _ in range(4)]
+    assert delays[:3] == pytest.approx([0.0] * 3, abs=1e-9)
+    assert delays[3] == pytest.approx(0.1)
+
+
+def test_steady_rate_over_many_requests(clock):
+    bucket = TokenBucket(rate=4, burst=1)
+    delays = [bucket.reserve() for _ in range(9)]
+    # burst=1: her istek bir öncekinden 1/rate sonra
+    assert delays == pytest.approx([i * 0.25 for i in range(9)])
+
+
+def test_block_holds_bucket_for_retry_after(clock):
+    bucket = TokenBucket(rate=10, burst=5)
+    bucket.block(2.0)
+    assert bucket.reserve() == pytest.approx(2.0)
+    assert bucket.blocked == 1
+
+
+def test_observe_blocks_only_on_429_and_503(clock):
+    limiter = HostRateLimiter(rate=10, burst=1, penalty=5.0)
+    limiter.observe("https://a.example/x", 200, {"Retry-After": "30"})
+    assert limiter.bucket("https://a.example/y").reserve() == 0.0
+    limiter.observe("https://b.example/x", 429, {"Retry-After": "3"})
+    assert limiter.bucket("https://b.example/y").reserve() == pytest.approx(3.0)
+    limiter.observe("https://c.example/x", 503, {})
+    assert limiter.bucket("https://c.example/y").reserve() == pytest.approx(5.0)
+
+
+def test_buckets_are_per_host(clock):
+    limiter = HostRateLimiter(rate=1, burst=1)
+    assert limiter.bucket("https://a.example/1").reserve() == 0.0
+    assert limiter.bucket("https://b.example/1").reserve() == 0.0
+    assert limiter.bucket("https://a.example/2").reserve() == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None), ("", None), ("abc", None), ("7", 7.0), ("-3", 0.0), ("99999", rate_limit.MAX_RETRY_AFTER),
+])
+def test_parse_retry_after_seconds(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    now = 1_700_000_000.0
+    value = email.utils.formatdate(now + 42, usegmt=True)
+    assert parse_retry_after(value, now=now) == pytest.approx(42.0)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+"""recrawl_schedule: değişim sıklığına göre kontrol aralığı"""
+
+import pytest
+
+import recrawl_schedule
+from recrawl_schedule import GROWTH, INITIAL_INTERVAL, MAX_INTERVAL, MIN_INTERVAL, SHRINK, RecrawlSchedule, \
+    episode_hash
+
+SERIES = "https://dizifun5.com/dizi/ornek"
+EPISODES = [f"{SERIES}/bolum-{i}" for i in range(1, 6)]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [2_000_000.0]
+    monkeypatch.setattr(recrawl_schedule.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def schedule(tmp_path):
+    schedule = RecrawlSchedule(tmp_path / "recrawl.sqlite3")
+    yield schedule
+    schedule.close()
+
+
+def test_episode_hash_ignores_order():
+    assert episode_hash(EPISODES) == episode_hash(list(reversed(EPISODES)))
+    assert episode_hash(EPISODES) != episode_hash(EPISODES[:-1])
+
+
+def test_unknown_series_is_due(schedule, clock):
+    assert schedule.is_due(SERIES)
+
+
+def test_first_visit_uses_initial_interval(schedule, clock):
+    schedule.observe(SERIES, EPISODES)
+    assert schedule.get(SERIES)["interval"] == INITIAL_INTERVAL
+    assert not schedule.is_due(SERIES)
+    clock[0] += INITIAL_INTERVAL
+    assert schedule.is_due(SERIES)
+
+
+def test_unchanged_list_grows_interval_up_to_max(schedule, clock):
+    intervals = []
+    for _ in range(30):
+        schedule.observe(SERIES, EPISODES)
+        intervals.append(schedule.get(SERIES)["interval"])
+    assert intervals[1] == pytest.approx(INITIAL_INTERVAL * GROWTH)
+    assert intervals == sorted(intervals)
+    assert intervals[-1] == MAX_INTERVAL
+
+
+def test_changed_list_shrinks_interval_down_to_min(schedule, clock):
+    intervals = []
+    for i in range(30):
+        schedule.observe(SERIES, EPISODES + [f"{SERIES}/yeni-{n}" for n in range(i)])
+        intervals.append(schedule.get(SERIES)["interval"])
+    assert intervals[1] == pytest.approx(INITIAL_INTERVAL * SHRINK)
+    assert intervals[-1] == MIN_INTERVAL
+    row = schedule.get(SERIES)
+    assert row["checks"] == 30
+    assert row["changes"] == 29
+    assert schedule.stats["yeni_bölüm"] == 29
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+"""strategy_registry: geçmiş başarıya göre çözücü sırası ve kalıcılık"""
+
+from strategy_registry import DEAD_AFTER, DEFAULT_STRATEGIES, StrategyRegistry
+
+
+def test_default_order_without_history():
+    assert StrategyRegistry().order("dizifun", "dizi") == list(DEFAULT_STRATEGIES)
+
+
+def test_site_winner_moves_first():
+    registry = StrategyRegistry()
+    for _ in range(5):
+        registry.record("dizifun", None, "playhouse", True)
+        registry.record("dizifun", None, "gujan", False)
+    assert registry.order("dizifun")[0] == "playhouse"
+    assert registry.order("baska-site") == list(DEFAULT_STRATEGIES)
+
+
+def test_series_history_overrides_site_after_min_attempts():
+    registry = StrategyRegistry()
+    for _ in range(5):
+        registry.record("dizifun", None, "gujan", True)
+    registry.record("dizifun", "dizi", "fallback", True)
+    # tek deneme: site sırası geçerli
+    assert registry.order("dizifun", "dizi")[0] == "gujan"
+    registry.record("dizifun", "dizi", "fallback", True)
+    assert registry.order("dizifun", "dizi")[0] == "fallback"
+
+
+def test_dead_strategy_moves_last():
+    registry = StrategyRegistry()
+    for _ in range(3 * DEAD_AFTER):
+        registry.record("dizifun", None, "gujan", True)
+    for _ in range(DEAD_AFTER):
+        registry.record("dizifun", None, "gujan", False)
+    # kazanma oranı hâlâ yüksek ama art arda ıskalar sona atar
+    assert registry.order("dizifun")[-1] == "gujan"
+    registry.record("dizifun", None, "gujan", True)
+    assert registry.order("dizifun")[0] == "gujan"
+
+
+def test_counts_persist_on_close(tmp_path):
+    path = tmp_path / "strategies.sqlite3"
+    registry = StrategyRegistry(path)
+    for _ in range(3):
+        registry.record("dizifun", "dizi", "playhouse", True)
+    registry.close()
+
+    reloaded = StrategyRegistry(path)
+    assert reloaded.counts["site:dizifun"]["playhouse"] == [3, 3, 0]
+    assert reloaded.order("dizifun", "dizi")[0] == "playhouse"
+    reloaded.close()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+"""time_budget: süre okuma, yumuşak / sert sınırlar ve erteleme"""
+
+import pytest
+
+import time_budget
+from time_budget import TimeBudget, parse_duration
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [500.0]
+    monkeypatch.setattr(time_budget.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.mark.parametrize("text, seconds", [("5400", 5400), ("90m", 5400), ("1.5h", 5400), ("45s", 45), (" 2H ", 7200)])
+def test_parse_duration(text, seconds):
+    assert parse_duration(text) == seconds
+
+
+@pytest.mark.parametrize("text", ["", "90x", "m", "-5", "1h30m"])
+def test_parse_duration_rejects_invalid(text):
+    with pytest.raises(ValueError):
+        parse_duration(text)
+
+
+def test_deadlines(clock):
+    budget = TimeBudget(1000, drain_share=0.15, write_reserve=30)
+    assert budget.soft_deadline == pytest.approx(500 + 850)
+    assert budget.hard_deadline == pytest.approx(500 + 970)
+    assert budget.remaining() == pytest.approx(970)
+    clock[0] += 2000
+    assert budget.remaining() == 0.0
+
+
+def test_soft_deadline_never_after_hard_deadline(clock):
+    budget = TimeBudget(100, drain_share=0.0, write_reserve=30)
+    assert budget.soft_deadline == budget.hard_deadline
+
+
+def test_expired_after_soft_deadline(clock):
+    budget = TimeBudget(100, drain_share=0.5, write_reserve=0)
+    assert not budget.expired()
+    clock[0] += 49
+    assert not budget.expired()
+    clock[0] += 1
+    assert budget.expired()
+
+
+def test_admit_defers_the_rest_once_expired(clock):
+    budget = TimeBudget(100, drain_share=0.5, write_reserve=0)
+    admitted = []
+    for item in budget.admit(range(10)):
+        admitted.append(item)
+        if item == 3:
+            clock[0] += 60
+    assert admitted == [0, 1, 2, 3]
+    assert budget.deferred == [4, 5, 6, 7, 8, 9]
+
+
+def test_admit_passes_everything_within_budget(clock):
+    budget = TimeBudget(100)
+    assert list(budget.admit("abc")) == ["a", "b", "c"]
+    assert budget.deferred == []
+
+
+def test_novelty_order_without_schedule(monkeypatch):
+    pytest.importorskip("aiohttp")
+    import dizi
+    import dizifun_runner
+
+    monkeypatch.setattr(dizi, "recrawl_schedule", None)
+    index = {
+        "eski": {"title": "Eski", "entries": 8, "resolved_at": 100.0},
+        "daha-eski": {"title": "Daha Eski", "entries": 3, "resolved_at": 50.0},
+        "bos": {"title": "Boş", "entries": 0, "resolved_at": 10.0},
+    }
+    urls = ["bos", "eski", "yeni", "daha-eski"]
+    ordered = sorted(urls, key=lambda url: dizifun_runner.novelty_key(url, index))
+    assert ordered == ["yeni", "daha-eski", "eski", "bos"]
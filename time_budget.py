@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Duvar saati süre sınırı (--time-budget)
+
+CI işleri süre sınırına takılınca iş öldürülür ve o ana kadar çözülenler de
+kaybolur. TimeBudget iki sınır tanımlar:
+- yumuşak sınır: bundan sonra yeni iş başlatılmaz, süren işler bitirilir,
+- sert sınır: hâlâ süren işler iptal edilir; kalan süre çıktıların
+  yazılmasına ayrılır.
+Başlatılamayan ya da iptal edilen işler "ertelenen" olarak raporlanır.
+"""
+
+import logging
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+# Sürenin bu payı süren işlerin bitirilmesine ayrılır
+DRAIN_SHARE = 0.15
+# Sert sınırdan sonra çıktıların yazılması için ayrılan süre (sn)
+WRITE_RESERVE = 30.0
+
+_DURATION_RE = re.compile(r"^(\d+(?:\.\d+)?)([smh]?)$")
+_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_duration(text):
+    """"5400", "90m", "1.5h" → saniye"""
+    match = _DURATION_RE.match(text.strip().lower())
+    if not match:
+        raise ValueError(f"Geçersiz süre: {text!r} (ör. 5400, 90m, 1.5h)")
+    return float(match.group(1)) * _UNITS[match.group(2)]
+
+
+class TimeBudget:
+    """Yumuşak / sert sınırlı süre bütçesi"""
+
+    def __init__(self, seconds, drain_share=DRAIN_SHARE, write_reserve=WRITE_RESERVE):
+        self.seconds = seconds
+        self.start = time.monotonic()
+        self.hard_deadline = self.start + max(0.0, seconds - write_reserve)
+        self.soft_deadline = min(self.hard_deadline, self.start + seconds * (1 - drain_share))
+        self.deferred = []
+
+    def expired(self):
+        """Yumuşak sınır geçildi mi (yeni iş başlatılmamalı)"""
+        return time.monotonic() >= self.soft_deadline
+
+    def remaining(self):
+        """Sert sınıra kalan süre (sn)"""
+        return max(0.0, self.hard_deadline - time.monotonic())
+
+    def admit(self, items):
+        """Yumuşak sınıra kadar öğeleri verir, kalanları deferred'e ekler"""
+        items = iter(items)
+        for item in items:
+            if self.expired():
+                self.deferred.append(item)
+                self.deferred.extend(items)
+                logger.info(f"[BUDGET] Süre sınırı: yeni iş başlatılmıyor ({len(self.deferred)} ertelendi)")
+                return
+            yield item
+
+    def report(self, describe=None, limit=20):
+        elapsed = time.monotonic() - self.start
+        logger.info(f"[BUDGET] {elapsed:.0f}/{self.seconds:.0f} sn kullanıldı, ertelenen: {len(self.deferred)}")
+        for item in self.deferred[:limit]:
+            logger.info(f"[BUDGET]   ertelendi: {describe(item) if describe else item}")
+        if len(self.deferred) > limit:
+            logger.info(f"[BUDGET]   ... ve {len(self.deferred) - limit} tane daha")